@@ -1,6 +1,7 @@
 import logging
 
 from django.contrib import auth
+from django.db.models import QuerySet
 from authentication.models import Group
 from library.restframeworkflexfields import FlexFieldsModelSerializer
 from rest_framework import serializers
@@ -33,7 +34,21 @@ class GroupSerializer(FlexFieldsModelSerializer):
             'group_id': {'read_only': True},
         }
 
+    def children_map(self):
+        """
+        Children of every group below the serialized root(s), loaded once with a
+        single recursive query and shared by the nested serializers.
+        """
+        if 'group_children' not in self.context:
+            roots = self.root.instance
+            roots = roots if isinstance(roots, (list, tuple, QuerySet)) else [roots]
+            children = {}
+            for group in Group.hierarchy.descendants(*roots).order_by('pk'):
+                children.setdefault(group.parent_id, []).append(group)
+            self.context['group_children'] = children
+        return self.context['group_children']
+
     def get_children(self, obj):
-        children = Group.objects.filter(parent=obj)
-        return GroupSerializer(children, many=True).data
+        children = self.children_map().get(obj.pk, [])
+        return GroupSerializer(children, many=True, context=self.context).data
         
@@ -33,12 +33,9 @@ class GroupViewSet(SearchFilterViewSet):
             "prioritize_exact_matches": True,
             "use_trigram": True,  # Enable if using PostgreSQL with trigram extension
             "min_length": 2,
-            "search_fields_weights": {
-                "group_id": 10,  # Primary identifier gets highest weight
-                "group_name": 5,  # Name is next most important
-                "status": 5,
-                "group_hierarchy": 1,  # Description is least important for matching
-            },
+            "engine": "ranked",  # Single ranked query instead of the per-tier cascade
+            # Same weights as the stored search vector declared on the model
+            "search_fields_weights": Group.search_vectors.weights,
         }
 
     def get_related_fields(self):
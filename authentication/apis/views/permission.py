@@ -3,18 +3,18 @@ import logging
 
 from django.contrib import auth
 from django.contrib.auth.models import Group
-from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth.models import Permission as DjangoPermission
 from authentication.apis.serializers import PermissionSerializer
-from authentication.models import Permission
+from authentication.models import Permission, PermissionClosure
 from library.cacheops import invalidate_model
 from rest_framework.permissions import IsAuthenticated
 from collections import OrderedDict
 from authentication.apis.viewsets import FormatViewSet
+from authentication.utils.permission import grant_permissions, revoke_permissions
 
 
 logger = logging.getLogger(__name__)
@@ -40,16 +40,12 @@ class UserPermissionViewSet(FormatViewSet, viewsets.ModelViewSet):
         user = request.user
         if 'current' in data:
             user = User.objects.get(pk=json.loads(data['current'])['user_id'])
-        granted = user.permissions_derivative().union(
-            Permission.objects.filter(pk__in=user.user_permissions.values_list('pk', flat=True)),
-        )
+        granted = PermissionClosure.objects.filter(user=user).values('permission_id')
+        queryset = self.filter_queryset(Permission.objects.exclude(pk__in=granted))
         if user.is_superuser:
-            granted = Permission.objects.all()
-        queryset = self.filter_queryset(
-            Permission.objects.exclude(pk__in=list(granted.values_list('pk', flat=True))))
+            queryset = Permission.objects.none()
         group = request.query_params.get('group')
-        print('UASUUUUU', group)
-        
+
         if group is None:
             return self._not_grouped_list(queryset, request)
         else:
@@ -66,21 +62,13 @@ class UserPermissionViewSet(FormatViewSet, viewsets.ModelViewSet):
         user = request.user
         if 'current' in data:
             user = User.objects.get(pk=json.loads(data['current'])['user_id'])
-        queryset = user.permissions_derivative().union(
-            Permission.objects.filter(pk__in=user.user_permissions.values_list('pk', flat=True)),
-        )
-        queryset = self.filter_queryset(Permission.objects.filter(Q(
-            pk__in=list(queryset.values_list('pk', flat=True)),
-            user=user,
-            group__user=user,
-            _connector=Q.OR,
-        )).distinct())
+        # The closure already holds direct, group and derived group permissions
+        queryset = self.filter_queryset(user.permissions_derivative())
         if user.is_superuser:
             queryset = self.filter_queryset(Permission.objects.all())
         group = request.query_params.get('group')
         
         if group is None:
-            print('UASUUUUU2', self._not_grouped_list(queryset, request))
             return self._not_grouped_list(queryset, request)
         else:
             return self._grouped_list(group, queryset, request)
@@ -94,15 +82,11 @@ class UserPermissionViewSet(FormatViewSet, viewsets.ModelViewSet):
     def grant(self, request, *args, **kwargs):
         data = request.data.dict()
         user = request.user
-        print('MUASOKKK: ', data)
         if 'current' in data:
             user = User.objects.get(pk=json.loads(data['current'])['user_id'])
         values = json.loads(data['values'])
-        if isinstance(values, list):
-            for permission in Permission.objects.filter(pk__in=[permission['id'] for permission in values]):
-                user.user_permissions.add(permission.pk)
-        else:
-            user.user_permissions.add(Permission.objects.get(pk=values['id']).pk)
+        values = values if isinstance(values, list) else [values]
+        grant_permissions(user, 'user_permissions', Permission.objects.filter(pk__in=[permission['id'] for permission in values]))
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -120,12 +104,8 @@ class UserPermissionViewSet(FormatViewSet, viewsets.ModelViewSet):
         user = request.user
         if 'current' in data:
             user = User.objects.get(pk=json.loads(data['current'])['user_id'])
-        granted = user.permissions_derivative().union(
-            Permission.objects.filter(pk__in=user.user_permissions.values_list('pk', flat=True)),
-        )
-        permissions = Permission.objects.exclude(pk__in=list(granted.values_list('pk', flat=True)))
-        for permission in permissions:
-            user.user_permissions.add(permission.pk)
+        granted = PermissionClosure.objects.filter(user=user).values('permission_id')
+        grant_permissions(user, 'user_permissions', Permission.objects.exclude(pk__in=granted))
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -144,40 +124,20 @@ class UserPermissionViewSet(FormatViewSet, viewsets.ModelViewSet):
         if 'current' in data:
             user = User.objects.get(pk=json.loads(data['current'])['user_id'])
         values = json.loads(data['values'])
-        if isinstance(values, list):
-            for permission in Permission.objects.filter(pk__in=[permission['id'] for permission in values]):
-                granted = Permission.objects.filter(Q(
-                    user=user,
-                    pk=permission.pk,
-                    _connector=Q.AND,
-                ))
-                if not granted.exists():
-                    return Response(dict(
-                        error=_(
-                            'Permission <b>%(permission_name)s</b> can\'t revoked manual from user %(user_name)s, '
-                            'revoke from group') % dict(
-                            permission_name=permission.name_translated,
-                            user_name=user.user_name,
-                        ),
-                    ), status=status.HTTP_404_NOT_FOUND)
-                user.user_permissions.remove(permission.pk)
-        else:
-            permission = Permission.objects.get(pk=values['id'])
-            granted = Permission.objects.filter(Q(
-                user=user,
-                pk=permission.pk,
-                _connector=Q.AND,
-            ))
-            if not granted.exists():
-                return Response(dict(
-                    error=_(
-                        'Permission <b>%(permission_name)s</b> can\'t revoked manual from user %(user_name)s, '
-                        'revoke from group') % dict(
-                        permission_name=permission.name_translated,
-                        user_name=user.user_name,
-                    ),
-                ), status=status.HTTP_404_NOT_FOUND)
-            user.user_permissions.remove(permission.pk)
+        values = values if isinstance(values, list) else [values]
+        permission_ids = [permission['id'] for permission in values]
+        # Permissions that only come from a group can't be revoked here, validate all of them at once
+        inherited = Permission.objects.filter(pk__in=permission_ids).exclude(user=user).first()
+        if inherited is not None:
+            return Response(dict(
+                error=_(
+                    'Permission <b>%(permission_name)s</b> can\'t revoked manual from user %(user_name)s, '
+                    'revoke from group') % dict(
+                    permission_name=inherited.name_translated,
+                    user_name=user.user_name,
+                ),
+            ), status=status.HTTP_404_NOT_FOUND)
+        revoke_permissions(user, 'user_permissions', permission_ids)
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -255,11 +215,8 @@ class GroupPermissionViewSet():
         data = request.data.dict()
         group = Group.objects.get(pk=json.loads(data['current'])['id'])
         values = json.loads(data['values'])
-        if isinstance(values, list):
-            for permission in Permission.objects.filter(pk__in=[permission['id'] for permission in values]):
-                group.permissions.add(permission.pk)
-        else:
-            group.permissions.add(Permission.objects.get(pk=values['id']).pk)
+        values = values if isinstance(values, list) else [values]
+        grant_permissions(group, 'permissions', Permission.objects.filter(pk__in=[permission['id'] for permission in values]))
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -275,10 +232,7 @@ class GroupPermissionViewSet():
     def grant_all(self, request, *args, **kwargs):
         data = request.data.dict()
         group = Group.objects.get(pk=json.loads(data['current'])['id'])
-        granted = Permission.objects.filter(group=group)
-        permissions = Permission.objects.exclude(pk__in=list(granted.values_list('pk', flat=True)))
-        for permission in permissions:
-            group.permissions.add(permission.pk)
+        grant_permissions(group, 'permissions', Permission.objects.all())
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -295,12 +249,8 @@ class GroupPermissionViewSet():
         data = request.data.dict()
         group = Group.objects.get(pk=json.loads(data['current'])['id'])
         values = json.loads(data['values'])
-        if isinstance(values, list):
-            for permission in Permission.objects.filter(pk__in=[permission['id'] for permission in values]):
-                group.permissions.remove(permission.pk)
-        else:
-            permission = Permission.objects.get(pk=values['id'])
-            group.permissions.remove(permission.pk)
+        values = values if isinstance(values, list) else [values]
+        revoke_permissions(group, 'permissions', [permission['id'] for permission in values])
         invalidate_model(DjangoPermission)
         invalidate_model(Permission)
         return Response(dict(
@@ -9,7 +9,9 @@ from django.http import QueryDict
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from django.core.cache import cache
+from core.utils.counting import CountResult, CountStrategy
+from core.utils.pagination import KeysetPaginationMixin
+from core.utils.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,27 +34,36 @@ def format_items(level_dict, level_items):
             format_items(key_dict['items'], item['items'])
 
 
-class FormatViewSet(ModelViewSet):
-    
-    @property
-    def cache_key(self):
-        return f"{self.__class__.__name__}_queryset"
+class FormatViewSet(KeysetPaginationMixin, ModelViewSet):
+    count_strategy = CountStrategy()
+    response_cache = response_cache
+    # Extra models read by the serializer that cannot be discovered from its fields
+    cache_models = ()
 
-    def list(self, request, *args, **kwargs):
-        cached_data = cache.get(self.cache_key)
-        if cached_data:
-            return Response(cached_data)
+    def get_cache_scope(self, request):
+        """
+        Part of the response cache key describing what the user is allowed to see.
+        Override when the queryset depends on the user beyond their permissions.
+        """
+        return self.response_cache.permission_scope(request)
 
+    def use_keyset_pagination(self, request):
+        # Grouped lists page over group rows, not model instances
+        return super().use_keyset_pagination(request) and request.query_params.get('group') is None
+
+    def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        cache.set(self.cache_key, serializer.data, timeout=3600)
-        return Response(serializer.data)
+
+        def compute():
+            serializer = self.get_serializer(queryset, many=True)
+            return list(serializer.data)
+
+        return Response(self.response_cache.get_or_set(self, request, queryset, compute))
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
-            cache.delete(self.cache_key)
             return Response(
                 {"message": "Created successfully!", "data": serializer.data},
                 status=status.HTTP_201_CREATED
@@ -67,7 +78,6 @@ class FormatViewSet(ModelViewSet):
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            cache.delete(self.cache_key)
             return Response(
                 {"message": "Updated successfully!", "data": serializer.data},
                 status=status.HTTP_200_OK
@@ -80,7 +90,6 @@ class FormatViewSet(ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.perform_destroy(instance)
-        cache.delete(self.cache_key)
         return Response(
             {"message": "Deleted successfully!"},
             status=status.HTTP_204_NO_CONTENT
@@ -101,9 +110,13 @@ class FormatViewSet(ModelViewSet):
         page = self.paginate_queryset(group_queryset)
         response_dict = {}
         if require_group_count:
-            response_dict['groupCount'] = group_queryset.count()
+            group_count = self.count_strategy.count(group_queryset)
+            response_dict['groupCount'] = group_count.value
+            response_dict['groupCountEstimated'] = not group_count.exact
         if require_total_count:
-            response_dict['totalCount'] = queryset.count()
+            total_count = self.count_strategy.count(queryset)
+            response_dict['totalCount'] = total_count.value
+            response_dict['totalCountEstimated'] = not total_count.exact
         group_sets = page if page is not None else group_queryset
         data_dict = {}
         for row in group_sets:
@@ -138,7 +151,12 @@ class FormatViewSet(ModelViewSet):
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
-            response_dict['totalCount'] = self.paginator.count
+            total_count = self.get_total_count(queryset)
+            response_dict['totalCount'] = total_count.value
+            response_dict['totalCountEstimated'] = not total_count.exact
+            if hasattr(self.paginator, 'next_cursor'):
+                response_dict['next'] = self.paginator.get_next_link()
+                response_dict['previous'] = self.paginator.get_previous_link()
         else:
             serializer = self.get_serializer(queryset, many=True)
         total_summary = request.query_params.get('totalSummary')
@@ -148,6 +166,18 @@ class FormatViewSet(ModelViewSet):
         response_dict['data'] = serializer.data
         return Response(response_dict)
 
+    def get_total_count(self, queryset):
+        """
+        Reuse the count the page paginator already paid for, otherwise ask the count strategy.
+        """
+        django_page = getattr(self.paginator, 'page', None)
+        if django_page is not None and hasattr(django_page, 'paginator'):
+            return CountResult(django_page.paginator.count, True)
+        count = getattr(self.paginator, 'count', None)
+        if count is not None:
+            return CountResult(count, not getattr(self.paginator, 'count_estimated', False))
+        return self.count_strategy.count(queryset)
+
     def get_group_field_name(self, group):
         if 'groupInterval' in group:
             return group['selector'].replace('.', '__') + '__' + group['groupInterval']
@@ -5,4 +5,5 @@ class ApplicationConfig(AppConfig):
     name = 'authentication'
     verbose_name = _('Authentication')
     def ready(self):
-        import authentication.signals
\ No newline at end of file
+        import authentication.signals
+        authentication.signals.connect_closure_signals()
\ No newline at end of file
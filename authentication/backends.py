@@ -0,0 +1,29 @@
+from django.contrib.auth.backends import ModelBackend
+
+
+class PermissionClosureBackend(ModelBackend):
+    """
+    `ModelBackend` reading permissions from the materialized permission closure,
+    so permissions derived through the group tree count and `has_perm` is a set
+    lookup on `User.effective_permissions`.
+    """
+
+    def _uses_closure(self, user_obj, obj):
+        return (
+            obj is None
+            and user_obj.is_active
+            and not user_obj.is_anonymous
+            and not user_obj.is_superuser
+            and hasattr(user_obj, 'effective_permissions')
+        )
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not self._uses_closure(user_obj, obj):
+            return super().get_all_permissions(user_obj, obj)
+        return set(user_obj.effective_permissions)
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not self._uses_closure(user_obj, obj):
+            return super().get_group_permissions(user_obj, obj)
+        # Closure tanpa permission langsung user = permission dari grup (termasuk turunan)
+        return set(user_obj.effective_permissions) - self.get_user_permissions(user_obj, obj)
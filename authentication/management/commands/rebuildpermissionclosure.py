@@ -0,0 +1,28 @@
+import logging
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authentication.models import PermissionClosure, User
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Management command to rebuild the materialized user group and permission closure'
+
+    def add_arguments(self, parser):
+        parser.add_argument('users', nargs='*', type=str, help='User ids to rebuild (default: all users)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users rebuilt per transaction')
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(f'''{os.linesep}{self.help}{os.linesep}{os.linesep}''')
+        users = kwargs['users'] or list(User.objects.values_list('pk', flat=True))
+        batch_size = kwargs['batch_size']
+        logger.info('Rebuilding permission closure for %s users', len(users))
+        for index in range(0, len(users), batch_size):
+            with transaction.atomic():
+                PermissionClosure.objects.rebuild(users=users[index:index + batch_size])
+            self.stdout.write(f'{min(index + batch_size, len(users))}/{len(users)} users')
+        self.stdout.write(self.style.SUCCESS(f'{PermissionClosure.objects.count()} effective permissions materialized'))
@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0003_group_group_hierarchy_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='derivative_permission',
+            field=models.CharField(choices=[('none', 'None'), ('parent', 'Parent'), ('child', 'Child'), ('both', 'Both')], default='none', help_text='Used for inherit permission from parent and/or child group', verbose_name='derivative permission'),
+        ),
+        migrations.AddField(
+            model_name='historicalgroup',
+            name='derivative_permission',
+            field=models.CharField(choices=[('none', 'None'), ('parent', 'Parent'), ('child', 'Child'), ('both', 'Both')], default='none', help_text='Used for inherit permission from parent and/or child group', verbose_name='derivative permission'),
+        ),
+        migrations.CreateModel(
+            name='GroupClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group', models.ForeignKey(db_constraint=False, help_text='Used for linked key derived group', on_delete=django.db.models.deletion.CASCADE, related_name='user_closure', to='authentication.group', verbose_name='group')),
+                ('user', models.ForeignKey(db_constraint=False, help_text='Used for linked key user', on_delete=django.db.models.deletion.CASCADE, related_name='group_closure', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Used store derived group of user',
+                'db_table': '"authentication"."group_closure"',
+                'managed': True,
+                'unique_together': {('user', 'group')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PermissionClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('permission', models.ForeignKey(db_constraint=False, help_text='Used for linked key effective permission', on_delete=django.db.models.deletion.CASCADE, related_name='user_closure', to='auth.permission', verbose_name='permission')),
+                ('user', models.ForeignKey(db_constraint=False, help_text='Used for linked key user', on_delete=django.db.models.deletion.CASCADE, related_name='permission_closure', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Used store effective permission of user',
+                'db_table': '"authentication"."permission_closure"',
+                'managed': True,
+                'unique_together': {('user', 'permission')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_group_derivative_permission_closure'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicalgroup',
+            index=models.Index(fields=['group_id', '-history_date', '-history_id'], name='historicalgroup_asof'),
+        ),
+        migrations.AddIndex(
+            model_name='historicalpermissions',
+            index=models.Index(fields=['inheritance_permission_id', '-history_date', '-history_id'], name='historicalpermissions_asof'),
+        ),
+        migrations.AddIndex(
+            model_name='historicaluser',
+            index=models.Index(fields=['user_id', '-history_date', '-history_id'], name='historicaluser_asof'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def rebuild_permission_closure(apps, schema_editor):
+    from authentication.models.closure import PermissionClosureManager
+
+    PermissionClosureManager().rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0005_history_snapshot_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_permission_closure, migrations.RunPython.noop),
+    ]
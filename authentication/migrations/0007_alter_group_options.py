@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_rebuild_permission_closure'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='group',
+            options={'default_manager_name': 'objects', 'managed': True, 'permissions': [('add_group_permission', 'Can add group permission'), ('delete_group_permission', 'Can delete group permission')], 'verbose_name': 'Used store group'},
+        ),
+    ]
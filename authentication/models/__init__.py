@@ -1,9 +1,12 @@
 from authentication.models.user import User
 from authentication.models.group import Group
 from authentication.models.permission import Permissions as Permission
+from authentication.models.closure import GroupClosure, PermissionClosure
 
 __all__ = [
     User,
     Group,
-    Permission
+    Permission,
+    GroupClosure,
+    PermissionClosure,
 ]
\ No newline at end of file
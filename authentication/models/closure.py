@@ -0,0 +1,168 @@
+import logging
+
+from django.apps import apps as global_apps
+from django.conf import settings as djangosettings
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.utils.translation import gettext_lazy as _
+
+from authentication import settings
+
+logger = logging.getLogger(__name__)
+
+# Batas kedalaman hierarki grup, sekaligus pengaman terhadap data yang rusak
+MAX_GROUP_DEPTH = 64
+
+
+def quote(table_name):
+    return connection.ops.quote_name(table_name)
+
+
+def effective_permissions_key(user):
+    return f'permission:closure:{user}'
+
+
+class PermissionClosureManager(models.Manager):
+    def _derived_groups_sql(self, apps):
+        """
+        Recursive CTE walking the group tree from each user's direct groups, following
+        every visited group's `derivative_permission` (parent, child or both).
+        Cycles are cut by the visited path, runaway trees by `MAX_GROUP_DEPTH`.
+        """
+        Group = apps.get_model('authentication', 'Group')
+        User = apps.get_model(djangosettings.AUTH_USER_MODEL)
+
+        membership = User._meta.get_field('groups').remote_field.through
+        member_user = membership._meta.get_field('user').column
+        member_group = membership._meta.get_field('group').column
+        group_table = quote(Group._meta.db_table)
+        return f'''
+            WITH RECURSIVE derived(user_id, group_id, path) AS (
+                SELECT membership."{member_user}", g."group_id", ARRAY[g."group_id"]::varchar[]
+                FROM {quote(membership._meta.db_table)} AS membership
+                JOIN {group_table} AS g ON g."group_id" = membership."{member_group}"::varchar
+                WHERE membership."{member_user}" = ANY(%(users)s) AND NOT g."is_removed"
+                UNION ALL
+                SELECT derived.user_id, neighbour."group_id", derived.path || neighbour."group_id"
+                FROM derived
+                JOIN {group_table} AS current ON current."group_id" = derived.group_id
+                JOIN {group_table} AS neighbour ON (
+                    (current."derivative_permission" IN ('parent', 'both') AND neighbour."group_id" = current."parent_id")
+                    OR (current."derivative_permission" IN ('child', 'both') AND neighbour."parent_id" = current."group_id")
+                )
+                WHERE NOT neighbour."is_removed"
+                    AND NOT neighbour."group_id" = ANY(derived.path)
+                    AND cardinality(derived.path) < {MAX_GROUP_DEPTH}
+            )
+        '''
+
+    def rebuild(self, users=None, apps=global_apps):
+        """
+        Recompute the group and permission closure of `users` (pks), or of every user.
+        Runs as set-based statements inside the caller's transaction, the cached
+        `effective_permissions` of those users are dropped once it commits.
+        Migrations pass their historical `apps`.
+        """
+        User = apps.get_model(djangosettings.AUTH_USER_MODEL)
+        GroupClosure = apps.get_model('authentication', 'GroupClosure')
+        PermissionClosure = apps.get_model('authentication', 'PermissionClosure')
+
+        if users is None:
+            users = list(User._default_manager.values_list('pk', flat=True))
+        users = [str(user) for user in users]
+        if not users:
+            return
+
+        group_permissions = apps.get_model('auth', 'Group')._meta.get_field('permissions').remote_field.through
+        user_permissions = User._meta.get_field('user_permissions').remote_field.through
+        derived = self._derived_groups_sql(apps)
+        params = {'users': users}
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {quote(GroupClosure._meta.db_table)} WHERE "user_id" = ANY(%(users)s)', params)
+            cursor.execute(f'DELETE FROM {quote(PermissionClosure._meta.db_table)} WHERE "user_id" = ANY(%(users)s)', params)
+            cursor.execute(f'''
+                {derived}
+                INSERT INTO {quote(GroupClosure._meta.db_table)} ("user_id", "group_id")
+                SELECT DISTINCT user_id, group_id FROM derived
+                ON CONFLICT DO NOTHING
+            ''', params)
+            cursor.execute(f'''
+                INSERT INTO {quote(PermissionClosure._meta.db_table)} ("user_id", "permission_id")
+                SELECT closure."user_id", gp."{group_permissions._meta.get_field('permission').column}"
+                FROM {quote(GroupClosure._meta.db_table)} AS closure
+                JOIN {quote(group_permissions._meta.db_table)} AS gp
+                    ON gp."{group_permissions._meta.get_field('group').column}"::varchar = closure."group_id"
+                WHERE closure."user_id" = ANY(%(users)s)
+                UNION
+                SELECT up."{user_permissions._meta.get_field('user').column}", up."{user_permissions._meta.get_field('permission').column}"
+                FROM {quote(user_permissions._meta.db_table)} AS up
+                WHERE up."{user_permissions._meta.get_field('user').column}" = ANY(%(users)s)
+                ON CONFLICT DO NOTHING
+            ''', params)
+        keys = [effective_permissions_key(user) for user in users]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    def users_for_groups(self, groups):
+        """
+        Users whose closure currently reaches any of `groups` (pks).
+        """
+        return list(
+            GroupClosure.objects.filter(group_id__in=[str(group) for group in groups])
+            .values_list('user_id', flat=True)
+            .distinct()
+        )
+
+
+class GroupClosure(models.Model):
+    user = models.ForeignKey(
+        to=djangosettings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='group_closure',
+        db_constraint=False,
+        verbose_name=_('user'),
+        help_text=_('Used for linked key user'),
+    )
+    group = models.ForeignKey(
+        to='authentication.Group',
+        on_delete=models.CASCADE,
+        related_name='user_closure',
+        db_constraint=False,
+        verbose_name=_('group'),
+        help_text=_('Used for linked key derived group'),
+    )
+
+    objects = PermissionClosureManager()
+
+    class Meta:
+        managed = True
+        db_table = u'\"{}\".\"group_closure\"'.format(settings.SCHEMA)
+        unique_together = (('user', 'group',),)
+        verbose_name = _('Used store derived group of user')
+
+
+class PermissionClosure(models.Model):
+    user = models.ForeignKey(
+        to=djangosettings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='permission_closure',
+        db_constraint=False,
+        verbose_name=_('user'),
+        help_text=_('Used for linked key user'),
+    )
+    permission = models.ForeignKey(
+        to='auth.Permission',
+        on_delete=models.CASCADE,
+        related_name='user_closure',
+        db_constraint=False,
+        verbose_name=_('permission'),
+        help_text=_('Used for linked key effective permission'),
+    )
+
+    objects = PermissionClosureManager()
+
+    class Meta:
+        managed = True
+        db_table = u'\"{}\".\"permission_closure\"'.format(settings.SCHEMA)
+        unique_together = (('user', 'permission',),)
+        verbose_name = _('Used store effective permission of user')
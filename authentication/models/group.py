@@ -5,11 +5,21 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from authentication import settings
-from core.models import Base, History, Tracker, SchemaView, Trigrams, FullOptimizer, IndexOptimizer
+from library.modelutils import Choices
+from core.models import (
+    Base, History, Tracker, SchemaView, Trigrams, FullOptimizer, IndexOptimizer, SearchVectors,
+    HierarchyManager, HierarchyNode,
+)
 
 logger = logging.getLogger(__name__)
 
-class Group(Base):
+class Group(HierarchyNode, Base):
+    DerivativePermission = Choices(
+        ('none', _('None')),
+        ('parent', _('Parent')),
+        ('child', _('Child')),
+        ('both', _('Both')),
+    )
     group_id = models.CharField(
         primary_key=True,
         verbose_name=_('group id'),
@@ -34,6 +44,12 @@ class Group(Base):
         blank=True,
         null=True,
     )
+    derivative_permission = models.CharField(
+        default=DerivativePermission.none,
+        choices=DerivativePermission,
+        verbose_name=_('derivative permission'),
+        help_text=_('Used for inherit permission from parent and/or child group'),
+    )
     status = models.CharField(
         default='draft',
         verbose_name=_('status'),
@@ -49,8 +65,16 @@ class Group(Base):
     schema_view = SchemaView(schema='authentication')
     trigrams = Trigrams()
     indexes = IndexOptimizer()
+    search_vectors = SearchVectors(weights={
+        'group_id': 10,
+        'group_name': 5,
+        'status': 5,
+        'group_hierarchy': 1,
+    })
+    hierarchy = HierarchyManager()
 
     class Meta:
+        default_manager_name = 'objects'
         managed = True
         db_table = u'\"{}\".\"group\"'.format(settings.SCHEMA)
         verbose_name = _('Used store group')
@@ -59,16 +83,6 @@ class Group(Base):
             ('delete_group_permission', _('Can delete group permission')),
         ]
 
-    def get_children(self):
-        return super(Groups, self).get_children().filter(
-            parent=self,
-            is_removed=False,
-        )
-
-    @property
-    def has_children(self):
-        return len(self.get_children()) > 0
-
 
 class GroupPermission(models.Model, ):
     group = models.ForeignKey(
@@ -12,6 +12,7 @@ from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.mail import send_mail
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.itercompat import is_iterable
 from django.utils.translation import gettext_lazy as _
 
@@ -166,34 +167,40 @@ class User(Base, AbstractBaseUser, PermissionsMixin, ):
         return any(self.has_perm(permission, object) for permission in permissions)
 
     def groups_derivative(self):
-        from authentication.models import Group
-        collected = {}
-
-        def collector(group: Group):
-            if group is not None:
-                if not group.pk in collected:
-                    collected.update({group.pk: group, })
-                    if group.derivative_permission == Group.DerivativePermission.parent:
-                        collector(group.parent)
-                    if group.derivative_permission == Group.DerivativePermission.child:
-                        for child in group.children_set.all():
-                            collector(child)
-                    if group.derivative_permission == Group.DerivativePermission.both:
-                        collector(group.parent)
-                        for child in group.children_set.all():
-                            collector(child)
-
+        from authentication.models import Group, GroupClosure
         if self.is_superuser:
             return Group.objects.all()
-        for group in Group.objects.filter(pk__in=list(self.groups.values_list('pk', flat=True))):
-            collector(group)
-        return Group.objects.filter(pk__in=collected.keys())
+        return Group.objects.filter(pk__in=GroupClosure.objects.filter(user=self).values('group_id'))
 
     def permissions_derivative(self):
-        from authentication.models import Permission
+        from authentication.models import Permission, PermissionClosure
         if self.is_superuser:
             return Permission.objects.all()
-        return Permission.objects.filter(group__in=self.groups_derivative())
+        return Permission.objects.filter(pk__in=PermissionClosure.objects.filter(user=self).values('permission_id'))
+
+    @cached_property
+    def effective_permissions(self):
+        """
+        Effective `app_label.codename` set from the permission closure. Loaded with one
+        query, shared through the cache until the user's closure is rebuilt and kept on
+        the instance, so `has_perm` on `request.user` is O(1) for the rest of the request.
+        Read by `authentication.backends.PermissionClosureBackend`.
+        """
+        from django.core.cache import cache
+        from authentication.models import PermissionClosure
+        from authentication.models.closure import effective_permissions_key
+
+        key = effective_permissions_key(self.pk)
+        permissions = cache.get(key)
+        if permissions is None:
+            permissions = frozenset(
+                f'{app_label}.{codename}'
+                for app_label, codename in PermissionClosure.objects.filter(user=self).values_list(
+                    'permission__content_type__app_label', 'permission__codename',
+                )
+            )
+            cache.set(key, permissions, None)
+        return permissions
 
     @property
     def magic(self, ):
@@ -1,4 +1,5 @@
 from django.db import connection
+from django.db.models import signals
 from django.db.models.signals import pre_migrate
 from django.dispatch import receiver
 from django.conf import settings
@@ -7,4 +8,77 @@ from django.conf import settings
 def create_schema(sender, **kwargs):
     schema_name = getattr(settings, "SCHEMA", "authentication")
     with connection.cursor() as cursor:
-        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}";')
\ No newline at end of file
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema_name}";')
+
+
+def rebuild_closure(users):
+    from authentication.models import PermissionClosure
+
+    users = {user for user in users if user is not None}
+    if users:
+        PermissionClosure.objects.rebuild(users=users)
+
+
+def closure_users(instance, reverse, pk_set):
+    """
+    Users affected by a user m2m change: the instance on the user side, `pk_set` on the reverse side.
+    """
+    if not reverse:
+        return {instance.pk}
+    return set(pk_set or [])
+
+
+def user_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        # pk_set is not available on clear, remember who was linked
+        other = [field.name for field in sender._meta.fields if field.is_relation and field.name != 'user'][0]
+        instance._closure_users = set(sender.objects.filter(**{other: instance.pk}).values_list('user_id', flat=True))
+        return
+    if not action.startswith('post_'):
+        return
+    if action == 'post_clear' and reverse:
+        rebuild_closure(getattr(instance, '_closure_users', set()))
+        return
+    rebuild_closure(closure_users(instance, reverse, pk_set))
+
+
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    from authentication.models import PermissionClosure
+
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # instance is a permission, pk_set the groups it was added to/removed from
+        groups = pk_set or []
+    else:
+        groups = [instance.pk]
+    if action == 'post_clear' and reverse:
+        rebuild_closure(PermissionClosure.objects.filter(permission=instance).values_list('user_id', flat=True))
+        return
+    rebuild_closure(PermissionClosure.objects.users_for_groups(groups))
+
+
+def group_hierarchy_changed(sender, instance, created, **kwargs):
+    from authentication.models import PermissionClosure
+
+    if created:
+        # A new group has no members yet, it is only reached through its parent
+        if instance.parent_id is not None:
+            rebuild_closure(PermissionClosure.objects.users_for_groups([instance.parent_id]))
+        return
+    fields = ('parent_id', 'derivative_permission', 'is_removed')
+    if not any(instance.tracker.has_changed(field) for field in fields):
+        return
+    groups = {instance.pk, instance.parent_id, instance.tracker.previous('parent_id')}
+    groups.update(sender.objects.filter(parent=instance).values_list('pk', flat=True))
+    rebuild_closure(PermissionClosure.objects.users_for_groups([group for group in groups if group is not None]))
+
+
+def connect_closure_signals():
+    from django.contrib.auth.models import Group as DjangoGroup
+    from authentication.models import Group, User
+
+    signals.m2m_changed.connect(user_m2m_changed, sender=User.groups.through, dispatch_uid='authentication.closure.groups')
+    signals.m2m_changed.connect(user_m2m_changed, sender=User.user_permissions.through, dispatch_uid='authentication.closure.user_permissions')
+    signals.m2m_changed.connect(group_permissions_changed, sender=DjangoGroup.permissions.through, dispatch_uid='authentication.closure.group_permissions')
+    signals.post_save.connect(group_hierarchy_changed, sender=Group, dispatch_uid='authentication.closure.group')
@@ -0,0 +1,22 @@
+from django.contrib.auth.models import Group as DjangoGroup, Permission
+from django.test import TestCase
+
+from authentication.models import Group, User
+
+
+class PermissionClosureSignalTests(TestCase):
+    def create_group(self, name, **kwargs):
+        group = DjangoGroup.objects.create(name=name)
+        Group.objects.create(group_id=str(group.pk), group_name=name, **kwargs)
+        return group
+
+    def test_new_child_group_passes_permissions_to_parent_members(self):
+        parent = self.create_group('parent', derivative_permission=Group.DerivativePermission.child)
+        user = User.objects.create(user_id='member', user_name='member', real_name='Member', email='member@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.groups.add(parent)
+            child = self.create_group('child', parent_id=str(parent.pk))
+            child.permissions.add(Permission.objects.get(content_type__app_label='authentication', codename='add_group_permission'))
+
+        user = User.objects.get(pk=user.pk)
+        self.assertTrue(user.has_perm('authentication.add_group_permission'))
@@ -0,0 +1,79 @@
+import logging
+
+from django.db import connections, router, transaction
+from django.db.models import signals
+
+logger = logging.getLogger(__name__)
+
+
+def _m2m(owner, field_name):
+    field = owner._meta.get_field(field_name)
+    through = field.remote_field.through
+    return field, through, field.m2m_column_name(), field.m2m_reverse_name()
+
+
+def _send(owner, field, through, action, pk_set, using):
+    signals.m2m_changed.send(
+        sender=through,
+        instance=owner,
+        action=action,
+        reverse=False,
+        model=field.related_model,
+        pk_set=pk_set,
+        using=using,
+    )
+
+
+def grant_permissions(owner, field_name, permissions):
+    """
+    Link every permission in `permissions` (a queryset) that `owner` does not have yet
+    through the m2m `field_name`, with one `INSERT ... SELECT ... ON CONFLICT DO NOTHING`.
+
+    `m2m_changed` is sent once with the ids actually added, so cacheops and the
+    permission closure are invalidated once per call instead of once per permission.
+    Returns the set of added permission ids.
+    """
+    field, through, owner_column, permission_column = _m2m(owner, field_name)
+    using = router.db_for_write(through, instance=owner)
+    existing = through._default_manager.using(using).filter(**{owner_column: owner.pk}).values(permission_column)
+    missing = set(permissions.exclude(pk__in=existing).values_list('pk', flat=True))
+    if not missing:
+        return missing
+
+    table = connections[using].ops.quote_name(through._meta.db_table)
+    with transaction.atomic(using=using, savepoint=False):
+        _send(owner, field, through, 'pre_add', missing, using)
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ("{owner_column}", "{permission_column}") '
+                f'SELECT %s, permission_id FROM unnest(%s) AS permission_id '
+                f'ON CONFLICT DO NOTHING',
+                [owner.pk, list(missing)],
+            )
+        _send(owner, field, through, 'post_add', missing, using)
+    return missing
+
+
+def revoke_permissions(owner, field_name, permission_ids):
+    """
+    Unlink `permission_ids` from `owner` with a single `DELETE ... RETURNING`, sending
+    `m2m_changed` once with the ids actually removed. Returns that set.
+    """
+    field, through, owner_column, permission_column = _m2m(owner, field_name)
+    using = router.db_for_write(through, instance=owner)
+    permission_ids = set(permission_ids)
+    if not permission_ids:
+        return permission_ids
+
+    table = connections[using].ops.quote_name(through._meta.db_table)
+    with transaction.atomic(using=using, savepoint=False):
+        _send(owner, field, through, 'pre_remove', permission_ids, using)
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE "{owner_column}" = %s AND "{permission_column}" = ANY(%s) '
+                f'RETURNING "{permission_column}"',
+                [owner.pk, list(permission_ids)],
+            )
+            removed = {row[0] for row in cursor.fetchall()}
+        _send(owner, field, through, 'post_remove', removed, using)
+    return removed
@@ -1,6 +1,6 @@
-from core.models import MenuCategory
+from core.utils.menu_tree import menu_tree
 
 def sidebar_context(request):
     """Mengambil data kategori menu untuk semua template"""
-    categories = MenuCategory.objects.prefetch_related('menus__submenus').all()
+    categories = menu_tree.for_user(getattr(request, 'user', None))
     return {'categories': categories}
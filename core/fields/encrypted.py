@@ -1,5 +1,6 @@
 import hashlib
 import string
+from functools import lru_cache
 from inspect import isclass
 
 from Crypto.Cipher import AES
@@ -22,6 +23,8 @@ from django.utils.text import capfirst
 from core import settings
 
 __all__ = [
+    'KeyRing',
+    'key_ring',
     'EncryptedFieldMixin',
     'EncryptedTextField',
     'EncryptedCharField',
@@ -37,6 +40,92 @@ __all__ = [
 ]
 
 
+# Header of values written by KeyRing: marker + 4 bytes key id, followed by nonce, tag and cypher text.
+# Values without it (written before the key ring) are still decrypted by trying every key.
+KEY_RING_MARKER = b'kr1:'
+KEY_ID_LENGTH = 4
+HEADER_LENGTH = len(KEY_RING_MARKER) + KEY_ID_LENGTH
+NONCE_LENGTH = 16
+TAG_LENGTH = 16
+
+
+class KeyRing:
+    """
+    Parsed FIELD_ENCRYPTION_KEYS. The first key encrypts, every key decrypts.
+
+    Each key is identified by the first bytes of its SHA-256, written in the
+    header of every value, so decrypting picks the right key directly instead
+    of verifying the GCM tag against each key in turn.
+    """
+
+    def __init__(self, keys):
+        if not isinstance(keys, (list, tuple)):
+            raise ImproperlyConfigured('FIELD_ENCRYPTION_KEYS should be a list.')
+        if not keys:
+            raise ImproperlyConfigured('FIELD_ENCRYPTION_KEYS should contain at least one key.')
+        self.keys = [bytes.fromhex(key) for key in keys]
+        self.ids = [hashlib.sha256(key).digest()[:KEY_ID_LENGTH] for key in self.keys]
+        self.by_id = dict(zip(self.ids, self.keys))
+        self.primary = self.keys[0]
+        self.primary_id = self.ids[0]
+
+    def key_id(self, value):
+        """
+        Key id from the header of `value`, None for headerless values.
+        """
+        value = bytes(value)
+        if value[:len(KEY_RING_MARKER)] != KEY_RING_MARKER or len(value) < HEADER_LENGTH + NONCE_LENGTH + TAG_LENGTH:
+            return None
+        return value[len(KEY_RING_MARKER):HEADER_LENGTH]
+
+    def is_current(self, value):
+        return self.key_id(value) == self.primary_id
+
+    def encrypt(self, data):
+        cipher = AES.new(self.primary, AES.MODE_GCM)
+        cypher_text, tag = cipher.encrypt_and_digest(data)
+        return KEY_RING_MARKER + self.primary_id + cipher.nonce + tag + cypher_text
+
+    def _open(self, key, value):
+        nonce = value[:NONCE_LENGTH]
+        tag = value[NONCE_LENGTH:NONCE_LENGTH + TAG_LENGTH]
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(value[NONCE_LENGTH + TAG_LENGTH:], tag)
+
+    def decrypt(self, value):
+        value = bytes(value)
+        key = self.by_id.get(self.key_id(value))
+        if key is not None:
+            try:
+                return self._open(key, value[HEADER_LENGTH:])
+            except ValueError:
+                # A headerless value whose nonce happens to start like a header
+                pass
+        if len(value) < NONCE_LENGTH + TAG_LENGTH:
+            raise ValueError('Data is corrupted.')
+        for key in self.keys:
+            try:
+                return self._open(key, value)
+            except ValueError:
+                continue
+        raise ValueError('AES Key incorrect or data is corrupted')
+
+
+@lru_cache(maxsize=4)
+def _key_ring(keys):
+    return KeyRing(list(keys))
+
+
+def key_ring():
+    """
+    Shared KeyRing for the configured keys, parsed once per key list.
+    """
+    keys = settings.FIELD_ENCRYPTION_KEYS
+    if not isinstance(keys, (list, tuple)):
+        raise ImproperlyConfigured('FIELD_ENCRYPTION_KEYS should be a list.')
+    return _key_ring(tuple(keys))
+
+
 class EncryptedFieldMixin(models.Field):
     def __init__(self, *args, **kwargs):
         if kwargs.get('primary_key'):
@@ -55,31 +144,19 @@ class EncryptedFieldMixin(models.Field):
             raise ImproperlyConfigured('FIELD_ENCRYPTION_KEYS should be a list.')
         return key_list
 
+    @property
+    def key_ring(self):
+        return key_ring()
+
     def encrypt(self, data_to_encrypt):
         if not isinstance(data_to_encrypt, str):
             data_to_encrypt = str(data_to_encrypt)
-        cipher = AES.new(bytes.fromhex(self.keys[0]), AES.MODE_GCM)
-        nonce = cipher.nonce
-        cypher_text, tag = cipher.encrypt_and_digest(data_to_encrypt.encode())
-        return nonce + tag + cypher_text
+        return self.key_ring.encrypt(data_to_encrypt.encode())
 
     def decrypt(self, value):
-        nonce = value[:16]
-        if not isinstance(nonce, (bytes, bytearray, memoryview)) or len(nonce) != 16:
+        if not isinstance(value, (bytes, bytearray, memoryview)):
             raise ValueError('Data is corrupted.')
-        tag = value[16:32]
-        cypher_text = value[32:]
-        counter = 0
-        num_keys = len(self.keys)
-        while counter < num_keys:
-            cipher = AES.new(bytes.fromhex(self.keys[counter]), AES.MODE_GCM, nonce=nonce)
-            try:
-                plaintext = cipher.decrypt_and_verify(cypher_text, tag)
-            except ValueError:
-                counter += 1
-                continue
-            return plaintext.decode()
-        raise ValueError('AES Key incorrect or data is corrupted')
+        return self.key_ring.decrypt(value).decode()
 
     def get_internal_type(self):
         return self._internal_type
@@ -0,0 +1,50 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Backfill stored search vector columns declared with core.models.SearchVectors in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', type=str, help="Model labels, e.g. authentication.Group (default: all)")
+        parser.add_argument('--batch-size', type=int, default=10000, help="Rows updated per statement")
+        parser.add_argument('--sleep', type=float, default=0, help="Seconds to pause between batches")
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every row, not only empty ones")
+
+    def get_models(self, labels):
+        if not labels:
+            return [model for model in apps.get_models() if getattr(model, '_stored_search_vector', None)]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f"Unknown model {label}: {e}")
+            if not getattr(model, '_stored_search_vector', None):
+                raise CommandError(f"{label} does not declare SearchVectors")
+            models.append(model)
+        return models
+
+    def handle(self, *args, **options):
+        models = self.get_models(options['models'])
+        if not models:
+            self.stdout.write(self.style.WARNING("No model declares SearchVectors."))
+            return
+
+        for model in models:
+            search_vector = model._stored_search_vector
+            if search_vector.generated:
+                self.stdout.write(f"{model._meta.label}: generated column, nothing to backfill")
+                continue
+            total = 0
+            started = time.perf_counter()
+            for updated in search_vector.backfill(batch_size=options['batch_size'], rebuild=options['rebuild']):
+                total += updated
+                self.stdout.write(f"{model._meta.label}: {total} rows")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.label}: backfilled {total} rows in {time.perf_counter() - started:.1f}s"
+            ))
@@ -0,0 +1,97 @@
+import asyncio
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.channelsredis.core import RedisChannelLayer
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Measure messages per second and latency of the Redis channel layer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='redis://127.0.0.1:6379/2', help="Redis used for the run")
+        parser.add_argument('--messages', type=int, default=10000, help="Messages received per run")
+        parser.add_argument('--group-size', type=int, default=10, help="Channel layers, each with a channel in the group, of the group_send run")
+        parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 50], help="receive_batch_size values")
+        parser.add_argument('--payload', type=int, default=256, help="Bytes of text in each message")
+        parser.add_argument('--encrypt', action='store_true', help="Encrypt messages with a symmetric key")
+
+    async def receiver(self, layer, channel, count, latencies):
+        for _ in range(count):
+            message = await layer.receive(channel)
+            latencies.append(time.perf_counter() - message['sent'])
+
+    async def run_send(self, layers, options, latencies):
+        layer = layers[0]
+        channel = await layer.new_channel()
+        text = 'x' * options['payload']
+        receiver = asyncio.ensure_future(self.receiver(layer, channel, options['messages'], latencies))
+        for _ in range(options['messages']):
+            await layer.send(channel, {'type': 'benchmark', 'text': text, 'sent': time.perf_counter()})
+        await receiver
+
+    async def run_group_send(self, layers, options, latencies):
+        # Satu layer per anggota grup, seperti consumer di proses yang berbeda
+        group = f'benchmark{uuid.uuid4().hex}'
+        channels = []
+        for layer in layers:
+            channel = await layer.new_channel()
+            await layer.group_add(group, channel)
+            channels.append((layer, channel))
+        sends = max(1, options['messages'] // len(layers))
+        text = 'x' * options['payload']
+        receivers = asyncio.gather(*[self.receiver(layer, channel, sends, latencies) for layer, channel in channels])
+        for _ in range(sends):
+            await layers[0].group_send(group, {'type': 'benchmark', 'text': text, 'sent': time.perf_counter()})
+        await receivers
+
+    async def run(self, runner, layer_count, batch_size, options):
+        prefix = f'benchmark{uuid.uuid4().hex[:8]}'
+        layers = [
+            RedisChannelLayer(
+                hosts=[options['host']],
+                prefix=prefix,
+                capacity=options['messages'],
+                symmetric_encryption_keys=['benchmark'] if options['encrypt'] else None,
+                receive_batch_size=batch_size,
+            )
+            for _ in range(layer_count)
+        ]
+        latencies = []
+        try:
+            started = time.perf_counter()
+            await asyncio.wait_for(runner(layers, options, latencies), timeout=300)
+            elapsed = time.perf_counter() - started
+        finally:
+            for layer in layers[1:]:
+                await layer.close_pools()
+            await layers[0].flush()
+        return len(latencies), elapsed, latencies
+
+    def handle(self, *args, **options):
+        if options['messages'] < 1 or options['group_size'] < 1 or min(options['batch_sizes']) < 1:
+            raise CommandError("--messages, --group-size and --batch-sizes must be at least 1")
+
+        runs = [('send', self.run_send, 1), ('group_send', self.run_group_send, options['group_size'])]
+        for name, runner, layer_count in runs:
+            for batch_size in options['batch_sizes']:
+                try:
+                    received, elapsed, latencies = asyncio.run(self.run(runner, layer_count, batch_size, options))
+                except asyncio.TimeoutError:
+                    raise CommandError(f"{name} with batch size {batch_size} did not finish, messages were dropped")
+                self.stdout.write(
+                    f"{name:<11} batch: {batch_size:>3}, received: {received}, "
+                    f"throughput: {received / elapsed:.0f} msg/s, "
+                    f"p50: {percentile(latencies, 0.5) * 1000:.2f} ms, "
+                    f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms"
+                )
+        self.stdout.write(self.style.SUCCESS("Done"))
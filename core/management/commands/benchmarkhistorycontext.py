@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from library.postgres import pghistory
+
+
+class Command(BaseCommand):
+    help = "Measure the per statement overhead of pghistory.context injection modes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--statements', type=int, default=2000, help="Statements per transaction")
+        parser.add_argument('--transactions', type=int, default=5, help="Transactions per mode")
+        parser.add_argument('--metadata', type=int, default=10, help="Keys in the context metadata")
+
+    def run(self, options, mode, metadata):
+        statements = options['statements']
+        started = time.perf_counter()
+        injected = 0
+        for _ in range(options['transactions']):
+            with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+                if mode is None:
+                    self.execute(statements)
+                else:
+                    with override_settings(PGHISTORY_CONTEXT_INJECTION=mode), pghistory.context(**metadata):
+                        self.execute(statements)
+            injected += sum('pghistory.context_id' in query['sql'] for query in queries.captured_queries)
+        return time.perf_counter() - started, injected
+
+    def execute(self, statements):
+        with connection.cursor() as cursor:
+            for i in range(statements):
+                cursor.execute('SELECT %s', [i])
+
+    def handle(self, *args, **options):
+        if options['statements'] < 1 or options['transactions'] < 1:
+            raise CommandError("--statements and --transactions must be at least 1")
+
+        metadata = {f'key{i}': f'value {i}' * 4 for i in range(options['metadata'])}
+        total = options['statements'] * options['transactions']
+        baseline = None
+        for mode in (None, 'statement', 'transaction'):
+            elapsed, injected = self.run(options, mode, metadata)
+            per_statement = elapsed / total * 1_000_000
+            if baseline is None:
+                baseline = per_statement
+            self.stdout.write(
+                f"{mode or 'no context':<12} {per_statement:.1f} us/statement, "
+                f"overhead: {per_statement - baseline:+.1f} us, injected: {injected} of {total}"
+            )
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,114 @@
+import os
+import resource
+import time
+import tracemalloc
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test.client import RequestFactory
+
+from library.privatestorage.models import PrivateFile
+from library.privatestorage.servers import get_server_class
+from library.privatestorage.storage import private_storage
+
+
+def max_rss():
+    # ru_maxrss dalam KiB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Command(BaseCommand):
+    help = "Compare throughput and memory of the privatestorage server classes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help="Existing file in the private storage (default: a temporary file)")
+        parser.add_argument('--size', type=int, default=64, help="Size of the temporary file in MB")
+        parser.add_argument('--servers', nargs='+', default=['streaming', 'django', 'range'])
+        parser.add_argument('--range', type=str, default=None, help="Range header to send, e.g. bytes=0-1048575")
+        parser.add_argument('--repeat', type=int, default=3, help="Number of runs per server")
+        parser.add_argument(
+            '--sendfile', action='store_true',
+            help="Send file responses with os.sendfile() like a wsgi.file_wrapper does (Linux)",
+        )
+
+    def consume(self, response, sendfile, sink):
+        """
+        Read the whole response body, the way the WSGI server would.
+        """
+        filelike = getattr(response, 'file_to_stream', None)
+        if sendfile and filelike is not None:
+            try:
+                fileno = filelike.fileno()
+            except (AttributeError, OSError):
+                fileno = None
+            if fileno is not None:
+                offset = os.lseek(fileno, 0, os.SEEK_CUR)
+                count = int(response['Content-Length'])
+                sent = 0
+                while sent < count:
+                    done = os.sendfile(sink, fileno, offset + sent, count - sent)
+                    if not done:
+                        break
+                    sent += done
+                return sent
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    def run(self, server_class, name, options, sink):
+        factory = RequestFactory()
+        extra = {'HTTP_RANGE': options['range']} if options['range'] else {}
+        sent = 0
+        status = None
+        tracemalloc.start()
+        started = time.perf_counter()
+        for _ in range(options['repeat']):
+            private_file = PrivateFile(factory.get('/', **extra), private_storage, name)
+            response = server_class().serve(private_file)
+            status = response.status_code
+            try:
+                sent += self.consume(response, options['sendfile'], sink)
+            finally:
+                response.close()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return status, sent, elapsed, peak
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['size'] < 1:
+            raise CommandError("--repeat and --size must be at least 1")
+        servers = []
+        for path in options['servers']:
+            try:
+                servers.append((path, get_server_class(path)))
+            except Exception as e:
+                raise CommandError(f"Unknown server {path}: {e}")
+
+        name = options['name']
+        temporary = name is None
+        if temporary:
+            block = os.urandom(1024 * 1024)
+            name = private_storage.save(
+                'benchmark/privatestorage.bin', ContentFile(block * options['size'])
+            )
+            del block
+        elif not private_storage.exists(name):
+            raise CommandError(f"{name} does not exist in the private storage")
+
+        sink = os.open(os.devnull, os.O_WRONLY)
+        try:
+            self.stdout.write(f"file: {name}, size: {private_storage.size(name) / 1024 / 1024:.1f} MB")
+            for path, server_class in servers:
+                rss = max_rss()
+                status, sent, elapsed, peak = self.run(server_class, name, options, sink)
+                self.stdout.write(
+                    f"{path:<12} status: {status}, sent: {sent / 1024 / 1024:.1f} MB, "
+                    f"throughput: {sent / 1024 / 1024 / elapsed:.0f} MB/s, "
+                    f"peak alloc: {peak / 1024:.0f} KB, max RSS growth: {(max_rss() - rss) / 1024:.0f} KB"
+                )
+        finally:
+            os.close(sink)
+            if temporary:
+                private_storage.delete(name)
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,72 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+
+from core.utils.search_filter_utils import SearchFilterMixin
+
+
+class Command(BaseCommand):
+    help = "Benchmark queries-per-search for the legacy and ranked SearchFilterMixin engines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', type=str, help="Model label, e.g. authentication.Group")
+        parser.add_argument('search', type=str, help="Search term")
+        parser.add_argument('--columns', nargs='+', default=None, help="Searchable columns (default: all text fields)")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of runs per engine")
+        parser.add_argument('--max-results', type=int, default=50)
+        parser.add_argument('--trigram', action='store_true', help="Enable the trigram tier")
+
+    def build_view(self, model, columns, engine, options):
+        from core.utils.search_engine import classify_fields
+
+        fields = columns or list(classify_fields(model).text_fields)
+
+        class BenchmarkView(SearchFilterMixin):
+            def get_search_fields(self):
+                return fields
+
+            def get_search_config(self):
+                config = super().get_search_config()
+                config.update({
+                    'engine': engine,
+                    'max_results': options['max_results'],
+                    'use_trigram': options['trigram'],
+                    'min_length': 1,
+                })
+                return config
+
+        return BenchmarkView()
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(f"Unknown model {options['model']}: {e}")
+
+        request = Request(RequestFactory().get('/', {'search': options['search']}))
+        queryset = model._default_manager.all()
+
+        for engine in ('legacy', 'ranked'):
+            view = self.build_view(model, options['columns'], engine, options)
+            queries, elapsed, rows = [], [], 0
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                try:
+                    with CaptureQueriesContext(connection) as context:
+                        rows = len(list(view.apply_search(queryset, request)))
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"{engine}: search failed ({e.__class__.__name__}: {e})"))
+                    break
+                elapsed.append((time.perf_counter() - started) * 1000)
+                queries.append(len(context.captured_queries))
+            if not elapsed:
+                continue
+            self.stdout.write(
+                f"{engine:<8} queries/search={max(queries)} rows={rows} "
+                f"avg={sum(elapsed) / len(elapsed):.2f}ms min={min(elapsed):.2f}ms"
+            )
@@ -0,0 +1,85 @@
+import threading
+import time
+import uuid
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+
+from core.models import Sequence, SequenceData, sequence_allocator
+
+
+class Command(BaseCommand):
+    help = "Measure sequence number allocations per second under concurrent workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sequence', type=str, help="Existing sequence id (default: a temporary sequence)")
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent workers, each with its own connection")
+        parser.add_argument('--allocations', type=int, default=500, help="Allocations per worker")
+        parser.add_argument('--block', type=int, default=1, help="Numbers reserved per allocation")
+
+    def worker(self, sequence, part, allocations, block, numbers, errors):
+        try:
+            for _ in range(allocations):
+                with transaction.atomic():
+                    if block == 1:
+                        numbers.append(sequence_allocator.next(sequence, part))
+                    else:
+                        numbers.extend(sequence_allocator.reserve_block(sequence, part, block))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        allocations = options['allocations']
+        block = options['block']
+        if workers < 1 or allocations < 1 or block < 1:
+            raise CommandError("--workers, --allocations and --block must be at least 1")
+
+        temporary = options['sequence'] is None
+        if temporary:
+            sequence = Sequence.objects.create(
+                content_type=ContentType.objects.get_for_model(Sequence),
+                part='benchmark',
+                length=10,
+                prefix='BM-',
+            )
+        else:
+            sequence = Sequence.objects.get(pk=options['sequence'])
+        part = f'benchmark-{uuid.uuid4().hex[:8]}'
+        close_old_connections()
+
+        numbers = []
+        errors = []
+        threads = [
+            threading.Thread(target=self.worker, args=(sequence, part, allocations, block, numbers, errors))
+            for _ in range(workers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            if errors:
+                raise CommandError(f"{len(errors)} workers failed, first error: {errors[0]}")
+            expected = workers * allocations * block
+            self.stdout.write(f"workers: {workers}, allocations: {workers * allocations}, numbers: {len(numbers)}")
+            self.stdout.write(f"elapsed: {elapsed:.2f}s")
+            self.stdout.write(f"allocations/s: {workers * allocations / elapsed:.0f}")
+            self.stdout.write(f"numbers/s: {len(numbers) / elapsed:.0f}")
+            if len(numbers) != expected or len(set(numbers)) != expected:
+                raise CommandError(f"Expected {expected} distinct numbers, got {len(set(numbers))}")
+            step = sequence.counter or 1
+            current = SequenceData.objects.get(sequence=sequence, part=part).current
+            if current != expected * step:
+                raise CommandError(f"Counter ended at {current}, expected {expected * step}")
+            self.stdout.write(self.style.SUCCESS("All numbers distinct and gap-free"))
+        finally:
+            SequenceData.objects.filter(sequence=sequence, part=part).delete()
+            if temporary:
+                Sequence.all_objects.filter(pk=sequence.pk).delete()
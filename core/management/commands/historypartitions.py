@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.partition import partitioned_history_models
+
+
+class Command(BaseCommand):
+    help = "Convert, pre-create and expire monthly partitions of History(partitioned=True) tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', type=str, help="History model labels, e.g. authentication.HistoricalUser (default: all)")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be converted, created and expired")
+
+    def get_models(self, labels):
+        if not labels:
+            return partitioned_history_models()
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f"Unknown model {label}: {e}")
+            if getattr(model, '_history_partitions', None) is None:
+                raise CommandError(f"{label} is not a partitioned history model")
+            models.append(model)
+        return models
+
+    def handle(self, *args, **options):
+        models = self.get_models(options['models'])
+        if not models:
+            self.stdout.write(self.style.WARNING("No history model is partitioned."))
+            return
+
+        dry_run = options['dry_run']
+        for model in models:
+            converted, created, expired = model._history_partitions.maintain(dry_run=dry_run)
+            label = model._meta.label
+            if converted:
+                self.stdout.write(f"{label}: {'needs conversion' if dry_run else 'converted'} to partitions")
+            for name in created:
+                self.stdout.write(f"{label}: {'would create' if dry_run else 'created'} {name}")
+            for name in expired:
+                self.stdout.write(f"{label}: {'would expire' if dry_run else 'expired'} {name}")
+            self.stdout.write(self.style.SUCCESS(f"{label}: partitions up to date"))
@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from library.hueymonitorutils.dbperf.profiler import query_stats
+from library.hueymonitorutils.dbperf.views import ORDERS
+
+
+class Command(BaseCommand):
+    help = "Show the top query fingerprints and N+1 patterns recorded by the sampled query profiler"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help="Number of fingerprints shown")
+        parser.add_argument('--windows', type=int, help="Stats windows included (default: all kept)")
+        parser.add_argument('--order', choices=ORDERS, default='time', help="Sort by total time, count, mean or p95 latency")
+        parser.add_argument('--json', action='store_true', help="Print the same JSON as the staff endpoint")
+        parser.add_argument('--clear', action='store_true', help="Delete all recorded stats")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = query_stats.clear()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} query stats keys"))
+            return
+
+        queries = query_stats.top(limit=options['limit'], windows=options['windows'], order=options['order'])
+        nplusone = query_stats.nplusone(limit=options['limit'], windows=options['windows'])
+        if options['json']:
+            self.stdout.write(json.dumps({'queries': queries, 'nplusone': nplusone}, indent=2))
+            return
+
+        if not queries:
+            self.stdout.write(self.style.WARNING("No query stats recorded, is DBPERF_REQUEST_SAMPLE_RATE set?"))
+        for row in queries:
+            self.stdout.write(
+                f"{row['fingerprint']} count={row['count']:<8} time={row['time']:.0f}ms mean={row['mean']:.1f}ms "
+                f"p50={row['p50']} p95={row['p95']} p99={row['p99']} rows={row['rows']}"
+            )
+            self.stdout.write(f"    {row['label']} @ {row['frame']}")
+            self.stdout.write(f"    {row['sql'][:300]}")
+        if nplusone:
+            self.stdout.write(self.style.WARNING("N+1 patterns:"))
+            for row in nplusone:
+                self.stdout.write(f"{row['fingerprint']} profiles={row['profiles']:<6} {row['frame']}")
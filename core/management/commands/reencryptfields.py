@@ -0,0 +1,120 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+
+from core.fields.encrypted import EncryptedFieldMixin, key_ring
+
+
+def encrypted_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, EncryptedFieldMixin)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Re-encrypt encrypted field values with the first FIELD_ENCRYPTION_KEYS key in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', type=str, help="Model labels, e.g. authentication.User (default: all)")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows read and rewritten per batch")
+        parser.add_argument('--sleep', type=float, default=0, help="Seconds to pause between batches")
+        parser.add_argument('--dry-run', action='store_true', help="Only count values that need re-encryption")
+
+    def get_models(self, labels):
+        if not labels:
+            return [model for model in apps.get_models() if model._meta.managed and encrypted_fields(model)]
+        models = []
+        for label in labels:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(f"Unknown model {label}: {e}")
+            if not encrypted_fields(model):
+                raise CommandError(f"{label} has no encrypted fields")
+            models.append(model)
+        return models
+
+    def batches(self, model, fields, batch_size):
+        """
+        Raw (still encrypted) values in primary key order, one batch at a time.
+        """
+        connection = connections[router.db_for_read(model)]
+        quote = connection.ops.quote_name
+        pk = quote(model._meta.pk.column)
+        columns = ', '.join(quote(field.column) for field in fields)
+        table = quote(model._meta.db_table)
+        last = None
+        while True:
+            where = f'WHERE {pk} > %s' if last is not None else ''
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT {pk}, {columns} FROM {table} {where} ORDER BY {pk} LIMIT %s',
+                    ([last] if last is not None else []) + [batch_size],
+                )
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+
+    def reencrypt(self, model, fields, rows):
+        """
+        Rewrite the stale values of one batch, returns the number of values rewritten.
+        """
+        ring = key_ring()
+        updates = []
+        rewritten = 0
+        for row in rows:
+            values = []
+            changed = False
+            for value in row[1:]:
+                if value is None or ring.is_current(value):
+                    values.append(value)
+                    continue
+                values.append(ring.encrypt(ring.decrypt(value)))
+                changed = True
+                rewritten += 1
+            if changed:
+                updates.append(values + [row[0]])
+        if not updates or self.dry_run:
+            return rewritten
+
+        using = router.db_for_write(model)
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        assignments = ', '.join(f'{quote(field.column)} = %s' for field in fields)
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {quote(model._meta.db_table)} SET {assignments} WHERE {quote(model._meta.pk.column)} = %s',
+                [
+                    [connection.Database.Binary(bytes(value)) if value is not None else None for value in values] + [pk]
+                    for *values, pk in updates
+                ],
+            )
+        return rewritten
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        models = self.get_models(options['models'])
+        if not models:
+            self.stdout.write(self.style.WARNING("No model has encrypted fields."))
+            return
+
+        for model in models:
+            fields = encrypted_fields(model)
+            total = 0
+            rewritten = 0
+            started = time.perf_counter()
+            for rows in self.batches(model, fields, options['batch_size']):
+                total += len(rows)
+                rewritten += self.reencrypt(model, fields, rows)
+                self.stdout.write(f"{model._meta.label}: {total} rows scanned, {rewritten} values re-encrypted")
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+            verb = "need re-encryption" if self.dry_run else "re-encrypted"
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.label}: {rewritten} values {verb} in {time.perf_counter() - started:.1f}s"
+            ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core.utils.response_cache import collect_views
+
+
+class Command(BaseCommand):
+    help = "Show response cache and proxy cache hit/miss metrics per view"
+
+    def handle(self, *args, **kwargs):
+        views = collect_views(get_resolver().url_patterns, set())
+        for view_class in sorted(views, key=lambda view: view.__name__):
+            cache = getattr(view_class, 'response_cache', None)
+            if cache is not None:
+                stats = cache.stats(view_class.__name__)
+                hit_rate = '-' if stats['hit_rate'] is None else f"{stats['hit_rate'] * 100:.1f}%"
+                self.stdout.write(
+                    f"{view_class.__name__:<32} hits={stats['hits']:<8} misses={stats['misses']:<8} hit_rate={hit_rate}"
+                )
+            proxy_cache = getattr(view_class, 'proxy_cache', None)
+            if proxy_cache is not None:
+                stats = proxy_cache.stats(view_class.__name__)
+                hit_rate = '-' if stats['hit_rate'] is None else f"{stats['hit_rate'] * 100:.1f}%"
+                self.stdout.write(
+                    f"{view_class.__name__:<32} hits={stats['hit']:<8} misses={stats['miss']:<8} "
+                    f"revalidated={stats['revalidated']:<8} coalesced={stats['coalesced']:<8} "
+                    f"bypass={stats['bypass']:<8} evicted={stats['evicted']:<8} hit_rate={hit_rate}"
+                )
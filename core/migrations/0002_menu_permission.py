@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menu',
+            name='permission',
+            field=models.CharField(blank=True, help_text="Permission yang dibutuhkan untuk melihat menu (contoh: 'authentication.view_user'). Kosongkan jika semua user boleh.", max_length=255, null=True, verbose_name='Permission'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_menu_permission'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicalsequence',
+            index=models.Index(fields=['sequence_id', '-history_date', '-history_id'], name='historicalsequence_asof'),
+        ),
+        migrations.AddIndex(
+            model_name='historicalsequencedata',
+            index=models.Index(fields=['id', '-history_date', '-history_id'], name='historicalsequencedata_asof'),
+        ),
+        migrations.AddIndex(
+            model_name='historicalsequencenumber',
+            index=models.Index(fields=['id', '-history_date', '-history_id'], name='historicalsequencenumber_asof'),
+        ),
+    ]
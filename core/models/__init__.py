@@ -1,3 +1,4 @@
+from core.models.hierarchy import HierarchyManager, HierarchyNode, HierarchyQuerySet
 from core.models.menu import Menu, MenuCategory
 from core.models.base import (
     TimeStamped,
@@ -19,17 +20,24 @@ from core.models.sequence import (
     Sequence,
     SequenceData,
     SequenceNumber,
+    SequenceAllocator,
+    sequence_allocator,
 )
+from core.models.partition import HistoryPartitions
 from core.models.optimizations import (
     PostgresOptimizer,
     SchemaView,
     Trigrams,
     IndexOptimizer,
     FullOptimizer,
+    SearchVectors,
 )
 
 __all__ = [
     # Existing models
+    HierarchyManager,
+    HierarchyNode,
+    HierarchyQuerySet,
     Menu,
     MenuCategory,
     TimeStamped,
@@ -49,6 +57,9 @@ __all__ = [
     Sequence,
     SequenceData,
     SequenceNumber,
+    SequenceAllocator,
+    sequence_allocator,
+    HistoryPartitions,
     
     # Optimization classes
     PostgresOptimizer,
@@ -56,4 +67,5 @@ __all__ = [
     Trigrams, 
     IndexOptimizer,
     FullOptimizer,
+    SearchVectors,
 ]
\ No newline at end of file
@@ -6,6 +6,7 @@ from django.db import (
     models,
     transaction,
 )
+from django.db.models.signals import post_migrate
 from django.db.models.functions import Now
 from django.utils import timezone
 from django.utils.deconstruct import deconstructible
@@ -64,7 +65,40 @@ __all__: [
 
 
 class History(HistoricalRecords):
-    pass
+    """
+    `HistoricalRecords` with the snapshot index on. `partitioned=True` keeps the
+    history table as monthly range partitions by `history_date` (see
+    `HistoryPartitions`), with `retention` months kept and `premake` months created ahead.
+    """
+
+    def __init__(self, *args, partitioned=False, retention=None, premake=3, drop_expired=False, **kwargs):
+        # Index (pk, -history_date, -history_id) supaya as_of/latest_of_each tidak scan seluruh tabel
+        kwargs.setdefault('snapshot_index', True)
+        super().__init__(*args, **kwargs)
+        self.partitioned = partitioned
+        self.retention = retention
+        self.premake = premake
+        self.drop_expired = drop_expired
+
+    def create_history_model(self, model, inherited):
+        history_model = super().create_history_model(model, inherited)
+        history_model._history_partitions = None
+        if self.partitioned:
+            from core.models.partition import HistoryPartitions
+
+            partitions = HistoryPartitions(
+                history_model,
+                premake=self.premake,
+                retention=self.retention,
+                drop=self.drop_expired,
+            )
+            history_model._history_partitions = partitions
+            post_migrate.connect(
+                partitions._post_migrate_handler,
+                sender=history_model._meta.app_config,
+                weak=False,
+            )
+        return history_model
 
 
 class Base64:
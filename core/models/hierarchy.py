@@ -0,0 +1,219 @@
+import logging
+
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+# Batas kedalaman traversal, sekaligus pengaman terhadap data yang rusak
+MAX_DEPTH = 64
+
+# Anchor the traversal on every node instead of a given set
+ALL_NODES = object()
+
+
+class HierarchyOptions:
+    def __init__(self, model, parent_field, max_depth, order_field):
+        self.model = model
+        self.parent_field = parent_field
+        self.max_depth = max_depth
+        self.order_field = order_field
+
+    @cached_property
+    def exclude_removed(self):
+        # Resolved lazily, inherited fields are not there yet while the class is built
+        return any(field.name == 'is_removed' for field in self.model._meta.concrete_fields)
+
+
+def node_pks(nodes):
+    return [getattr(node, 'pk', node) for node in nodes]
+
+
+class HierarchyQuerySet(models.QuerySet):
+    """
+    Ancestor/descendant queries for self-referencing (adjacency list) models,
+    each answered by one `WITH RECURSIVE` query. Cycles are cut by the visited
+    path and runaway trees by `max_depth`, soft removed nodes cut their subtree.
+    """
+
+    @property
+    def options(self):
+        return self.model._hierarchy
+
+    def tree_sql(self, roots, direction='down', max_depth=None):
+        """
+        Recursive CTE `tree(node_id, root_id, parent_id, depth, path)` walking
+        `direction` ('down' or 'up') from `roots`: a list of pks, `ALL_NODES`, or
+        None for the top level nodes. Returns (sql, params) with positional params.
+        """
+        options = self.options
+        quote = connections[self.db].ops.quote_name
+        table = quote(self.model._meta.db_table)
+        pk = quote(self.model._meta.pk.column)
+        parent = quote(self.model._meta.get_field(options.parent_field).column)
+        removed = ' AND NOT {alias}."is_removed"' if options.exclude_removed else ''
+
+        params = []
+        if roots is None:
+            anchor = f'node.{parent} IS NULL'
+        elif roots is ALL_NODES:
+            anchor = 'TRUE'
+        else:
+            anchor = f'node.{pk} = ANY(%s)'
+            params.append(list(roots))
+        if direction == 'down':
+            join = f'next.{parent} = tree.node_id'
+        else:
+            join = f'next.{pk} = tree.parent_id'
+        params.append(max_depth or options.max_depth)
+
+        sql = f'''
+            WITH RECURSIVE tree(node_id, root_id, parent_id, depth, path) AS (
+                SELECT node.{pk}, node.{pk}, node.{parent}, 0, ARRAY[node.{pk}::text]
+                FROM {table} AS node
+                WHERE {anchor}{removed.format(alias='node')}
+                UNION ALL
+                SELECT next.{pk}, tree.root_id, next.{parent}, tree.depth + 1, tree.path || next.{pk}::text
+                FROM tree
+                JOIN {table} AS next ON {join}
+                WHERE tree.depth < %s
+                    AND NOT next.{pk}::text = ANY(tree.path){removed.format(alias='next')}
+            )
+        '''
+        return sql, params
+
+    def _nodes_in_tree(self, roots, direction, include_self, max_depth):
+        sql, params = self.tree_sql(roots, direction, max_depth)
+        where = '' if include_self else ' WHERE depth > 0'
+        return self.filter(pk__in=RawSQL(f'{sql} SELECT node_id FROM tree{where}', params))
+
+    def descendants(self, *nodes, include_self=False, max_depth=None):
+        """
+        Every node below `nodes` (instances or pks), as a queryset.
+        """
+        return self._nodes_in_tree(node_pks(nodes), 'down', include_self, max_depth)
+
+    def ancestors(self, *nodes, include_self=False, max_depth=None):
+        """
+        Every node above `nodes` (instances or pks), as a queryset.
+        """
+        return self._nodes_in_tree(node_pks(nodes), 'up', include_self, max_depth)
+
+    def subtree_counts(self, *nodes, max_depth=None):
+        """
+        `{pk: number of descendants}` for `nodes`, or for every node when none is given.
+        """
+        roots = node_pks(nodes) if nodes else ALL_NODES
+        sql, params = self.tree_sql(roots, 'down', max_depth)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(f'{sql} SELECT root_id, count(*) - 1 FROM tree GROUP BY root_id', params)
+            counts = dict(cursor.fetchall())
+        if nodes:
+            return {pk: counts.get(pk, 0) for pk in roots}
+        return counts
+
+    def as_nested(self, parent=None, keep_ids=True, max_depth=None):
+        """
+        The tree below `parent` (or the whole forest) in the format of treebeard's
+        `dump_bulk`: `[{'data': {...}, '<pk>': ..., 'children': [...]}]`, loaded
+        with a single query.
+        """
+        meta = self.model._meta
+        pk_name = meta.pk.attname
+        parent_field = meta.get_field(self.options.parent_field)
+        parent_pk = getattr(parent, 'pk', parent)
+
+        if parent_pk is None:
+            queryset = self._nodes_in_tree(None, 'down', True, max_depth)
+        else:
+            queryset = self._nodes_in_tree([parent_pk], 'down', False, max_depth)
+        if self.options.order_field:
+            queryset = queryset.order_by(self.options.order_field, 'pk')
+        fields = [field for field in meta.concrete_fields if field not in (meta.pk, parent_field)]
+
+        nodes = {}
+        rows = []
+        for row in queryset.values(pk_name, parent_field.attname, *[field.attname for field in fields]):
+            node = {'data': {field.name: row[field.attname] for field in fields}}
+            if keep_ids:
+                node[pk_name] = row[pk_name]
+            node['children'] = []
+            nodes[row[pk_name]] = node
+            rows.append((node, row[parent_field.attname]))
+
+        result = []
+        for node, node_parent in rows:
+            if node_parent in nodes:
+                nodes[node_parent]['children'].append(node)
+            else:
+                result.append(node)
+        return result
+
+
+class HierarchyManager(models.Manager.from_queryset(HierarchyQuerySet)):
+    """
+    Declares a self-referencing model as a hierarchy.
+    Usage: hierarchy = HierarchyManager(parent_field='parent', order_field='order')
+    """
+
+    def __init__(self, parent_field='parent', max_depth=MAX_DEPTH, order_field=None):
+        super().__init__()
+        self.parent_field = parent_field
+        self.max_depth = max_depth
+        self.order_field = order_field
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            cls._hierarchy = HierarchyOptions(cls, self.parent_field, self.max_depth, self.order_field)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.model._hierarchy.exclude_removed:
+            queryset = queryset.filter(is_removed=False)
+        return queryset
+
+
+class HierarchyNode:
+    """
+    treebeard `AL_Node` style node API backed by the model's `HierarchyManager`.
+    The manager must be declared as `hierarchy`.
+    """
+
+    def get_children(self):
+        return self.__class__.hierarchy.filter(**{self._hierarchy.parent_field: self})
+
+    @property
+    def has_children(self):
+        return self.get_children().exists()
+
+    def get_descendants(self):
+        return self.__class__.hierarchy.descendants(self)
+
+    def get_descendant_count(self):
+        return self.__class__.hierarchy.subtree_counts(self)[self.pk]
+
+    def get_ancestors(self):
+        """
+        Ancestors as a list from the root down to the parent, like `AL_Node`.
+        """
+        ancestors = {node.pk: node for node in self.__class__.hierarchy.ancestors(self)}
+        attname = self._meta.get_field(self._hierarchy.parent_field).attname
+        result = []
+        parent_pk = getattr(self, attname)
+        while parent_pk in ancestors:
+            node = ancestors.pop(parent_pk)
+            result.insert(0, node)
+            parent_pk = getattr(node, attname)
+        return result
+
+    def get_depth(self):
+        return len(self.get_ancestors()) + 1
+
+    def is_descendant_of(self, node):
+        return self.__class__.hierarchy.descendants(node).filter(pk=self.pk).exists()
+
+    @classmethod
+    def dump_bulk(cls, parent=None, keep_ids=True):
+        return cls.hierarchy.as_nested(parent=parent, keep_ids=keep_ids)
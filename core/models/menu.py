@@ -1,5 +1,6 @@
 from core import settings
 from django.db import models
+from core.models.hierarchy import HierarchyManager, HierarchyNode
 
 class MenuCategory(models.Model):
     id = models.AutoField(primary_key=True)  # Primary Key eksplisit
@@ -24,7 +25,7 @@ class MenuCategory(models.Model):
         return self.name
 
 
-class Menu(models.Model):
+class Menu(HierarchyNode, models.Model):
     id = models.AutoField(primary_key=True)  # Primary Key eksplisit
     title = models.CharField(
         max_length=255,
@@ -69,6 +70,16 @@ class Menu(models.Model):
         help_text="Urutan tampilan menu dalam kategori atau submenu.",
         verbose_name="Urutan"
     )
+    permission = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Permission yang dibutuhkan untuk melihat menu (contoh: 'authentication.view_user'). Kosongkan jika semua user boleh.",
+        verbose_name="Permission"
+    )
+
+    objects = models.Manager()
+    hierarchy = HierarchyManager(order_field='order')
 
     class Meta:
         ordering = ['category__order', 'order']
@@ -269,4 +269,151 @@ class FullOptimizer:
             add_indexes=True,
             add_trigrams=True
         )
-        optimizer.contribute_to_class(cls, name)
\ No newline at end of file
+        optimizer.contribute_to_class(cls, name)
+
+def split_table_name(table_name):
+    """
+    Split a (possibly schema-qualified, possibly quoted) db_table into
+    its quoted form and the schema part, e.g. `"core"."menu"` -> ('"core"."menu"', 'core').
+    """
+    parts = [part.replace('"', '') for part in table_name.split('.')]
+    if len(parts) == 2:
+        return f'"{parts[0]}"."{parts[1]}"', parts[0]
+    return f'"{parts[0]}"', None
+
+
+class SearchVectors:
+    """
+    Adds a stored, weighted tsvector column plus a GIN index so ranked search
+    can match `@@` through the index instead of re-tokenising every row.
+    Usage: search_vectors = SearchVectors(weights={'name': 10, 'description': 5})
+
+    `weights` uses the same format as `get_search_config()['search_fields_weights']`
+    (numeric or 'A'-'D'). With `generated=False` (default) the column is kept up to
+    date by a BEFORE INSERT/UPDATE trigger and existing rows are filled with the
+    `backfillsearchvector` command; `generated=True` uses a STORED generated column,
+    which rewrites the whole table when it is first added.
+    """
+    def __init__(self, weights, column='search_vector', config='simple', generated=False):
+        self.weights = dict(weights)
+        self.column = column
+        self.config = config
+        self.generated = generated
+
+    def contribute_to_class(self, cls, name):
+        self.model = cls
+        setattr(cls, name, self)
+        cls._stored_search_vector = self
+        post_migrate.connect(self._post_migrate_handler, sender=cls._meta.app_config)
+
+    @property
+    def fields(self):
+        return tuple(self.weights.keys())
+
+    def document_sql(self, prefix=''):
+        """
+        SQL expression building the weighted document from the row's columns.
+        `prefix` is `NEW.` inside the trigger function.
+        """
+        from core.utils.search_engine import letter_weight
+
+        parts = []
+        for field_name, weight in self.weights.items():
+            column = self.model._meta.get_field(field_name).column
+            parts.append(
+                f"setweight(to_tsvector('{self.config}'::regconfig, coalesce({prefix}\"{column}\"::text, '')), "
+                f"'{letter_weight(weight)}')"
+            )
+        return ' || '.join(parts)
+
+    def names(self):
+        quoted_table_name, schema = split_table_name(self.model._meta.db_table)
+        safe_table_name = self.model._meta.db_table.replace('"', '').replace('.', '_')
+        function_name = f'tsv_{safe_table_name}_{self.column}'
+        if schema:
+            function_name = f'"{schema}"."{function_name}"'
+        else:
+            function_name = f'"{function_name}"'
+        return {
+            'table': quoted_table_name,
+            'index': f'gin_{safe_table_name}_{self.column}',
+            'trigger': f'tsv_{safe_table_name}_{self.column}',
+            'function': function_name,
+        }
+
+    def create_column(self, cursor):
+        names = self.names()
+        if self.generated:
+            sql = (
+                f'ALTER TABLE {names["table"]} ADD COLUMN IF NOT EXISTS "{self.column}" tsvector '
+                f'GENERATED ALWAYS AS ({self.document_sql()}) STORED'
+            )
+        else:
+            sql = f'ALTER TABLE {names["table"]} ADD COLUMN IF NOT EXISTS "{self.column}" tsvector'
+        logger.info(f"Creating search vector column: {sql}")
+        cursor.execute(sql)
+
+    def create_trigger(self, cursor):
+        names = self.names()
+        columns = ', '.join(f'"{self.model._meta.get_field(name).column}"' for name in self.fields)
+        cursor.execute(
+            f'CREATE OR REPLACE FUNCTION {names["function"]}() RETURNS trigger AS $$ '
+            f'BEGIN NEW."{self.column}" := {self.document_sql(prefix="NEW.")}; RETURN NEW; END '
+            f'$$ LANGUAGE plpgsql'
+        )
+        cursor.execute(f'DROP TRIGGER IF EXISTS "{names["trigger"]}" ON {names["table"]}')
+        sql = (
+            f'CREATE TRIGGER "{names["trigger"]}" BEFORE INSERT OR UPDATE OF {columns} '
+            f'ON {names["table"]} FOR EACH ROW EXECUTE FUNCTION {names["function"]}()'
+        )
+        logger.info(f"Creating search vector trigger: {sql}")
+        cursor.execute(sql)
+
+    def create_index(self, cursor):
+        names = self.names()
+        sql = f'CREATE INDEX IF NOT EXISTS "{names["index"]}" ON {names["table"]} USING gin ("{self.column}")'
+        logger.info(f"Creating search vector index: {sql}")
+        cursor.execute(sql)
+
+    def backfill(self, batch_size=10000, rebuild=False):
+        """
+        Fill the column for existing rows in primary key order, one batch per statement.
+        Yields the number of rows updated per batch.
+        """
+        from django.db import connection
+
+        if self.generated:
+            # Generated columns are computed by PostgreSQL and cannot be written
+            return
+        names = self.names()
+        pk_column = self.model._meta.pk.column
+        pending = '' if rebuild else f' AND "{self.column}" IS NULL'
+        sql = (
+            f'WITH batch AS (SELECT "{pk_column}" FROM {names["table"]} '
+            f'WHERE (%s IS NULL OR "{pk_column}" > %s){pending} ORDER BY "{pk_column}" LIMIT %s) '
+            f'UPDATE {names["table"]} AS target SET "{self.column}" = {self.document_sql(prefix="target.")} '
+            f'FROM batch WHERE target."{pk_column}" = batch."{pk_column}" RETURNING target."{pk_column}"'
+        )
+        last = None
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [last, last, batch_size])
+                keys = [row[0] for row in cursor.fetchall()]
+            if not keys:
+                return
+            last = max(keys)
+            yield len(keys)
+
+    def _post_migrate_handler(self, sender, **kwargs):
+        from django.db import connection
+
+        if connection.vendor != 'postgresql':
+            return
+        try:
+            with connection.cursor() as cursor:
+                self.create_column(cursor)
+                if not self.generated:
+                    self.create_trigger(cursor)
+                self.create_index(cursor)
+        except Exception as e:
+            logger.error(f"Error applying search vector optimizations: {str(e)}")
@@ -0,0 +1,242 @@
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from core.models.optimizations import split_table_name
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMN = 'history_date'
+
+# Batas partisi dari katalog, NULL untuk MINVALUE/MAXVALUE/DEFAULT
+PARTITIONS_SQL = '''
+    SELECT child.relname,
+        (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'FROM \\(''([^'']+)''\\)'))[1]::timestamptz,
+        (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'TO \\(''([^'']+)''\\)'))[1]::timestamptz,
+        pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_namespace ON pg_namespace.oid = parent.relnamespace
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_namespace.nspname = %s AND parent.relname = %s
+'''
+
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+class HistoryPartitions:
+    """
+    Monthly range partitions by `history_date` for a history table.
+
+    The existing table is converted once (on `post_migrate`): it is renamed to
+    `<table>_legacy` and attached as the first partition of a new partitioned
+    table, so no row is copied. Partitions for the coming `premake` months are
+    created ahead, a DEFAULT partition catches anything outside them, and
+    `retention` (months) detaches, or with `drop=True` drops, whole expired
+    partitions instead of deleting rows.
+    """
+
+    def __init__(self, model, premake=3, retention=None, drop=False):
+        self.model = model
+        self.premake = premake
+        self.retention = retention
+        self.drop = drop
+        quoted, schema = split_table_name(model._meta.db_table)
+        self.schema = schema or 'public'
+        self.name = quoted.split('.')[-1].strip('"')
+
+    def table(self, name=None):
+        return f'"{self.schema}"."{name or self.name}"'
+
+    def partition_name(self, month):
+        return f'{self.name}_p{month:%Y%m}'
+
+    def is_partitioned(self, cursor):
+        cursor.execute(
+            '''
+            SELECT pg_class.relkind FROM pg_class
+            JOIN pg_namespace ON pg_namespace.oid = pg_class.relnamespace
+            WHERE pg_namespace.nspname = %s AND pg_class.relname = %s
+            ''',
+            [self.schema, self.name],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return row[0] == 'p'
+
+    def partitions(self, cursor):
+        """
+        `[(name, lower, upper, is_default)]` ordered by lower bound.
+        """
+        cursor.execute(PARTITIONS_SQL, [self.schema, self.name])
+        lowest = datetime.min.replace(tzinfo=dt_timezone.utc)
+        return sorted(cursor.fetchall(), key=lambda row: row[1] or lowest)
+
+    def convert(self, cursor):
+        """
+        Turn the plain history table into a partitioned one, keeping its rows
+        in the `_legacy` partition.
+        """
+        pk = self.model._meta.pk.column
+        legacy = f'{self.name}_legacy'
+        cursor.execute(f'SELECT max({PARTITION_COLUMN}) FROM {self.table()}')
+        latest = cursor.fetchone()[0]
+        bound = add_months(month_start(max(latest or timezone.now(), timezone.now())), 1)
+
+        cursor.execute(f'ALTER TABLE {self.table()} RENAME TO "{legacy}"')
+        # Nama index Django dipakai lagi oleh tabel induk
+        cursor.execute(
+            '''
+            SELECT idx.relname FROM pg_index
+            JOIN pg_class idx ON idx.oid = pg_index.indexrelid
+            JOIN pg_class tbl ON tbl.oid = pg_index.indrelid
+            JOIN pg_namespace ON pg_namespace.oid = tbl.relnamespace
+            WHERE pg_namespace.nspname = %s AND tbl.relname = %s AND NOT pg_index.indisprimary
+            ''',
+            [self.schema, legacy],
+        )
+        for (index,) in cursor.fetchall():
+            cursor.execute(f'ALTER INDEX "{self.schema}"."{index}" RENAME TO "{index[:50]}_legacy"')
+
+        cursor.execute(
+            f'CREATE TABLE {self.table()} (LIKE {self.table(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY '
+            f'INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE ("{PARTITION_COLUMN}")'
+        )
+        cursor.execute(f'ALTER TABLE {self.table()} ADD PRIMARY KEY ("{pk}", "{PARTITION_COLUMN}")')
+        self.move_sequence(cursor, legacy, pk)
+        for statement in connection.schema_editor()._model_indexes_sql(self.model):
+            cursor.execute(str(statement))
+
+        cursor.execute(
+            f'ALTER TABLE {self.table()} ATTACH PARTITION {self.table(legacy)} '
+            f'FOR VALUES FROM (MINVALUE) TO (%s)',
+            [bound],
+        )
+        cursor.execute(f'CREATE TABLE {self.table(self.name + "_default")} PARTITION OF {self.table()} DEFAULT')
+        logger.info(f"Converted {self.table()} to monthly partitions, existing rows kept in {legacy}")
+
+    def move_sequence(self, cursor, legacy, pk):
+        """
+        Hand the history_id sequence over to the partitioned table so ids keep
+        counting from the legacy rows and survive the legacy partition being dropped.
+        """
+        cursor.execute(
+            '''
+            SELECT attidentity FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attname = %s
+            ''',
+            [self.table(legacy), pk],
+        )
+        identity = cursor.fetchone()[0]
+        if identity:
+            cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [self.table(), pk])
+            sequence = cursor.fetchone()[0]
+            cursor.execute(
+                f'SELECT setval(%s, (SELECT coalesce(max("{pk}"), 0) + 1 FROM {self.table(legacy)}), false)',
+                [sequence],
+            )
+            cursor.execute(f'ALTER TABLE {self.table(legacy)} ALTER COLUMN "{pk}" DROP IDENTITY')
+            return
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [self.table(legacy), pk])
+        sequence = cursor.fetchone()[0]
+        if sequence:
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {self.table()}."{pk}"')
+            cursor.execute(f'ALTER TABLE {self.table(legacy)} ALTER COLUMN "{pk}" DROP DEFAULT')
+
+    def create_partitions(self, cursor, now=None, dry_run=False):
+        """
+        Create the partitions of this month and the next `premake` months that
+        no existing partition covers yet. Returns the created partition names.
+        """
+        ranges = [
+            (lower, upper) for _, lower, upper, is_default in self.partitions(cursor)
+            if not is_default
+        ]
+        created = []
+        first = month_start(now or timezone.now())
+        for offset in range(self.premake + 1):
+            start = add_months(first, offset)
+            end = add_months(start, 1)
+            if any((lower is None or lower < end) and (upper is None or upper > start) for lower, upper in ranges):
+                continue
+            name = self.partition_name(start)
+            if not dry_run:
+                try:
+                    with transaction.atomic():
+                        cursor.execute(
+                            f'CREATE TABLE {self.table(name)} PARTITION OF {self.table()} FOR VALUES FROM (%s) TO (%s)',
+                            [start, end],
+                        )
+                except DatabaseError as e:
+                    # Biasanya DEFAULT partition sudah berisi baris untuk bulan ini
+                    logger.error(f"Error creating history partition {name}: {str(e)}")
+                    continue
+            created.append(name)
+        return created
+
+    def expire_partitions(self, cursor, now=None, dry_run=False):
+        """
+        Detach (or drop) partitions that end before the retention window.
+        Returns the names of the expired partitions.
+        """
+        if not self.retention:
+            return []
+        cutoff = add_months(month_start(now or timezone.now()), -self.retention)
+        expired = [
+            name for name, _, upper, is_default in self.partitions(cursor)
+            if not is_default and upper is not None and upper <= cutoff
+        ]
+        if dry_run:
+            return expired
+        for name in expired:
+            cursor.execute(f'ALTER TABLE {self.table()} DETACH PARTITION {self.table(name)}')
+            if self.drop:
+                cursor.execute(f'DROP TABLE {self.table(name)}')
+            logger.info(f"Expired history partition {name} ({'dropped' if self.drop else 'detached'})")
+        return expired
+
+    def maintain(self, now=None, dry_run=False):
+        """
+        Convert the table when needed, create upcoming partitions and expire
+        old ones. Returns `(converted, created, expired)`.
+        """
+        if connection.vendor != 'postgresql':
+            return False, [], []
+        with transaction.atomic(), connection.cursor() as cursor:
+            partitioned = self.is_partitioned(cursor)
+            if partitioned is None:
+                return False, [], []
+            converted = not partitioned
+            if converted and not dry_run:
+                self.convert(cursor)
+            if converted and dry_run:
+                return True, [], []
+            created = self.create_partitions(cursor, now, dry_run)
+            expired = self.expire_partitions(cursor, now, dry_run)
+        return converted, created, expired
+
+    def _post_migrate_handler(self, sender, **kwargs):
+        try:
+            self.maintain()
+        except Exception as e:
+            logger.error(f"Error maintaining history partitions of {self.table()}: {str(e)}")
+
+
+def partitioned_history_models():
+    from django.apps import apps
+
+    return [
+        model for model in apps.get_models()
+        if getattr(model, '_history_partitions', None) is not None
+    ]
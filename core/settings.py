@@ -12,7 +12,9 @@ DEFAULTS = dict(
     FIELD_ENCRYPTION_KEYS=[
         'f164ec6bd6fbc4aef5647abc15199da0f9badcc1d2127bde2087ae0d794a9a0b',
     ],
+    COUNT_ESTIMATE_THRESHOLD=getattr(djangosettings, 'COUNT_ESTIMATE_THRESHOLD', 100000),
 )
 FIELD_ENCRYPTION_KEYS = DEFAULTS["FIELD_ENCRYPTION_KEYS"]
+COUNT_ESTIMATE_THRESHOLD = DEFAULTS["COUNT_ESTIMATE_THRESHOLD"]
 
 SCHEMA = DEFAULTS["SCHEMA"]
\ No newline at end of file
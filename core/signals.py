@@ -1,11 +1,26 @@
 from django.db import connection
-from django.db.models.signals import pre_migrate
+from django.db.models.signals import pre_migrate, post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
 
+from core.utils.response_cache import connect_response_cache_signals
+from core.utils.menu_tree import bump_menu_version
+
 @receiver(pre_migrate)
 def create_schema(sender, **kwargs):
     schemas = getattr(settings, "SCHEMA", ["core", "history"])
     with connection.cursor() as cursor:
         for schema in schemas:
-            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}";')
\ No newline at end of file
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}";')
+
+
+def connect_menu_signals():
+    from core.models import Menu, MenuCategory
+
+    for model in (Menu, MenuCategory):
+        post_save.connect(bump_menu_version, sender=model, dispatch_uid=f'core.menu_tree.post_save.{model.__name__}')
+        post_delete.connect(bump_menu_version, sender=model, dispatch_uid=f'core.menu_tree.post_delete.{model.__name__}')
+
+
+connect_menu_signals()
+connect_response_cache_signals()
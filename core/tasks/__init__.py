@@ -0,0 +1,5 @@
+from core.tasks.history import process_partitions
+
+__all__ = [
+    process_partitions,
+]
@@ -0,0 +1,17 @@
+import logging
+
+from huey import crontab
+
+import library.djangohuey as huey
+from core.models.partition import partitioned_history_models
+
+logger = logging.getLogger(__name__)
+
+
+@huey.db_periodic_task(crontab(minute='0', hour='1'), retry_delay=60 * 5, name='Process History Partitions Task', queue='core', )
+def process_partitions():
+    for model in partitioned_history_models():
+        try:
+            model._history_partitions.maintain()
+        except Exception as e:
+            logger.error(f"Error maintaining history partitions of {model._meta.label}: {str(e)}")
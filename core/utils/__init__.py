@@ -1,16 +1,22 @@
 
 from core.utils.shortuuid import ShortUUID
 from core.utils.search_filter_utils import SearchFilterMixin
-from core.utils.pagination import CustomPageNumberPagination
+from core.utils.search_engine import RankedSearchEngine
+from core.utils.pagination import CustomPageNumberPagination, KeysetPagination, KeysetPaginationMixin
 from core.utils.prefetch_utils import PrefetchRelatedMixin
 from core.utils.base_viewset import SearchFilterViewSet
 from core.utils.redis_cache import RedisCacheMixin
+from core.utils.menu_tree import MenuTree
 
 __all__ = [
     ShortUUID,
     SearchFilterMixin,
+    RankedSearchEngine,
     CustomPageNumberPagination,
+    KeysetPagination,
+    KeysetPaginationMixin,
     PrefetchRelatedMixin,
     SearchFilterViewSet,
-    RedisCacheMixin
+    RedisCacheMixin,
+    MenuTree,
 ]
@@ -3,13 +3,14 @@ from rest_framework.response import Response
 from django.db.models import Q
 
 from core.utils.search_filter_utils import SearchFilterMixin
-from core.utils.pagination import CustomPageNumberPagination
+from core.utils.pagination import CustomPageNumberPagination, KeysetPaginationMixin
 from core.utils.prefetch_utils import PrefetchRelatedMixin
 
-class SearchFilterViewSet(viewsets.ModelViewSet, SearchFilterMixin, PrefetchRelatedMixin):
+class SearchFilterViewSet(KeysetPaginationMixin, viewsets.ModelViewSet, SearchFilterMixin, PrefetchRelatedMixin):
     """
     Base ViewSet that provides search, filter, and prefetch functionalities.
     Other ViewSets can inherit from this to get these features.
+    Send `?pagination=keyset` for keyset (cursor) pagination instead of page numbers.
     """
     pagination_class = CustomPageNumberPagination
     
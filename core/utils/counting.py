@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured
+from django.db import connections
+
+from core import settings
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_TIMEOUT = 300  # 5 menit
+
+CountResult = namedtuple('CountResult', ['value', 'exact'])
+
+
+def queryset_fingerprint(queryset):
+    """
+    Stable key for the rows a queryset selects, ignoring ordering.
+    """
+    query = queryset.query.clone()
+    query.clear_ordering(force=True)
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    raw = f'{queryset.model._meta.label}:{sql}:{params!r}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def estimated_table_count(model, using='default'):
+    """
+    Planner estimate of the number of rows in `model`'s table from `pg_class.reltuples`.
+    Returns None when no estimate is available (not PostgreSQL, or never analyzed).
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def explain_count(queryset):
+    """
+    Planner row estimate for an arbitrary (filtered, grouped) queryset from
+    `EXPLAIN (FORMAT JSON)`. Only plans the query, never executes it.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.query.clone()
+    query.clear_ordering(force=True)
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset):
+    """
+    Cheapest available estimate: `reltuples` for an unfiltered table, otherwise
+    the planner estimate of the query itself.
+    """
+    if not queryset.query.where and not queryset.query.group_by and not queryset.query.distinct:
+        estimate = estimated_table_count(queryset.model, using=queryset.db)
+        if estimate is not None:
+            return estimate
+    return explain_count(queryset)
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    Exact `COUNT(*)` memoised per normalised query.
+
+    Models with a cacheops profile are cached through `cached_as`, so any write
+    that touches the filtered rows invalidates the count. Other models fall back
+    to the default cache with a plain timeout.
+    """
+    from library.cacheops import cached_as
+
+    queryset = queryset.order_by()
+    try:
+        counter = cached_as(queryset, timeout=timeout, lock=True)(lambda: queryset.count())
+    except ImproperlyConfigured:
+        key = queryset_fingerprint(queryset)
+        if key is None:
+            return 0
+        cache_key = f'count:{key}'
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, timeout)
+        return count
+    return counter()
+
+
+class CountStrategy:
+    """
+    Decides how a listing count is obtained. Results at or above
+    `estimate_threshold` rows (by planner estimate) are returned as estimates,
+    smaller ones are counted exactly and memoised by `cached_count`.
+    Usage: count_strategy = CountStrategy(estimate_threshold=50000)
+    """
+
+    def __init__(self, estimate_threshold=None, timeout=COUNT_CACHE_TIMEOUT):
+        if estimate_threshold is None:
+            estimate_threshold = settings.COUNT_ESTIMATE_THRESHOLD
+        self.estimate_threshold = estimate_threshold
+        self.timeout = timeout
+
+    def count(self, queryset):
+        if self.estimate_threshold:
+            try:
+                estimate = estimated_count(queryset)
+            except Exception as e:
+                logger.warning(f"Count estimate failed, falling back to exact count: {e}")
+                estimate = None
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return CountResult(estimate, False)
+        return CountResult(cached_count(queryset, timeout=self.timeout), True)
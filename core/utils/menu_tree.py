@@ -0,0 +1,133 @@
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'menu:tree:version'
+TREE_KEY = 'menu:tree:{version}'
+TREE_TIMEOUT = 60 * 60 * 24  # 1 hari, versi baru membuat key lama tidak terpakai
+
+
+def menu_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_menu_version(*args, **kwargs):
+    """
+    Invalidate the cached menu tree, connected to `post_save`/`post_delete` of
+    `Menu` and `MenuCategory`.
+    """
+    if not cache.add(VERSION_KEY, 1, None):
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+    MenuTree.local.clear()
+
+
+def build_menu_tree():
+    """
+    Build the whole sidebar as plain dicts with two queries, whatever the depth.
+
+    Each category is `{'id', 'name', 'menus'}` and each menu is
+    `{'id', 'title', 'icon', 'url', 'permission', 'submenus'}`. Only root menus
+    (without parent) are listed under their category, like the old template did.
+    """
+    from core.models import Menu, MenuCategory
+
+    nodes = {}
+    children = {}
+    for row in Menu.objects.order_by('order', 'id').values(
+        'id', 'title', 'icon', 'url', 'permission', 'parent_id', 'category_id',
+    ):
+        nodes[row['id']] = dict(
+            id=row['id'],
+            title=row['title'],
+            icon=row['icon'],
+            url=row['url'],
+            permission=row['permission'] or None,
+            submenus=[],
+            category_id=row['category_id'],
+            parent_id=row['parent_id'],
+        )
+    for node in nodes.values():
+        parent = nodes.get(node['parent_id'])
+        if parent is not None:
+            parent['submenus'].append(node)
+        elif node['parent_id'] is None and node['category_id'] is not None:
+            children.setdefault(node['category_id'], []).append(node)
+    for node in nodes.values():
+        del node['category_id'], node['parent_id']
+
+    return [
+        dict(id=category['id'], name=category['name'], menus=children.get(category['id'], []))
+        for category in MenuCategory.objects.order_by('order', 'id').values('id', 'name')
+    ]
+
+
+def filter_menus(menus, permissions, superuser=False):
+    """
+    Drop menus the user is not allowed to see. A menu that had submenus is
+    dropped as well when none of them is left visible.
+    """
+    visible = []
+    for menu in menus:
+        if not superuser and menu['permission'] and menu['permission'] not in permissions:
+            continue
+        if menu['submenus']:
+            submenus = filter_menus(menu['submenus'], permissions, superuser)
+            if not submenus:
+                continue
+            menu = dict(menu, submenus=submenus)
+        visible.append(menu)
+    return visible
+
+
+class MenuTree:
+    """
+    Sidebar menu tree shared by every user.
+
+    The full tree is built once per menu version, stored in the default (Redis)
+    cache and kept in process memory, then filtered per user against
+    `user.effective_permissions`. A page render only reads the version stamp.
+    """
+    local = {}
+
+    def tree(self):
+        version = menu_version()
+        tree = self.local.get(version)
+        if tree is not None:
+            return tree
+        key = TREE_KEY.format(version=version)
+        tree = cache.get(key)
+        if tree is None:
+            tree = build_menu_tree()
+            cache.set(key, tree, TREE_TIMEOUT)
+        self.local.clear()
+        self.local[version] = tree
+        return tree
+
+    def for_user(self, user):
+        tree = self.tree()
+        superuser = False
+        permissions = frozenset()
+        if user is not None and user.is_authenticated:
+            superuser = user.is_superuser
+            if not superuser:
+                permissions = getattr(user, 'effective_permissions', None)
+                if permissions is None:
+                    permissions = frozenset(user.get_all_permissions())
+        categories = []
+        for category in tree:
+            menus = filter_menus(category['menus'], permissions, superuser)
+            if menus:
+                categories.append(dict(category, menus=menus))
+        return categories
+
+
+menu_tree = MenuTree()
@@ -1,5 +1,32 @@
-from rest_framework.pagination import PageNumberPagination
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def sort_field_name(model, name):
+    """
+    Column to order `model` by for the `sort` parameter, or None when `name` is not a
+    concrete field. Methods and properties would make `order_by` raise `FieldError`.
+    Foreign keys sort on their column (`area_id`), not on the related model's ordering.
+    """
+    if not name:
+        return None
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete or field.many_to_many:
+        return None
+    return field.attname
+
 
 class CustomPageNumberPagination(PageNumberPagination):
     """
@@ -21,4 +48,182 @@ class CustomPageNumberPagination(PageNumberPagination):
             'results': data,
             'total_pages': self.page.paginator.num_pages,
             'current_page': self.page.number,
-        })
\ No newline at end of file
+        })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination on `(sort_field, pk)`. Every page is a single indexed
+    range scan, so page N costs the same as page 1.
+
+    Honours the `sort`/`sort_direction` parameters used by
+    `SearchFilterMixin.apply_sorting`. The cursor is the last row's sort value and
+    pk, encoded with `core.models.base.Base64`. The total count is only computed
+    when asked for with `?count=exact` (cached) or `?count=estimate`
+    (`pg_class.reltuples` or the planner estimate).
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    sort_query_param = 'sort'
+    sort_direction_query_param = 'sort_direction'
+
+    def __init__(self):
+        self.count = None
+        self.count_estimated = False
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset, request):
+        model = queryset.model
+        pk_field = model._meta.pk.name
+        sort_field = sort_field_name(model, request.query_params.get(self.sort_query_param)) or pk_field
+        descending = request.query_params.get(self.sort_direction_query_param, 'asc') == 'desc'
+        return sort_field, pk_field, descending
+
+    def encode_cursor(self, value, pk, reverse=False):
+        from core.models.base import Base64
+
+        return Base64.encode(json.dumps([value, pk, reverse], cls=DjangoJSONEncoder))
+
+    def decode_cursor(self, request):
+        from core.models.base import Base64
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk, reverse = json.loads(Base64.decode(encoded))
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(_('Invalid cursor'))
+        return value, pk, bool(reverse)
+
+    def seek_filter(self, sort_field, pk_field, descending, value, pk):
+        """
+        Rows strictly after `(value, pk)` in `ORDER BY sort_field, pk` with PostgreSQL
+        NULL placement (NULLS LAST ascending, NULLS FIRST descending).
+        """
+        after = 'lt' if descending else 'gt'
+        if sort_field == pk_field:
+            return Q(**{f'{pk_field}__{after}': pk})
+        if value is None:
+            rest = Q(**{f'{sort_field}__isnull': True, f'{pk_field}__{after}': pk})
+            return rest | Q(**{f'{sort_field}__isnull': False}) if descending else rest
+        rest = Q(**{f'{sort_field}__{after}': value}) | Q(**{sort_field: value, f'{pk_field}__{after}': pk})
+        return rest if descending else rest | Q(**{f'{sort_field}__isnull': True})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        if queryset.query.is_sliced:
+            # Ranked search results are already bounded, there is nothing to seek on
+            self.results = list(queryset)[:page_size]
+            self.count, self.count_estimated = len(self.results), False
+            return self.results
+
+        sort_field, pk_field, descending = self.get_ordering(queryset, request)
+        self.count, self.count_estimated = self.get_count(queryset, request)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor[2] if cursor else False
+        order_descending = descending != reverse
+        direction = '-' if order_descending else ''
+        ordering = [f'{direction}{sort_field}']
+        if sort_field != pk_field:
+            ordering.append(f'{direction}{pk_field}')
+        ordered = queryset.order_by(*ordering)
+        if cursor:
+            ordered = ordered.filter(self.seek_filter(sort_field, pk_field, order_descending, cursor[0], cursor[1]))
+
+        rows = list(ordered[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        def position(obj):
+            return getattr(obj, sort_field) if sort_field != pk_field else None, getattr(obj, pk_field)
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(*position(rows[-1]))
+            if cursor and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(*position(rows[0]), reverse=True)
+        self.results = rows
+        return rows
+
+    def get_count(self, queryset, request):
+        from core.utils.counting import cached_count, estimated_count
+
+        mode = request.query_params.get(self.count_query_param)
+        if mode == 'estimate':
+            estimate = estimated_count(queryset)
+            if estimate is not None:
+                return estimate, True
+        if mode in ('exact', 'estimate'):
+            return cached_count(queryset), False
+        return None, False
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self.get_link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self.get_link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.count,
+            'count_estimated': self.count_estimated,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+
+class KeysetPaginationMixin:
+    """
+    Lets a request pick keyset pagination with `?pagination=keyset`. The links of a
+    keyset page keep that parameter, and a `cursor` alone selects it too. Other
+    requests use `pagination_class` unchanged.
+    """
+    keyset_pagination_class = KeysetPagination
+    keyset_query_param = 'pagination'
+
+    def use_keyset_pagination(self, request):
+        if request is None or self.keyset_pagination_class is None:
+            return False
+        params = request.query_params
+        return (
+            params.get(self.keyset_query_param) == 'keyset'
+            or self.keyset_pagination_class.cursor_query_param in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_keyset_pagination(getattr(self, 'request', None)):
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
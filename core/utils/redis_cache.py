@@ -1,52 +1,41 @@
 import logging
-from django.core.cache import cache
-import json
+
+from rest_framework.response import Response
+
+from core.utils.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 300  # 5 menit
 
+
 class RedisCacheMixin:
     """
     Mixin untuk caching otomatis pada ViewSet di Django Rest Framework.
+
+    Caches the serialized `list` response through `ResponseCache`, keyed by view,
+    query params and permission scope. Writes anywhere (admin, huey tasks, other
+    viewsets) invalidate it through the model signals, not only this viewset's
+    create/update/destroy.
     """
+    response_cache = ResponseCache(timeout=CACHE_TIMEOUT)
+    cache_models = ()
+
+    def get_cache_scope(self, request):
+        return self.response_cache.permission_scope(request)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        def compute():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data).data
+            serializer = self.get_serializer(queryset, many=True)
+            return list(serializer.data)
+
+        return Response(self.response_cache.get_or_set(self, request, queryset, compute))
 
-    def get_queryset(self):
-        """Gunakan caching pada queryset"""
-        cache_key = f"{self.__class__.__name__}_queryset"
-        cached_data = cache.get(cache_key)
-        print('ASUU')
-        if cached_data:
-            print('ASUUUUUUUUUUU: ', cached_data)
-            return cached_data
-
-        logger.info(f"Cache MISS: {cache_key}, fetching from DB")
-        queryset = super().get_queryset()
-        serialized_queryset = list(queryset.values())  # Konversi queryset ke list agar bisa disimpan di Redis
-        cache.set(cache_key, serialized_queryset, CACHE_TIMEOUT)
-        return queryset
-
-    def clear_cache(self):
-        """Hapus cache khusus queryset ini."""
-        cache_key = f"{self.__class__.__name__}_queryset"
-        cache.delete(cache_key)
-        logger.info(f"Cache cleared: {cache_key}")
-
-    def create(self, request, *args, **kwargs):
-        """Hapus cache setelah create."""
-        response = super().create(request, *args, **kwargs)
-        self.clear_cache()
-        return response
-
-    def update(self, request, *args, **kwargs):
-        """Hapus cache setelah update."""
-        print('JUANCOKKKKK')
-        response = super().update(request, *args, **kwargs)
-        self.clear_cache()
-        return response
-
-    def destroy(self, request, *args, **kwargs):
-        """Hapus cache setelah delete."""
-        response = super().destroy(request, *args, **kwargs)
-        self.clear_cache()
-        return response
+    def stats(self):
+        return self.response_cache.stats(self.__class__.__name__)
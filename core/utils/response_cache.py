@@ -0,0 +1,293 @@
+import hashlib
+import json
+import logging
+import time
+
+from django.core.cache import cache
+from django.core.signals import request_started
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 3600  # 1 jam
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 5  # detik menunggu proses lain yang sedang menghitung
+LOCK_POLL = 0.05
+
+# Parameter yang hanya berfungsi sebagai cache buster dari client (jQuery/DevExtreme)
+IGNORED_PARAMS = ('_',)
+
+
+def model_version_key(model):
+    return f'response:version:{model._meta.label_lower}'
+
+
+def bump_model_version(model):
+    """
+    Invalidate every cached response built from `model` (fallback path without cacheops profiles).
+    """
+    key = model_version_key(model)
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def serializer_models(serializer, collected=None):
+    """
+    Collect every model a serializer reads: its own model, nested serializers
+    and related fields.
+    """
+    collected = set() if collected is None else collected
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    meta = getattr(serializer, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is not None:
+        if model in collected:
+            return collected
+        collected.add(model)
+    for field in serializer.fields.values():
+        if isinstance(field, serializers.ManyRelatedField):
+            field = field.child_relation
+        if isinstance(field, serializers.BaseSerializer):
+            serializer_models(field, collected)
+        elif isinstance(field, serializers.RelatedField) and getattr(field, 'queryset', None) is not None:
+            collected.add(field.queryset.model)
+        if model is not None and field.source and '.' in field.source:
+            # Dotted sources such as `parent.group_name` read through foreign keys
+            current = model
+            for name in field.source.split('.')[:-1]:
+                try:
+                    related = current._meta.get_field(name)
+                except Exception:
+                    break
+                if not related.is_relation or related.related_model is None:
+                    break
+                current = related.related_model
+                collected.add(current)
+    return collected
+
+
+class ResponseCache:
+    """
+    Caches serialized list responses per view, normalised query params and
+    permission scope.
+
+    Invalidation rides on cacheops: the cached value is registered with
+    `cached_as` against every model the serializer touches, so any write
+    through the ORM (admin, huey tasks, other viewsets) drops it. Models
+    without a cacheops profile fall back to per-model version stamps bumped
+    by `post_save`/`post_delete`/`m2m_changed`. Those receivers are only
+    connected for the models of cached views, on the first request of the
+    process (see `watch_routed_views`), so other models do not pay a cache
+    round trip per write. Processes that serve no requests (huey workers,
+    management commands) and `QuerySet.update()`/`bulk_create()` send no
+    version bumps: after writing to a model without a cacheops profile there,
+    call `bump_model_version(model)`. Concurrent misses for the same key are
+    serialised by a lock so only one request recomputes.
+    """
+
+    def __init__(self, timeout=CACHE_TIMEOUT, prefix='response'):
+        self.timeout = timeout
+        self.prefix = prefix
+
+    def normalise_params(self, request):
+        params = []
+        for key in sorted(request.query_params.keys()):
+            if key in IGNORED_PARAMS:
+                continue
+            params.append((key, request.query_params.getlist(key)))
+        return params
+
+    def permission_scope(self, request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return 'anonymous'
+        if user.is_superuser:
+            return 'superuser'
+        permissions = sorted(user.get_all_permissions())
+        return 'perm:' + hashlib.md5(json.dumps(permissions).encode()).hexdigest()
+
+    def key(self, view, request):
+        raw = json.dumps([
+            f'{view.__class__.__module__}.{view.__class__.__name__}',
+            getattr(view, 'action', None),
+            view.kwargs,
+            self.normalise_params(request),
+            view.get_cache_scope(request) if hasattr(view, 'get_cache_scope') else self.permission_scope(request),
+        ], sort_keys=True, default=str)
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def models(self, view, queryset):
+        collected = serializer_models(view.get_serializer())
+        collected.add(queryset.model)
+        collected.update(getattr(view, 'cache_models', ()))
+        # Views not reachable from the URLconf are only seen here
+        watch_models(collected)
+        return sorted(collected, key=lambda model: model._meta.label_lower)
+
+    def get_or_set(self, view, request, queryset, compute):
+        """
+        Returns `compute()` from cache, recomputing it on a miss.
+        """
+        key = self.key(view, request)
+        label = view.__class__.__name__
+        model_list = self.models(view, queryset)
+        state = {'miss': False}
+
+        def computed():
+            state['miss'] = True
+            return compute()
+
+        try:
+            data = self._cacheops(key, queryset, model_list, computed)
+        except ImproperlyConfigured:
+            data = self._versioned(key, model_list, computed)
+        self.record(label, hit=not state['miss'])
+        return data
+
+    def _cacheops(self, key, queryset, model_list, compute):
+        from library.cacheops import cached_as
+
+        samples = [queryset.order_by()] + [model for model in model_list if model is not queryset.model]
+        return cached_as(*samples, timeout=self.timeout, lock=True, keep_fresh=True, extra=key)(compute)()
+
+    def _versioned(self, key, model_list, compute):
+        version_keys = [model_version_key(model) for model in model_list]
+        versions = cache.get_many(version_keys)
+        stamp = ':'.join(str(versions.get(version_key, 0)) for version_key in version_keys)
+        cache_key = f'{self.prefix}:{key}:{hashlib.md5(stamp.encode()).hexdigest()}'
+
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
+
+        lock_key = f'{cache_key}:lock'
+        if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            # Another request is rebuilding this response, wait for its result
+            deadline = time.monotonic() + LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                data = cache.get(cache_key)
+                if data is not None:
+                    return data
+        try:
+            data = compute()
+            cache.set(cache_key, data, self.timeout)
+        finally:
+            cache.delete(lock_key)
+        return data
+
+    def record(self, label, hit):
+        key = f'{self.prefix}:stats:{label}:{"hit" if hit else "miss"}'
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+    def stats(self, label):
+        hits = cache.get(f'{self.prefix}:stats:{label}:hit', 0)
+        misses = cache.get(f'{self.prefix}:stats:{label}:miss', 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_model_responses(sender, **kwargs):
+    if isinstance(sender, type) and issubclass(sender, models.Model):
+        bump_model_version(sender)
+
+
+def invalidate_m2m_responses(sender, instance, model, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+    bump_model_version(sender)
+    bump_model_version(instance.__class__)
+    bump_model_version(model)
+
+
+_watched = set()
+
+
+def watch_models(model_list):
+    """
+    Connect the version bumps for `model_list` and for the many-to-many tables
+    they use.
+    """
+    for model in model_list:
+        if model in _watched:
+            continue
+        _watched.add(model)
+        label = model._meta.label_lower
+        post_save.connect(invalidate_model_responses, sender=model, dispatch_uid=f'core.response_cache.post_save.{label}')
+        post_delete.connect(invalidate_model_responses, sender=model, dispatch_uid=f'core.response_cache.post_delete.{label}')
+        for field in model._meta.get_fields(include_hidden=True):
+            if not field.many_to_many:
+                continue
+            # m2m_changed is sent by the through model, from both sides of the relation
+            through = field.remote_field.through if field.concrete else field.through
+            if isinstance(through, type):
+                m2m_changed.connect(
+                    invalidate_m2m_responses,
+                    sender=through,
+                    dispatch_uid=f'core.response_cache.m2m_changed.{through._meta.label_lower}',
+                )
+
+
+def view_models(view_class):
+    """
+    Models read by the cached responses of `view_class`, worked out without a request.
+    """
+    collected = set()
+    serializer_class = getattr(view_class, 'serializer_class', None)
+    if serializer_class is not None:
+        try:
+            serializer_models(serializer_class(), collected)
+        except Exception as e:
+            logger.warning("Cannot collect the models of %s: %s", view_class.__name__, e)
+    queryset = getattr(view_class, 'queryset', None)
+    if queryset is not None:
+        collected.add(queryset.model)
+    collected.update(getattr(view_class, 'cache_models', ()))
+    return collected
+
+
+def collect_views(patterns, collected):
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            collect_views(pattern.url_patterns, collected)
+            continue
+        view_class = getattr(pattern.callback, 'cls', None)
+        if view_class is not None:
+            collected.add(view_class)
+    return collected
+
+
+def watch_routed_views(sender=None, **kwargs):
+    """
+    Watch the models of every cached view in the URLconf. Receives the first
+    `request_started` of the process (see `connect_response_cache_signals`),
+    so startup and management commands do not import the views.
+    """
+    from django.urls import get_resolver
+
+    for view_class in collect_views(get_resolver().url_patterns, set()):
+        if getattr(view_class, 'response_cache', None) is not None:
+            watch_models(view_models(view_class))
+    request_started.disconnect(dispatch_uid='core.response_cache.watch_routed_views')
+
+
+def connect_response_cache_signals():
+    request_started.connect(watch_routed_views, dispatch_uid='core.response_cache.watch_routed_views')
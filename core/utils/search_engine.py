@@ -0,0 +1,211 @@
+import logging
+import operator
+import re
+from functools import lru_cache, reduce
+
+from django.db import connection, models
+from django.db.models import Case, Expression, F, FloatField, IntegerField, Q, Value, When
+
+logger = logging.getLogger(__name__)
+
+# Nama field yang biasanya berisi kode sistem (nomor dokumen, referensi, dll.)
+CODE_INDICATORS = ('code', 'number', 'id', 'no', 'reference', 'ref')
+
+SYSTEM_CODE_PATTERNS = (
+    re.compile(r'^[A-Za-z]{2,3}\d+$'),
+    re.compile(r'^\d{5,10}$'),
+)
+
+LETTER_WEIGHTS = {'A': 1.0, 'B': 0.8, 'C': 0.6, 'D': 0.4}
+
+
+def is_system_code(query):
+    """
+    Returns True when the query looks like a system code, e.g. `PO12345` or `0012345`.
+    """
+    query = query.strip()
+    return any(pattern.match(query) for pattern in SYSTEM_CODE_PATTERNS)
+
+
+def letter_weight(weight):
+    """
+    Map a numeric weight from `search_fields_weights` to a PostgreSQL tsvector weight letter.
+    """
+    if isinstance(weight, str):
+        return weight if weight in LETTER_WEIGHTS else 'D'
+    if weight >= 1.0:
+        return 'A'
+    if weight >= 0.8:
+        return 'B'
+    if weight >= 0.6:
+        return 'C'
+    return 'D'
+
+
+def numeric_weight(weight):
+    """
+    Map a letter weight from `search_fields_weights` to a numeric trigram multiplier.
+    """
+    if isinstance(weight, str):
+        return LETTER_WEIGHTS.get(weight, LETTER_WEIGHTS['D'])
+    return float(weight)
+
+
+class FieldClassification:
+    """
+    Searchable field layout of a model, computed once per model class.
+    """
+
+    def __init__(self, text_fields, code_fields, long_text_fields):
+        self.text_fields = tuple(text_fields)
+        self.code_fields = tuple(code_fields)
+        self.long_text_fields = tuple(long_text_fields)
+
+
+@lru_cache(maxsize=None)
+def classify_fields(model):
+    """
+    Classify the concrete text columns of `model`. Cached per model class so the
+    `_meta.get_fields()` scan never runs on the request path.
+    """
+    text_fields = []
+    code_fields = []
+    long_text_fields = []
+    for field in model._meta.concrete_fields:
+        if not isinstance(field, (models.CharField, models.TextField)):
+            continue
+        # Encrypted fields are stored as binary and refuse text lookups
+        if field.get_internal_type() == 'BinaryField':
+            continue
+        text_fields.append(field.name)
+        if any(indicator in field.name.lower() for indicator in CODE_INDICATORS):
+            code_fields.append(field.name)
+        if not field.max_length or field.max_length > 50:
+            long_text_fields.append(field.name)
+    if not code_fields:
+        code_fields = [
+            name for name in text_fields
+            if model._meta.get_field(name).max_length and model._meta.get_field(name).max_length < 100
+        ]
+    return FieldClassification(text_fields, code_fields, long_text_fields)
+
+
+class StoredSearchVector(Expression):
+    """
+    References the tsvector column maintained by `core.models.SearchVectors` on the
+    base table. The column is not a model field, so it is compiled by hand.
+    """
+
+    def __init__(self, column):
+        from django.contrib.postgres.search import SearchVectorField
+
+        super().__init__(output_field=SearchVectorField())
+        self.column = column
+
+    def as_sql(self, compiler, connection):
+        alias = compiler.query.get_initial_alias()
+        return f'{compiler.quote_name_unless_alias(alias)}.{connection.ops.quote_name(self.column)}', []
+
+
+class RankedSearchEngine:
+    """
+    Compiles the exact / prefix / ILIKE / full-text / trigram tiers into a single
+    ranked SELECT, so a search costs one round trip regardless of how many tiers match.
+
+    Every row gets a `search_tier` (highest matching tier) and a `search_score`
+    (full-text rank plus weighted trigram similarity) and the top-N rows are
+    returned ordered by tier, score and primary key.
+    """
+    TIER_EXACT = 4
+    TIER_PREFIX = 3
+    TIER_CONTAINS = 2
+    TIER_FULLTEXT = 1
+    TIER_NONE = 0
+
+    def __init__(self, model, columns, config):
+        self.model = model
+        self.config = config
+        self.classification = classify_fields(model)
+        self.columns = [column for column in columns if column in self.classification.text_fields]
+        self.weights = config.get('search_fields_weights', {})
+        self.max_results = config.get('max_results', 50)
+        self.use_trigram = config.get('use_trigram', False)
+        self.trigram_threshold = config.get('trigram_threshold', 0.3)
+        self.use_postgres = connection.vendor == 'postgresql'
+        self.stored_vector = getattr(model, '_stored_search_vector', None)
+        if self.stored_vector is not None and not set(self.columns) <= set(self.stored_vector.fields):
+            # The stored document does not cover the requested columns
+            self.stored_vector = None
+
+    def _any(self, lookup, value, fields):
+        return reduce(operator.or_, [Q(**{f'{field}__{lookup}': value}) for field in fields])
+
+    def get_search_vector(self):
+        """
+        Returns the weighted tsvector expression used for the full-text tier.
+        Models declaring `SearchVectors` are matched against the stored column.
+        """
+        from django.contrib.postgres.search import SearchVector
+
+        if self.stored_vector is not None:
+            return StoredSearchVector(self.stored_vector.column)
+
+        vectors = [SearchVector(field, weight=letter_weight(self.weights.get(field, 'D'))) for field in self.columns]
+        return reduce(operator.add, vectors)
+
+    def get_search_query(self, search_query):
+        from django.contrib.postgres.search import SearchQuery
+
+        config = self.stored_vector.config if self.stored_vector is not None else None
+        terms = search_query.split()
+        return reduce(operator.or_, [SearchQuery(term, config=config) for term in terms])
+
+    def get_trigram_similarity(self, search_query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return reduce(operator.add, [
+            TrigramSimilarity(field, search_query) * numeric_weight(self.weights.get(field, 1.0))
+            for field in self.columns
+        ])
+
+    def search(self, queryset, search_query):
+        if not self.columns:
+            return queryset.none()
+
+        exact_fields = list(self.columns)
+        if is_system_code(search_query):
+            exact_fields += [field for field in self.classification.code_fields if field not in exact_fields]
+
+        exact_q = self._any('iexact', search_query, exact_fields)
+        prefix_q = self._any('istartswith', search_query, self.columns)
+        contains_q = self._any('icontains', search_query, self.columns)
+        match_q = exact_q | contains_q
+
+        tiers = [
+            When(exact_q, then=Value(self.TIER_EXACT)),
+            When(prefix_q, then=Value(self.TIER_PREFIX)),
+            When(contains_q, then=Value(self.TIER_CONTAINS)),
+        ]
+        score = Value(0.0, output_field=FloatField())
+
+        if self.use_postgres:
+            from django.contrib.postgres.search import SearchRank
+
+            tsquery = self.get_search_query(search_query)
+            queryset = queryset.annotate(search_document=self.get_search_vector())
+            fulltext_q = Q(search_document=tsquery)
+            tiers.append(When(fulltext_q, then=Value(self.TIER_FULLTEXT)))
+            match_q |= fulltext_q
+            score = SearchRank(F('search_document'), tsquery) * Value(2.0)
+            if self.use_trigram:
+                queryset = queryset.annotate(search_similarity=self.get_trigram_similarity(search_query))
+                match_q |= Q(search_similarity__gt=self.trigram_threshold)
+                score = score + F('search_similarity')
+
+        queryset = queryset.annotate(
+            search_tier=Case(*tiers, default=Value(self.TIER_NONE), output_field=IntegerField()),
+            search_score=score,
+        ).filter(match_q)
+
+        pk_field = self.model._meta.pk.name
+        return queryset.order_by('-search_tier', '-search_score', pk_field)[:self.max_results]
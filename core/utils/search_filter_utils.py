@@ -8,6 +8,9 @@ from rest_framework import status
 from functools import reduce
 import operator
 
+from core.utils.pagination import sort_field_name
+from core.utils.search_engine import RankedSearchEngine, StoredSearchVector
+
 logger = logging.getLogger(__name__)
 
 class SearchFilterMixin:
@@ -35,6 +38,7 @@ class SearchFilterMixin:
             'use_trigram': False,  # Use PostgreSQL trigram indexes if available
             'min_length': 3,  # Minimum search query length to process
             'search_fields_weights': {},  # Field-specific weights, e.g. {'name': 10, 'description': 5}
+            'engine': 'legacy',  # 'ranked' compiles every match tier into one ranked query
         }
     
     def _explain_query(self, queryset, query_description=''):
@@ -97,6 +101,10 @@ class SearchFilterMixin:
         # Start with an optimized base query - add filters to base queryset
         base_query = queryset.filter(is_removed=False)
 
+        # Ranked engine: single round trip, field classification cached per model
+        if config.get('engine') == 'ranked':
+            return RankedSearchEngine(model, valid_columns, config).search(base_query, search_query)
+
         def is_system_code(query):
             # Pola: 2-3 huruf diikuti angka, atau hanya angka dengan panjang tertentu
             import re
@@ -214,6 +222,13 @@ class SearchFilterMixin:
                             weight = 'D'  # Lowest
                     
                     search_vectors.append(SearchVector(field, weight=weight))
+
+                # Use the stored, GIN-indexed document when the model declares one
+                stored_vector = getattr(model, '_stored_search_vector', None)
+                search_config = None
+                if stored_vector is not None and set(text_fields) <= set(stored_vector.fields):
+                    search_vectors = [StoredSearchVector(stored_vector.column)]
+                    search_config = stored_vector.config
                 
                 if search_vectors:
                     combined_vector = search_vectors[0]
@@ -226,12 +241,12 @@ class SearchFilterMixin:
                     
                     if len(search_terms) == 1:
                         # Single word query - use simple match
-                        tsquery = SearchQuery(search_query)
+                        tsquery = SearchQuery(search_query, config=search_config)
                     else:
                         # Multi-word query - combine with OR for fuzzy matching
-                        tsquery = SearchQuery(search_terms[0])
+                        tsquery = SearchQuery(search_terms[0], config=search_config)
                         for term in search_terms[1:]:
-                            tsquery = tsquery | SearchQuery(term)
+                            tsquery = tsquery | SearchQuery(term, config=search_config)
                     
                     # Apply full-text search with rank
                     ft_results = base_query.annotate(
@@ -451,10 +466,10 @@ class SearchFilterMixin:
             # If queryset is already evaluated/sliced, return it as is
             return queryset
             
-        sort_field = request.query_params.get('sort', None)
         model = queryset.model
+        sort_field = sort_field_name(model, request.query_params.get('sort', None))
         
-        if sort_field and hasattr(model, sort_field):
+        if sort_field:
             sort_direction = request.query_params.get('sort_direction', 'asc')
             direction = '-' if sort_direction == 'desc' else ''
             return queryset.order_by(f'{direction}{sort_field}')
@@ -19,6 +19,9 @@ from .utils import _consistent_hash, _wrap_close, create_pool, decode_hosts
 
 logger = logging.getLogger(__name__)
 
+# Marks a sorted set member that refers to a payload stored by group_send
+PAYLOAD_REFERENCE = b"\xc1"
+
 
 class ChannelLock:
     """
@@ -74,6 +77,7 @@ class RedisLoopLayer:
         self._lock = asyncio.Lock()
         self.channel_layer = channel_layer
         self._connections = {}
+        self._scripts = {}
 
     def get_connection(self, index):
         if index not in self._connections:
@@ -82,8 +86,20 @@ class RedisLoopLayer:
 
         return self._connections[index]
 
+    def get_script(self, index, source):
+        """
+        Lua script registered on the connection, called with EVALSHA and
+        only loaded again after a NOSCRIPT error.
+        """
+        key = (index, source)
+        if key not in self._scripts:
+            self._scripts[key] = self.get_connection(index).register_script(source)
+
+        return self._scripts[key]
+
     async def flush(self):
         async with self._lock:
+            self._scripts.clear()
             for index in list(self._connections):
                 connection = self._connections.pop(index)
                 await connection.close(close_connection_pool=True)
@@ -100,6 +116,75 @@ class RedisChannelLayer(BaseChannelLayer):
 
     brpop_timeout = 5
 
+    # Atomically moves the messages of the backup queue back in front of the
+    # main queue, pops up to ARGV[1] messages and backs them up. Returns
+    # member, payload pairs; the payload of a group_send reference is fetched
+    # here so it doesn't cost another round trip. BZPOPMIN must *not* be
+    # called because that would deadlock the server.
+    receive_lua = """
+        local function resolve(member)
+            if string.byte(member, 13) ~= 193 then
+                return false
+            end
+            local length = string.byte(member, 14) * 256 + string.byte(member, 15)
+            return redis.call('GET', string.sub(member, 16, 15 + length))
+        end
+        local backed_up = redis.call('ZRANGE', KEYS[2], 0, -1, 'WITHSCORES')
+        for i = #backed_up, 1, -2 do
+            redis.call('ZADD', KEYS[1], backed_up[i], backed_up[i - 1])
+        end
+        redis.call('DEL', KEYS[2])
+        local popped = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+        local result = {}
+        for i = 1, #popped, 2 do
+            redis.call('ZADD', KEYS[2], popped[i + 1], popped[i])
+            result[#result + 1] = popped[i]
+            result[#result + 1] = resolve(popped[i])
+        end
+        return result
+    """
+
+    # Backs up a message popped by BZPOPMIN and resolves its payload.
+    backup_lua = """
+        redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+        if string.byte(ARGV[1], 13) ~= 193 then
+            return false
+        end
+        local length = string.byte(ARGV[1], 14) * 256 + string.byte(ARGV[1], 15)
+        return redis.call('GET', string.sub(ARGV[1], 16, 15 + length))
+    """
+
+    # Adds one member per channel key unless the channel is full, after
+    # discarding expired messages. When there is one more key than members
+    # it receives the payload the members refer to.
+    send_lua = """
+        local current_time = ARGV[1]
+        local expiry = ARGV[2]
+        local expired = ARGV[3]
+        local n = (#ARGV - 4) / 2
+        if #KEYS > n then
+            redis.call('SET', KEYS[n + 1], ARGV[4], 'EX', expiry)
+        end
+        local over_capacity = 0
+        for i = 1, n do
+            redis.call('ZREMRANGEBYSCORE', KEYS[i], 0, expired)
+            if redis.call('ZCOUNT', KEYS[i], '-inf', '+inf') < tonumber(ARGV[4 + n + i]) then
+                redis.call('ZADD', KEYS[i], current_time, ARGV[4 + i])
+                redis.call('EXPIRE', KEYS[i], expiry)
+            else
+                over_capacity = over_capacity + 1
+            end
+        end
+        return over_capacity
+    """
+
+    delete_prefix_lua = """
+        local keys = redis.call('keys', ARGV[1])
+        for i=1,#keys,5000 do
+            redis.call('del', unpack(keys, i, math.min(i+4999, #keys)))
+        end
+    """
+
     def __init__(
         self,
         hosts=None,
@@ -109,11 +194,14 @@ class RedisChannelLayer(BaseChannelLayer):
         capacity=100,
         channel_capacity=None,
         symmetric_encryption_keys=None,
+        receive_batch_size=10,
     ):
         # Store basic information
         self.expiry = expiry
         self.group_expiry = group_expiry
         self.capacity = capacity
+        # Messages of process-local channels drained per round trip
+        self.receive_batch_size = receive_batch_size
         self.channel_capacity = self.compile_capacities(channel_capacity or {})
         self.prefix = prefix
         assert isinstance(self.prefix, str), "Prefix must be unicode"
@@ -193,22 +281,30 @@ class RedisChannelLayer(BaseChannelLayer):
             index = self.consistent_hash(channel)
         else:
             index = next(self._send_index_generator)
-        connection = self.connection(index)
-        # Discard old messages based on expiry
-        await connection.zremrangebyscore(
-            channel_key, min=0, max=int(time.time()) - int(self.expiry)
+        # Discard old messages based on expiry, check the capacity, push onto
+        # the list then set it to expire in case it's not consumed
+        send = self.script(index, self.send_lua)
+        over_capacity = await send(
+            keys=[channel_key],
+            args=[
+                *self._send_args(time.time(), b""),
+                self.serialize(message),
+                self.get_capacity(channel),
+            ],
         )
-
-        # Check the length of the list before send
-        # This can allow the list to leak slightly over capacity, but that's fine.
-        if await connection.zcount(channel_key, "-inf", "+inf") >= self.get_capacity(
-            channel
-        ):
+        if over_capacity:
             raise ChannelFull()
 
-        # Push onto the list then set it to expire in case it's not consumed
-        await connection.zadd(channel_key, {self.serialize(message): time.time()})
-        await connection.expire(channel_key, int(self.expiry))
+    def _send_args(self, current_time, payload):
+        """
+        Leading arguments of the send script.
+        """
+        return [
+            current_time,
+            int(self.expiry),
+            int(current_time) - int(self.expiry),
+            payload,
+        ]
 
     def _backup_channel_name(self, channel):
         """
@@ -216,44 +312,40 @@ class RedisChannelLayer(BaseChannelLayer):
         """
         return channel + "$inflight"
 
-    async def _brpop_with_clean(self, index, channel, timeout):
-        """
-        Perform a Redis BRPOP and manage the backup processing queue.
-        In case of cancellation, make sure the message is not lost.
+    async def _brpop_with_clean(self, index, channel, timeout, count=1):
         """
-        # The script will pop messages from the processing queue and push them in front
-        # of the main message queue in the proper order; BRPOP must *not* be called
-        # because that would deadlock the server
-        cleanup_script = """
-            local backed_up = redis.call('ZRANGE', ARGV[2], 0, -1, 'WITHSCORES')
-            for i = #backed_up, 1, -2 do
-                redis.call('ZADD', ARGV[1], backed_up[i], backed_up[i - 1])
-            end
-            redis.call('DEL', ARGV[2])
+        Pop up to ``count`` waiting messages, or block for the next one, and
+        manage the backup processing queue. In case of cancellation, make
+        sure the messages are not lost.
+
+        Returns a list of ``(member, payload)``, empty on timeout.
         """
         backup_queue = self._backup_channel_name(channel)
+        # Cancellation here doesn't matter, the script executes atomically
+        # and whatever it popped is safe in the backup.
+        receive = self.script(index, self.receive_lua)
+        result = await receive(keys=[channel, backup_queue], args=[count])
+        if result:
+            return list(zip(result[::2], result[1::2]))
+
+        # Nothing waiting, block for the next message.
         connection = self.connection(index)
-        # Cancellation here doesn't matter, we're not doing anything destructive
-        # and the script executes atomically...
-        await connection.eval(cleanup_script, 0, channel, backup_queue)
-        # ...and it doesn't matter here either, the message will be safe in the backup.
         result = await connection.bzpopmin(channel, timeout=timeout)
+        if result is None:
+            return []
 
-        if result is not None:
-            _, member, timestamp = result
-            await connection.zadd(backup_queue, {member: float(timestamp)})
-        else:
-            member = None
-
-        return member
+        _, member, timestamp = result
+        backup = self.script(index, self.backup_lua)
+        payload = await backup(keys=[backup_queue], args=[member, float(timestamp)])
+        return [(member, payload)]
 
-    async def _clean_receive_backup(self, index, channel):
+    async def _clean_receive_backup(self, index, channel, count=1):
         """
-        Pop the oldest message off the channel backup queue.
-        The result isn't interesting as it was already processed.
+        Pop the oldest messages off the channel backup queue.
+        The result isn't interesting as they were already processed.
         """
         connection = self.connection(index)
-        await connection.zpopmin(self._backup_channel_name(channel))
+        await connection.zpopmin(self._backup_channel_name(channel), count)
 
     async def receive(self, channel):
         """
@@ -341,17 +433,18 @@ class RedisChannelLayer(BaseChannelLayer):
 
                         # We hold the receive lock, receive and then release it.
                         try:
-                            # There is no interruption point from when the message is
-                            # unpacked in receive_single to when we get back here, so
+                            # There is no interruption point from when the messages are
+                            # unpacked in receive_many to when we get back here, so
                             # the following lines are essentially atomic.
-                            message_channel, message = await self.receive_single(
-                                real_channel
+                            messages = await self.receive_many(
+                                real_channel, self.receive_batch_size
                             )
-                            if isinstance(message_channel, list):
-                                for chan in message_channel:
-                                    self.receive_buffer[chan].put_nowait(message)
-                            else:
-                                self.receive_buffer[message_channel].put_nowait(message)
+                            for message_channel, message in messages:
+                                if isinstance(message_channel, list):
+                                    for chan in message_channel:
+                                        self.receive_buffer[chan].put_nowait(message)
+                                else:
+                                    self.receive_buffer[message_channel].put_nowait(message)
                             message = None
                         except Exception:
                             del self.receive_buffer[channel]
@@ -383,6 +476,17 @@ class RedisChannelLayer(BaseChannelLayer):
         """
         Receives a single message off of the channel and returns it.
         """
+        messages = []
+        while not messages:
+            messages = await self.receive_many(channel, 1)
+        return messages[0]
+
+    async def receive_many(self, channel, max_n):
+        """
+        Receives up to ``max_n`` messages that are already waiting on the
+        channel in one round trip, or blocks until the next one arrives.
+        Returns a list of ``(channel, message)``.
+        """
         # Check channel name
         assert self.valid_channel_name(channel, receive=True), "Channel name invalid"
         # Work out the connection to use
@@ -393,25 +497,25 @@ class RedisChannelLayer(BaseChannelLayer):
             index = next(self._receive_index_generator)
 
         channel_key = self.prefix + channel
-        content = None
+        contents = []
         await self.receive_clean_locks.acquire(channel_key)
         try:
-            while content is None:
+            while not contents:
                 # Nothing is lost here by cancellations, messages will still
                 # be in the backup queue.
-                content = await self._brpop_with_clean(
-                    index, channel_key, timeout=self.brpop_timeout
+                contents = await self._brpop_with_clean(
+                    index, channel_key, timeout=self.brpop_timeout, count=max_n
                 )
 
-            # Fire off a task to clean the message from its backup queue.
+            # Fire off a task to clean the messages from their backup queue.
             # Per-channel locking isn't needed, because the backup is a queue
             # and additionally, we don't care about the order; all processed
-            # messages need to be removed, no matter if the current one is
-            # removed after the next one.
+            # messages need to be removed, no matter if the current ones are
+            # removed after the next ones.
             # NOTE: Duplicate messages will be received eventually if any
             # of these cleaners are cancelled.
             cleaner = asyncio.ensure_future(
-                self._clean_receive_backup(index, channel_key)
+                self._clean_receive_backup(index, channel_key, len(contents))
             )
             self.receive_cleaners.append(cleaner)
 
@@ -425,14 +529,20 @@ class RedisChannelLayer(BaseChannelLayer):
             self.receive_clean_locks.release(channel_key)
             raise
 
-        # Message decode
-        message = self.deserialize(content)
-        # TODO: message expiry?
-        # If there is a full channel name stored in the message, unpack it.
-        if "__asgi_channel__" in message:
-            channel = message["__asgi_channel__"]
-            del message["__asgi_channel__"]
-        return channel, message
+        messages = []
+        for member, payload in contents:
+            # Message decode
+            message = self.deserialize_member(member, payload)
+            if message is None:
+                continue
+            # TODO: message expiry?
+            # If there is a full channel name stored in the message, unpack it.
+            message_channel = channel
+            if "__asgi_channel__" in message:
+                message_channel = message["__asgi_channel__"]
+                del message["__asgi_channel__"]
+            messages.append((message_channel, message))
+        return messages
 
     async def new_channel(self, prefix="specific"):
         """
@@ -451,17 +561,10 @@ class RedisChannelLayer(BaseChannelLayer):
         # keys from under their feet.
         await self.wait_received()
 
-        # Lua deletion script
-        delete_prefix = """
-            local keys = redis.call('keys', ARGV[1])
-            for i=1,#keys,5000 do
-                redis.call('del', unpack(keys, i, math.min(i+4999, #keys)))
-            end
-        """
         # Go through each connection and remove all with prefix
         for i in range(self.ring_size):
-            connection = self.connection(i)
-            await connection.eval(delete_prefix, 0, self.prefix + "*")
+            delete_prefix = self.script(i, self.delete_prefix_lua)
+            await delete_prefix(args=[self.prefix + "*"])
         # Now clear the pools as well
         await self.close_pools()
 
@@ -520,66 +623,57 @@ class RedisChannelLayer(BaseChannelLayer):
         key = self._group_key(group)
         connection = self.connection(self.consistent_hash(group))
         # Discard old channels based on group_expiry
-        await connection.zremrangebyscore(
-            key, min=0, max=int(time.time()) - self.group_expiry
-        )
+        pipe = connection.pipeline(transaction=False)
+        pipe.zremrangebyscore(key, min=0, max=int(time.time()) - self.group_expiry)
+        pipe.zrange(key, 0, -1)
+        _, group_members = await pipe.execute()
 
-        channel_names = [x.decode("utf8") for x in await connection.zrange(key, 0, -1)]
+        channel_names = [x.decode("utf8") for x in group_members]
 
         (
             connection_to_channel_keys,
-            channel_keys_to_message,
+            channel_keys_to_channels,
             channel_keys_to_capacity,
-        ) = self._map_channel_keys_to_connection(channel_names, message)
+        ) = self._map_channel_keys_to_connection(channel_names)
 
-        for connection_index, channel_redis_keys in connection_to_channel_keys.items():
-            # Discard old messages based on expiry
-            pipe = connection.pipeline()
-            for key in channel_redis_keys:
-                pipe.zremrangebyscore(
-                    key, min=0, max=int(time.time()) - int(self.expiry)
-                )
-            await pipe.execute()
-
-            # Create a LUA script specific for this connection.
-            # Make sure to use the message specific to this channel, it is
-            # stored in channel_to_message dict and contains the
-            # __asgi_channel__ key.
-
-            group_send_lua = """
-                local over_capacity = 0
-                local current_time = ARGV[#ARGV - 1]
-                local expiry = ARGV[#ARGV]
-                for i=1,#KEYS do
-                    if redis.call('ZCOUNT', KEYS[i], '-inf', '+inf') < tonumber(ARGV[i + #KEYS]) then
-                        redis.call('ZADD', KEYS[i], current_time, ARGV[i])
-                        redis.call('EXPIRE', KEYS[i], expiry)
-                    else
-                        over_capacity = over_capacity + 1
-                    end
-                end
-                return over_capacity
-            """
-
-            # We need to filter the messages to keep those related to the connection
-            args = [
-                channel_keys_to_message[channel_key]
-                for channel_key in channel_redis_keys
-            ]
+        # With more than one channel key the message is serialized (and
+        # encrypted) once, stored under a payload key on every connection and
+        # the channel keys only get a small reference to it.
+        payload = payload_key = None
+        if len(channel_keys_to_channels) > 1:
+            payload = self.serialize(message)
+            payload_key = f"{self.prefix}:payload:{uuid.uuid4().hex}".encode("utf8")
 
+        for connection_index, channel_redis_keys in connection_to_channel_keys.items():
+            keys = list(channel_redis_keys)
+            if payload_key is None:
+                # Make sure to use the message specific to this channel, it
+                # contains the __asgi_channel__ key.
+                members = [
+                    self.serialize(
+                        {**message, "__asgi_channel__": channel_keys_to_channels[channel_key]}
+                    )
+                    for channel_key in channel_redis_keys
+                ]
+                args = self._send_args(time.time(), b"")
+            else:
+                members = [
+                    self._payload_reference(payload_key, channel_keys_to_channels[channel_key])
+                    for channel_key in channel_redis_keys
+                ]
+                args = self._send_args(time.time(), payload)
+                keys.append(payload_key)
+
+            args += members
             # We need to send the capacity for each channel
             args += [
                 channel_keys_to_capacity[channel_key]
                 for channel_key in channel_redis_keys
             ]
 
-            args += [time.time(), self.expiry]
-
             # channel_keys does not contain a single redis key more than once
-            connection = self.connection(connection_index)
-            channels_over_capacity = await connection.eval(
-                group_send_lua, len(channel_redis_keys), *channel_redis_keys, *args
-            )
+            send = self.script(connection_index, self.send_lua)
+            channels_over_capacity = await send(keys=keys, args=args)
             if channels_over_capacity > 0:
                 logger.info(
                     "%s of %s channels over capacity in group %s",
@@ -588,22 +682,22 @@ class RedisChannelLayer(BaseChannelLayer):
                     group,
                 )
 
-    def _map_channel_keys_to_connection(self, channel_names, message):
+    def _map_channel_keys_to_connection(self, channel_names):
         """
         For a list of channel names, GET
 
         1. list of their redis keys bucket each one to a dict keyed by the connection index
 
-        2. for each unique channel redis key create a serialized message specific to that redis key, by adding
-           the list of channels mapped to that redis key in __asgi_channel__ key to the message
+        2. for each unique channel redis key the list of channels mapped to that redis key,
+           sent along with the message in the __asgi_channel__ key
 
         3. returns a mapping of redis channels keys to their capacity
         """
 
         # Connection dict keyed by index to list of redis keys mapped on that index
         connection_to_channel_keys = collections.defaultdict(list)
-        # Message dict maps redis key to the message that needs to be send on that key
-        channel_key_to_message = dict()
+        # Channel names dict maps redis key to the channels that receive the message on that key
+        channel_key_to_channels = dict()
         # Channel key mapped to its capacity
         channel_key_to_capacity = dict()
 
@@ -615,26 +709,19 @@ class RedisChannelLayer(BaseChannelLayer):
             # Get its redis key
             channel_key = self.prefix + channel_non_local_name
             # Have we come across the same redis key?
-            if channel_key not in channel_key_to_message:
+            if channel_key not in channel_key_to_channels:
                 # If not, fill the corresponding dicts
-                message = dict(message.items())
-                message["__asgi_channel__"] = [channel]
-                channel_key_to_message[channel_key] = message
+                channel_key_to_channels[channel_key] = [channel]
                 channel_key_to_capacity[channel_key] = self.get_capacity(channel)
                 idx = self.consistent_hash(channel_non_local_name)
                 connection_to_channel_keys[idx].append(channel_key)
             else:
-                # Yes, Append the channel in message dict
-                channel_key_to_message[channel_key]["__asgi_channel__"].append(channel)
-
-        # Now that we know what message needs to be send on a redis key we serialize it
-        for key, value in channel_key_to_message.items():
-            # Serialize the message stored for each redis key
-            channel_key_to_message[key] = self.serialize(value)
+                # Yes, Append the channel to the list of that key
+                channel_key_to_channels[channel_key].append(channel)
 
         return (
             connection_to_channel_keys,
-            channel_key_to_message,
+            channel_key_to_channels,
             channel_key_to_capacity,
         )
 
@@ -669,6 +756,39 @@ class RedisChannelLayer(BaseChannelLayer):
             message = self.crypter.decrypt(message, self.expiry + 10)
         return msgpack.unpackb(message, raw=False)
 
+    def _payload_reference(self, payload_key, channels):
+        """
+        Sorted set member pointing at a payload stored by group_send.
+
+        The random prefix is followed by 0xC1, a byte that never starts a
+        msgpack value or a Fernet token, the length of the payload key, the
+        key itself and the channels the message is for.
+        """
+        random_prefix = random.getrandbits(8 * 12).to_bytes(12, "big")
+        return (
+            random_prefix
+            + PAYLOAD_REFERENCE
+            + len(payload_key).to_bytes(2, "big")
+            + payload_key
+            + msgpack.packb(channels, use_bin_type=True)
+        )
+
+    def deserialize_member(self, member, payload=None):
+        """
+        Deserializes a sorted set member, resolving a payload reference with
+        the payload the receive script fetched. Returns ``None`` when the
+        payload has already expired.
+        """
+        if member[12:13] != PAYLOAD_REFERENCE:
+            return self.deserialize(member)
+        if payload is None:
+            logger.info("Dropping a group message whose payload has expired")
+            return None
+        length = int.from_bytes(member[13:15], "big")
+        message = self.deserialize(payload)
+        message["__asgi_channel__"] = msgpack.unpackb(member[15 + length:], raw=False)
+        return message
+
     ### Internal functions ###
 
     def consistent_hash(self, value):
@@ -695,6 +815,15 @@ class RedisChannelLayer(BaseChannelLayer):
         Returns the correct connection for the index given.
         Lazily instantiates pools.
         """
+        return self._loop_layer(index).get_connection(index)
+
+    def script(self, index, source):
+        """
+        Returns the Lua script registered on the connection for the index given.
+        """
+        return self._loop_layer(index).get_script(index, source)
+
+    def _loop_layer(self, index):
         # Catch bad indexes
         if not 0 <= index < self.ring_size:
             raise ValueError(
@@ -708,4 +837,4 @@ class RedisChannelLayer(BaseChannelLayer):
             _wrap_close(self, loop)
             layer = self._layers[loop] = RedisLoopLayer(self)
 
-        return layer.get_connection(index)
+        return layer
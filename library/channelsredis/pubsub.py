@@ -1,4 +1,5 @@
 import asyncio
+import collections
 import functools
 import logging
 import uuid
@@ -6,6 +7,7 @@ import uuid
 import msgpack
 from redis import asyncio as aioredis
 
+from .core import BoundedQueue
 from .utils import _consistent_hash, _wrap_close, create_pool, decode_hosts
 
 logger = logging.getLogger(__name__)
@@ -79,9 +81,12 @@ class RedisPubSubLoopLayer:
         on_disconnect=None,
         on_reconnect=None,
         channel_layer=None,
+        capacity=100,
+        sharded=False,
         **kwargs,
     ):
         self.prefix = prefix
+        self.capacity = capacity
 
         self.on_disconnect = on_disconnect
         self.on_reconnect = on_reconnect
@@ -93,11 +98,22 @@ class RedisPubSubLoopLayer:
 
         # A channel can subscribe to zero or more groups.
         # This dict maps `group_name` to set of channel names who are subscribed to that group.
+        # The process subscribes once per group, messages are fanned out to the
+        # local channels in memory.
         self.groups = {}
+        # Reverse of `groups`, to leave the groups of a channel that goes away.
+        self._channel_groups = collections.defaultdict(set)
+
+        # Counters for stats()
+        self.received_count = 0
+        self.delivered_count = 0
+        self.dropped_count = 0
 
         # For each host, we create a `RedisSingleShardConnection` to manage the connection to that host.
+        # With `sharded` it uses Redis 7 sharded pub/sub (SSUBSCRIBE/SPUBLISH).
         self._shards = [
-            RedisSingleShardConnection(host, self) for host in decode_hosts(hosts)
+            RedisSingleShardConnection(host, self, sharded=sharded)
+            for host in decode_hosts(hosts)
         ]
 
     def _get_shard(self, channel_or_group_name):
@@ -119,10 +135,78 @@ class RedisPubSubLoopLayer:
         return f"{self.prefix}__group__{group}"
 
     async def _subscribe_to_channel(self, channel):
-        self.channels[channel] = asyncio.Queue()
+        self.channels[channel] = BoundedQueue(self.capacity)
         shard = self._get_shard(channel)
         await shard.subscribe(channel)
 
+    async def _remove_channel(self, channel):
+        """
+        Unsubscribe a channel that is no longer received and leave its groups.
+        """
+        del self.channels[channel]
+        shard = self._get_shard(channel)
+        await shard.unsubscribe(channel)
+        for group_channel in list(self._channel_groups.pop(channel, ())):
+            await self._leave_group(group_channel, channel)
+
+    async def _leave_group(self, group_channel, channel):
+        group_channels = self.groups.get(group_channel, set())
+        if channel not in group_channels:
+            return
+
+        group_channels.remove(channel)
+        if len(group_channels) == 0:
+            del self.groups[group_channel]
+        shard = self._get_shard(group_channel)
+        await shard.unsubscribe(group_channel)
+
+    def _deliver(self, name, data):
+        """
+        Decode a message received from Redis once and put it in the queue of
+        the channel, or of every local channel of the group.
+        """
+        if name in self.channels:
+            targets = (name,)
+        elif name in self.groups:
+            targets = [channel for channel in self.groups[name] if channel in self.channels]
+        else:
+            return
+        self.received_count += 1
+        if not targets:
+            return
+
+        try:
+            message = self.channel_layer.deserialize(data)
+        except Exception:
+            logger.exception("Dropping a message that cannot be deserialized:")
+            return
+        for channel in targets:
+            queue = self.channels[channel]
+            if queue.full():
+                self.dropped_count += 1
+            queue.put_nowait(message)
+        self.delivered_count += len(targets)
+
+    def stats(self):
+        """
+        Subscriptions, fan-out and buffered messages of this process.
+        """
+        depths = [queue.qsize() for queue in self.channels.values()]
+        subscriptions = sum(len(shard.subscriptions) for shard in self._shards)
+        return {
+            "subscriptions": subscriptions,
+            "channels": len(self.channels),
+            "groups": len(self.groups),
+            "group_members": sum(len(channels) for channels in self.groups.values()),
+            "received": self.received_count,
+            "delivered": self.delivered_count,
+            "fan_out": round(self.delivered_count / self.received_count, 2) if self.received_count else None,
+            "dropped": self.dropped_count,
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "capacity": self.capacity,
+        }
+
     extensions = ["groups", "flush"]
 
     ################################################################################
@@ -156,7 +240,7 @@ class RedisPubSubLoopLayer:
 
         q = self.channels[channel]
         try:
-            message = await q.get()
+            return await q.get()
         except (asyncio.CancelledError, asyncio.TimeoutError, GeneratorExit):
             # We assume here that the reason we are cancelled is because the consumer
             # is exiting, therefore we need to cleanup by unsubscribe below. Indeed,
@@ -167,17 +251,13 @@ class RedisPubSubLoopLayer:
             # following cleanup from that new `delete_channel()` method, but, since
             # that's not how Django Channels works (yet), we do the cleanup below:
             if channel in self.channels:
-                del self.channels[channel]
                 try:
-                    shard = self._get_shard(channel)
-                    await shard.unsubscribe(channel)
+                    await self._remove_channel(channel)
                 except BaseException:
                     logger.exception("Unexpected exception while cleaning-up channel:")
                     # We don't re-raise here because we want the CancelledError to be the one re-raised.
             raise
 
-        return self.channel_layer.deserialize(message)
-
     ################################################################################
     # Groups extension
     ################################################################################
@@ -196,8 +276,12 @@ class RedisPubSubLoopLayer:
         if group_channel not in self.groups:
             self.groups[group_channel] = set()
         group_channels = self.groups[group_channel]
-        if channel not in group_channels:
-            group_channels.add(channel)
+        if channel in group_channels:
+            return
+
+        group_channels.add(channel)
+        self._channel_groups[channel].add(group_channel)
+        # Only the first local member subscribes, the shard counts the rest
         shard = self._get_shard(group_channel)
         await shard.subscribe(group_channel)
 
@@ -207,15 +291,12 @@ class RedisPubSubLoopLayer:
         does nothing otherwise (does not error)
         """
         group_channel = self._get_group_channel_name(group)
-        group_channels = self.groups.get(group_channel, set())
-        if channel not in group_channels:
-            return
-
-        group_channels.remove(channel)
-        if len(group_channels) == 0:
-            del self.groups[group_channel]
-            shard = self._get_shard(group_channel)
-            await shard.unsubscribe(group_channel)
+        channel_groups = self._channel_groups.get(channel)
+        if channel_groups is not None:
+            channel_groups.discard(group_channel)
+            if not channel_groups:
+                del self._channel_groups[channel]
+        await self._leave_group(group_channel, channel)
 
     async def group_send(self, group, message):
         """
@@ -237,15 +318,50 @@ class RedisPubSubLoopLayer:
         """
         self.channels = {}
         self.groups = {}
+        self._channel_groups = collections.defaultdict(set)
         for shard in self._shards:
             await shard.flush()
 
 
+class ShardedPubSub(aioredis.client.PubSub):
+    """
+    PubSub that also handles Redis 7 sharded channels, which the asyncio
+    client of redis-py doesn't support yet.
+    """
+
+    PUBLISH_MESSAGE_TYPES = ("message", "pmessage", "smessage")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard_channels = set()
+
+    @property
+    def subscribed(self):
+        return bool(self.channels or self.patterns or self.shard_channels)
+
+    async def on_connect(self, connection):
+        await super().on_connect(connection)
+        # One by one, sharded channels of one command must share a slot
+        for channel in list(self.shard_channels):
+            await self.execute_command("SSUBSCRIBE", channel)
+
+    async def ssubscribe(self, *channels):
+        await self.execute_command("SSUBSCRIBE", *channels)
+        self.shard_channels.update(channels)
+
+    async def sunsubscribe(self, *channels):
+        # Messages that still arrive are dropped by the layer
+        self.shard_channels.difference_update(channels)
+        await self.execute_command("SUNSUBSCRIBE", *channels)
+
+
 class RedisSingleShardConnection:
-    def __init__(self, host, channel_layer):
+    def __init__(self, host, channel_layer, sharded=False):
         self.host = host
         self.channel_layer = channel_layer
-        self._subscribed_to = set()
+        self.sharded = sharded
+        # Subscribed channel name mapped to the number of local users
+        self.subscriptions = collections.Counter()
         self._lock = asyncio.Lock()
         self._redis = None
         self._pubsub = None
@@ -254,23 +370,36 @@ class RedisSingleShardConnection:
     async def publish(self, channel, message):
         async with self._lock:
             self._ensure_redis()
-            await self._redis.publish(channel, message)
+            if self.sharded:
+                await self._redis.execute_command("SPUBLISH", channel, message)
+            else:
+                await self._redis.publish(channel, message)
 
     async def subscribe(self, channel):
         async with self._lock:
-            if channel not in self._subscribed_to:
+            if channel not in self.subscriptions:
                 self._ensure_redis()
                 self._ensure_receiver()
-                await self._pubsub.subscribe(channel)
-                self._subscribed_to.add(channel)
+                if self.sharded:
+                    await self._pubsub.ssubscribe(channel)
+                else:
+                    await self._pubsub.subscribe(channel)
+            self.subscriptions[channel] += 1
 
     async def unsubscribe(self, channel):
         async with self._lock:
-            if channel in self._subscribed_to:
-                self._ensure_redis()
-                self._ensure_receiver()
+            if channel not in self.subscriptions:
+                return
+            self.subscriptions[channel] -= 1
+            if self.subscriptions[channel] > 0:
+                return
+            del self.subscriptions[channel]
+            self._ensure_redis()
+            self._ensure_receiver()
+            if self.sharded:
+                await self._pubsub.sunsubscribe(channel)
+            else:
                 await self._pubsub.unsubscribe(channel)
-                self._subscribed_to.remove(channel)
 
     async def flush(self):
         async with self._lock:
@@ -288,7 +417,7 @@ class RedisSingleShardConnection:
                 await self._redis.close(close_connection_pool=True)
                 self._redis = None
                 self._pubsub = None
-            self._subscribed_to = set()
+            self.subscriptions = collections.Counter()
 
     async def _do_receiving(self):
         while True:
@@ -316,18 +445,16 @@ class RedisSingleShardConnection:
             data = message["data"]
             if isinstance(name, bytes):
                 name = name.decode()
-            if name in self.channel_layer.channels:
-                self.channel_layer.channels[name].put_nowait(data)
-            elif name in self.channel_layer.groups:
-                for channel_name in self.channel_layer.groups[name]:
-                    if channel_name in self.channel_layer.channels:
-                        self.channel_layer.channels[channel_name].put_nowait(data)
+            self.channel_layer._deliver(name, data)
 
     def _ensure_redis(self):
         if self._redis is None:
             pool = create_pool(self.host)
             self._redis = aioredis.Redis(connection_pool=pool)
-            self._pubsub = self._redis.pubsub()
+            if self.sharded:
+                self._pubsub = ShardedPubSub(pool)
+            else:
+                self._pubsub = self._redis.pubsub()
 
     def _ensure_receiver(self):
         if self._receive_task is None:
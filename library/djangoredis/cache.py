@@ -38,6 +38,22 @@ def omit_exception(
     return _decorator
 
 
+def batchable(method: Callable) -> Callable:
+    """
+    Queue the call on the batch active on this thread, see ``RedisCache.batch()``.
+    """
+
+    @functools.wraps(method)
+    def _decorator(self, *args, **kwargs):
+        if kwargs.get("client") is None:
+            batch = self.client.current_batch()
+            if batch is not None:
+                return getattr(batch, method.__name__)(*args, **kwargs)
+        return method(self, *args, **kwargs)
+
+    return _decorator
+
+
 class RedisCache(BaseCache):
     def __init__(self, server: str, params: Dict[str, Any]) -> None:
         super().__init__(params)
@@ -77,6 +93,7 @@ class RedisCache(BaseCache):
         return self._client
 
     @omit_exception
+    @batchable
     def set(self, *args, **kwargs):
         return self.client.set(*args, **kwargs)
 
@@ -99,6 +116,7 @@ class RedisCache(BaseCache):
         return self.client.get(key, default=default, version=version, client=client)
 
     @omit_exception
+    @batchable
     def delete(self, *args, **kwargs):
         """returns a boolean instead of int since django version 3.1"""
         result = self.client.delete(*args, **kwargs)
@@ -110,6 +128,7 @@ class RedisCache(BaseCache):
         return self.client.delete_pattern(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def delete_many(self, *args, **kwargs):
         return self.client.delete_many(*args, **kwargs)
 
@@ -122,6 +141,7 @@ class RedisCache(BaseCache):
         return self.client.get_many(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def set_many(self, *args, **kwargs):
         return self.client.set_many(*args, **kwargs)
 
@@ -154,22 +174,27 @@ class RedisCache(BaseCache):
         return self.client.pttl(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def persist(self, *args, **kwargs):
         return self.client.persist(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def expire(self, *args, **kwargs):
         return self.client.expire(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def expire_at(self, *args, **kwargs):
         return self.client.expire_at(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def pexpire(self, *args, **kwargs):
         return self.client.pexpire(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def pexpire_at(self, *args, **kwargs):
         return self.client.pexpire_at(*args, **kwargs)
 
@@ -177,15 +202,35 @@ class RedisCache(BaseCache):
     def lock(self, *args, **kwargs):
         return self.client.lock(*args, **kwargs)
 
+    def batch(self):
+        """
+        Queue operations and send them in one pipeline when the block exits::
+
+            with cache.batch() as batch:
+                cache.set("a", 1)
+                cache.expire("b", 60)
+                counter = batch.incr("hits")
+            counter.value
+        """
+        return self.client.batch(ignore_exceptions=self._ignore_exceptions)
+
+    def client_cache_stats(self):
+        """
+        Hit/miss stats of the client side cache (``CLIENT_CACHE`` option), or ``None``.
+        """
+        return self.client.client_cache_stats()
+
     @omit_exception
     def close(self, **kwargs):
         self.client.close(**kwargs)
 
     @omit_exception
+    @batchable
     def touch(self, *args, **kwargs):
         return self.client.touch(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def sadd(self, *args, **kwargs):
         return self.client.sadd(*args, **kwargs)
 
@@ -230,6 +275,7 @@ class RedisCache(BaseCache):
         return self.client.srandmember(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def srem(self, *args, **kwargs):
         return self.client.srem(*args, **kwargs)
 
@@ -254,10 +300,12 @@ class RedisCache(BaseCache):
         return self.client.sunionstore(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def hset(self, *args, **kwargs):
         return self.client.hset(*args, **kwargs)
 
     @omit_exception
+    @batchable
     def hdel(self, *args, **kwargs):
         return self.client.hdel(*args, **kwargs)
 
@@ -0,0 +1,319 @@
+from typing import Any, Callable, List, Optional
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from redis.typing import KeyT
+
+from djangoredis.exceptions import ConnectionInterrupted
+
+_PENDING = object()
+
+
+class BatchResult:
+    """
+    Result of a queued operation, available once the batch is executed.
+    """
+
+    __slots__ = ("_value", "_error")
+
+    def __init__(self) -> None:
+        self._value = _PENDING
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self._value is not _PENDING or self._error is not None
+
+    @property
+    def value(self) -> Any:
+        if self._error is not None:
+            raise self._error
+        if self._value is _PENDING:
+            error_message = "The batch has not been executed yet"
+            raise RuntimeError(error_message)
+        return self._value
+
+    def __repr__(self) -> str:
+        if not self.done:
+            return "<BatchResult: pending>"
+        return f"<BatchResult: {self._error or self._value!r}>"
+
+
+class Batch:
+    """
+    Queue mixed cache operations and send them to Redis in one pipeline
+    (no MULTI/EXEC) when the outermost ``with cache.batch():`` block exits.
+
+    Every method returns a :class:`BatchResult`. While a batch is active,
+    the write operations of the cache API (``set``, ``delete``, ``expire``,
+    ``touch``, ``sadd``, ``hset``...) called on the same thread are queued
+    too, and any other call flushes the pending operations first so it
+    reads its own writes.
+    """
+
+    def __init__(self, client, ignore_exceptions: bool = False) -> None:
+        self._client = client
+        self._redis = client.get_client(write=True)
+        self._pipeline = self._redis.pipeline(transaction=False)
+        self._queued: List[tuple] = []
+        self._depth = 0
+        self._ignore_exceptions = ignore_exceptions
+
+    def __enter__(self) -> "Batch":
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._depth -= 1
+        if self._depth:
+            return
+        self._client._local.batch = None
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pipeline.reset()
+            self._queued = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._queued)
+
+    def _queue(self, add: Callable[[], Any], decode: Callable[[list], Any]) -> BatchResult:
+        """
+        Run ``add`` to put commands on the pipeline, ``decode`` turns their raw
+        replies into the result.
+        """
+        start = len(self._pipeline)
+        add()
+        result = BatchResult()
+        self._queued.append((result, len(self._pipeline) - start, decode))
+        return result
+
+    def flush(self) -> None:
+        if not self._queued:
+            return
+        queued, self._queued = self._queued, []
+        try:
+            replies = self._pipeline.execute(raise_on_error=False)
+        except Exception as e:
+            self._pipeline.reset()
+            for result, _, _ in queued:
+                result._error = ConnectionInterrupted(connection=self._redis)
+            if self._ignore_exceptions:
+                return
+            raise ConnectionInterrupted(connection=self._redis) from e
+
+        position = 0
+        for result, count, decode in queued:
+            raw = replies[position:position + count]
+            position += count
+            error = next((reply for reply in raw if isinstance(reply, Exception)), None)
+            if error is not None:
+                result._error = error
+                continue
+            try:
+                result._value = decode(raw)
+            except Exception as e:
+                result._error = e
+
+    # Writes, through the client methods so encoding, timeouts and key
+    # handling stay the same.
+
+    def set(self, key: KeyT, value: Any, timeout: Optional[float] = DEFAULT_TIMEOUT,
+            version: Optional[int] = None, nx: bool = False, xx: bool = False, **kwargs) -> BatchResult:
+        expiry = self._client._backend.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+        if expiry is not None and int(expiry * 1000) <= 0 and nx:
+            # The client only checks whether the key exists, see DefaultClient.set()
+            decode = lambda raw: not raw[0]  # noqa: E731
+        else:
+            decode = lambda raw: bool(raw[0])  # noqa: E731
+        return self._queue(
+            lambda: self._client.set(key, value, timeout, version=version, client=self._pipeline, nx=nx, xx=xx),
+            decode,
+        )
+
+    def add(self, key: KeyT, value: Any, timeout: Optional[float] = DEFAULT_TIMEOUT,
+            version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self.set(key, value, timeout, version=version, nx=True)
+
+    def set_many(self, data: dict, timeout: Optional[float] = DEFAULT_TIMEOUT,
+                 version: Optional[int] = None, **kwargs) -> BatchResult:
+        def add():
+            for key, value in data.items():
+                self._client.set(key, value, timeout, version=version, client=self._pipeline)
+
+        return self._queue(add, lambda raw: [])
+
+    def delete(self, key: KeyT, version: Optional[int] = None, prefix: Optional[str] = None,
+               **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.delete(key, version=version, prefix=prefix, client=self._pipeline),
+            lambda raw: raw[0],
+        )
+
+    def delete_many(self, keys, version: Optional[int] = None, **kwargs) -> BatchResult:
+        keys = list(keys)
+        return self._queue(
+            lambda: self._client.delete_many(keys, version=version, client=self._pipeline),
+            lambda raw: raw[0] if raw else 0,
+        )
+
+    def incr(self, key: KeyT, delta: int = 1, version: Optional[int] = None,
+             ignore_key_check: bool = False, **kwargs) -> BatchResult:
+        def decode(raw):
+            if raw[0] is None:
+                error_message = f"Key '{key!r}' not found"
+                raise ValueError(error_message)
+            return raw[0]
+
+        return self._queue(
+            lambda: self._client.incr(key, delta, version=version, client=self._pipeline,
+                                      ignore_key_check=ignore_key_check),
+            decode,
+        )
+
+    def decr(self, key: KeyT, delta: int = 1, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self.incr(key, -delta, version=version)
+
+    def expire(self, key: KeyT, timeout, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.expire(key, timeout, version=version, client=self._pipeline),
+            lambda raw: bool(raw[0]),
+        )
+
+    def pexpire(self, key: KeyT, timeout, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.pexpire(key, timeout, version=version, client=self._pipeline),
+            lambda raw: bool(raw[0]),
+        )
+
+    def expire_at(self, key: KeyT, when, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.expire_at(key, when, version=version, client=self._pipeline),
+            lambda raw: bool(raw[0]),
+        )
+
+    def pexpire_at(self, key: KeyT, when, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.pexpire_at(key, when, version=version, client=self._pipeline),
+            lambda raw: bool(raw[0]),
+        )
+
+    def persist(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.persist(key, version=version, client=self._pipeline),
+            lambda raw: bool(raw[0]),
+        )
+
+    def touch(self, key: KeyT, timeout: Optional[float] = DEFAULT_TIMEOUT,
+              version: Optional[int] = None, **kwargs) -> BatchResult:
+        # Always PEXPIRE/PERSIST, also for the HerdClient
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._client._backend.default_timeout
+        nkey = self._client.make_key(key, version=version)
+        if timeout is None:
+            return self._queue(lambda: self._pipeline.persist(nkey), lambda raw: bool(raw[0]))
+        return self._queue(lambda: self._pipeline.pexpire(nkey, int(timeout * 1000)), lambda raw: bool(raw[0]))
+
+    def sadd(self, key: KeyT, *values: Any, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.sadd(key, *values, version=version, client=self._pipeline),
+            lambda raw: int(raw[0]),
+        )
+
+    def srem(self, key: KeyT, *members: Any, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.srem(key, *members, version=version, client=self._pipeline),
+            lambda raw: int(raw[0]),
+        )
+
+    def hset(self, name: str, key: KeyT, value: Any, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.hset(name, key, value, version=version, client=self._pipeline),
+            lambda raw: int(raw[0]),
+        )
+
+    def hdel(self, name: str, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        return self._queue(
+            lambda: self._client.hdel(name, key, version=version, client=self._pipeline),
+            lambda raw: int(raw[0]),
+        )
+
+    # Reads, queued directly because the client methods decode immediately.
+
+    def get(self, key: KeyT, default: Any = None, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.get(nkey), lambda raw: self._decode(raw[0], default))
+
+    def get_many(self, keys, version: Optional[int] = None, **kwargs) -> BatchResult:
+        map_keys = {self._client.make_key(key, version=version): key for key in keys}
+
+        def decode(raw):
+            values = raw[0] if raw else []
+            return {
+                map_keys[nkey]: self._decode(value)
+                for nkey, value in zip(map_keys, values)
+                if value is not None
+            }
+
+        def add():
+            if map_keys:
+                self._pipeline.mget(*map_keys)
+
+        return self._queue(add, decode)
+
+    def has_key(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.exists(nkey), lambda raw: raw[0] == 1)
+
+    def ttl(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.ttl(nkey), lambda raw: self._ttl(raw[0]))
+
+    def pttl(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.pttl(nkey), lambda raw: self._ttl(raw[0]))
+
+    def smembers(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(
+            lambda: self._pipeline.smembers(nkey),
+            lambda raw: {self._client.decode(value) for value in raw[0]},
+        )
+
+    def sismember(self, key: KeyT, member: Any, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(
+            lambda: self._pipeline.sismember(nkey, self._client.encode(member)),
+            lambda raw: bool(raw[0]),
+        )
+
+    def scard(self, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.scard(nkey), lambda raw: int(raw[0]))
+
+    def hexists(self, name: str, key: KeyT, version: Optional[int] = None, **kwargs) -> BatchResult:
+        nkey = self._client.make_key(key, version=version)
+        return self._queue(lambda: self._pipeline.hexists(name, nkey), lambda raw: bool(raw[0]))
+
+    def hlen(self, name: str, **kwargs) -> BatchResult:
+        return self._queue(lambda: self._pipeline.hlen(name), lambda raw: int(raw[0]))
+
+    def _decode(self, value: Any, default: Any = None) -> Any:
+        if value is None:
+            return default
+        value = self._client.decode(value)
+        unpack = getattr(self._client, "_unpack", None)
+        if unpack is not None:
+            # HerdClient values
+            value, refresh = unpack(value)
+            if refresh:
+                return default
+        return value
+
+    @staticmethod
+    def _ttl(value: int) -> Optional[int]:
+        if value >= 0:
+            return value
+        if value == -1:
+            return None
+        return 0
@@ -1,6 +1,7 @@
 import random
 import re
 import socket
+import threading
 from collections import OrderedDict
 from contextlib import suppress
 from typing import (
@@ -25,6 +26,8 @@ from redis.exceptions import ConnectionError, ResponseError, TimeoutError
 from redis.typing import AbsExpiryT, EncodableT, ExpiryT, KeyT, PatternT
 
 from djangoredis import pool
+from djangoredis.client.batch import Batch
+from djangoredis.client.tracking import ClientSideCache
 from djangoredis.exceptions import CompressorError, ConnectionInterrupted
 from djangoredis.util import CacheKey
 
@@ -74,6 +77,12 @@ class DefaultClient:
 
         self.connection_factory = pool.get_connection_factory(options=self._options)
 
+        self._local = threading.local()
+        client_cache = self._options.get("CLIENT_CACHE")
+        self._client_cache = (
+            ClientSideCache.from_options(self, client_cache) if client_cache else None
+        )
+
     def __contains__(self, key: KeyT) -> bool:
         return self.has_key(key)
 
@@ -119,6 +128,7 @@ class DefaultClient:
         operations for obtain a native redis client/connection
         instance.
         """
+        self.flush_batch()
         index = self.get_next_client_index(write=write, tried=tried)
 
         if self._clients[index] is None:
@@ -138,6 +148,7 @@ class DefaultClient:
         operations for obtain a native redis client/connection
         instance.
         """
+        self.flush_batch()
         index = self.get_next_client_index(write=write, tried=tried)
 
         if self._clients[index] is None:
@@ -145,6 +156,41 @@ class DefaultClient:
 
         return self._clients[index], index  # type:ignore
 
+    def batch(self, ignore_exceptions: bool = False) -> Batch:
+        """
+        Return the batch of this thread, a new one when none is active.
+        Use as ``with cache.batch() as batch:``, see :class:`Batch`.
+        """
+        batch = self.current_batch()
+        if batch is None:
+            batch = Batch(self, ignore_exceptions=ignore_exceptions)
+            self._local.batch = batch
+        return batch
+
+    def current_batch(self) -> Optional[Batch]:
+        return getattr(self._local, "batch", None)
+
+    def flush_batch(self) -> None:
+        """
+        Send the operations queued on this thread before running another one.
+        """
+        batch = getattr(self._local, "batch", None)
+        if batch is not None and batch.pending:
+            batch.flush()
+
+    def client_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self._client_cache is None:
+            return None
+        return self._client_cache.stats()
+
+    def _forget(self, *keys: KeyT) -> None:
+        """
+        Drop written keys from the client side cache right away, the
+        invalidation pushed by Redis follows.
+        """
+        if self._client_cache is not None:
+            self._client_cache.invalidate(keys)
+
     def connect(self, index: int = 0) -> Redis:
         """
         Given a connection index, returns a new raw redis client/connection
@@ -208,7 +254,9 @@ class DefaultClient:
                         # than to set it and than expire in a pipeline
                         return bool(self.delete(key, client=client, version=version))
 
-                return bool(client.set(nkey, nvalue, nx=nx, px=timeout, xx=xx))
+                result = bool(client.set(nkey, nvalue, nx=nx, px=timeout, xx=xx))
+                self._forget(nkey)
+                return result
             except _main_exceptions as e:
                 if (
                     not original_client
@@ -286,16 +334,27 @@ class DefaultClient:
 
         Returns decoded value if key is found, the default if not.
         """
+        client_cache = None
         if client is None:
             client = self.get_client(write=False)
+            client_cache = self._client_cache
 
         key = self.make_key(key, version=version)
 
+        token = None
+        if client_cache is not None and client_cache.tracks(key):
+            value, token = client_cache.get(key)
+            if value is not None:
+                return self.decode(value)
+
         try:
             value = client.get(key)
         except _main_exceptions as e:
             raise ConnectionInterrupted(connection=client) from e
 
+        if token is not None:
+            client_cache.store(key, value, token)
+
         if value is None:
             return default
 
@@ -422,10 +481,13 @@ class DefaultClient:
         if client is None:
             client = self.get_client(write=True)
 
+        key = self.make_key(key, version=version, prefix=prefix)
         try:
-            return client.delete(self.make_key(key, version=version, prefix=prefix))
+            result = client.delete(key)
         except _main_exceptions as e:
             raise ConnectionInterrupted(connection=client) from e
+        self._forget(key)
+        return result
 
     def delete_pattern(
         self,
@@ -453,6 +515,8 @@ class DefaultClient:
                 count += 1
             pipeline.execute()
 
+            if self._client_cache is not None:
+                self._client_cache.clear()
             return count
         except _main_exceptions as e:
             raise ConnectionInterrupted(connection=client) from e
@@ -476,9 +540,11 @@ class DefaultClient:
             return 0
 
         try:
-            return client.delete(*keys)
+            result = client.delete(*keys)
         except _main_exceptions as e:
             raise ConnectionInterrupted(connection=client) from e
+        self._forget(*keys)
+        return result
 
     def clear(self, client: Optional[Redis] = None) -> None:
         """
@@ -492,6 +558,8 @@ class DefaultClient:
             client.flushdb()
         except _main_exceptions as e:
             raise ConnectionInterrupted(connection=client) from e
+        if self._client_cache is not None:
+            self._client_cache.clear()
 
     def decode(self, value: EncodableT) -> Any:
         """
@@ -538,8 +606,10 @@ class DefaultClient:
         Retrieve many keys.
         """
 
+        client_cache = None
         if client is None:
             client = self.get_client(write=False)
+            client_cache = self._client_cache
 
         if not keys:
             return OrderedDict()
@@ -548,15 +618,33 @@ class DefaultClient:
 
         map_keys = OrderedDict((self.make_key(k, version=version), k) for k in keys)
 
-        try:
-            results = client.mget(*map_keys)
-        except _main_exceptions as e:
-            raise ConnectionInterrupted(connection=client) from e
+        values = {}
+        tokens = {}
+        if client_cache is not None:
+            for key in map_keys:
+                if client_cache.tracks(key):
+                    value, token = client_cache.get(key)
+                    if value is not None:
+                        values[key] = value
+                    else:
+                        tokens[key] = token
+
+        missing = [key for key in map_keys if key not in values]
+        if missing:
+            try:
+                results = client.mget(*missing)
+            except _main_exceptions as e:
+                raise ConnectionInterrupted(connection=client) from e
+
+            for key, value in zip(missing, results):
+                if key in tokens:
+                    client_cache.store(key, value, tokens[key])
+                if value is not None:
+                    values[key] = value
 
-        for key, value in zip(map_keys, results):
-            if value is None:
-                continue
-            recovered_data[map_keys[key]] = self.decode(value)
+        for key in map_keys:
+            if key in values:
+                recovered_data[map_keys[key]] = self.decode(values[key])
         return recovered_data
 
     def set_many(
@@ -576,8 +664,22 @@ class DefaultClient:
         if client is None:
             client = self.get_client(write=True)
 
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._backend.default_timeout
+
         try:
-            pipeline = client.pipeline()
+            if timeout is None:
+                # Without expiry a single MSET is enough
+                mapping = {
+                    self.make_key(key, version=version): self.encode(value)
+                    for key, value in data.items()
+                }
+                if mapping:
+                    client.mset(mapping)
+                    self._forget(*mapping)
+                return
+
+            pipeline = client.pipeline(transaction=False)
             for key, value in data.items():
                 self.set(key, value, timeout, version=version, client=pipeline)
             pipeline.execute()
@@ -614,6 +716,7 @@ class DefaultClient:
                     return redis.call('INCRBY', KEYS[1], ARGV[1])
                     """
                 value = client.eval(lua, 1, key, delta)
+                self._forget(key)
                 if value is None:
                     error_message = f"Key '{key!r}' not found"
                     raise ValueError(error_message)
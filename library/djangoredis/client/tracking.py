@@ -0,0 +1,244 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+
+class ClientSideCache:
+    """
+    In-process copy of hot, read-mostly keys, kept coherent by Redis 6
+    ``CLIENT TRACKING`` in broadcasting mode.
+
+    Enabled with the ``CLIENT_CACHE`` option of the cache::
+
+        "OPTIONS": {
+            "CLIENT_CACHE": {
+                "KEY_PREFIXES": ["format:", "menu:"],
+                "MAX_ENTRIES": 10000,
+                "MAX_SIZE": 16 * 1024 * 1024,  # bytes of encoded values
+                "TTL": 60,  # seconds, safety net on top of invalidation
+            },
+        }
+
+    A background thread holds two connections: one subscribed to
+    ``__redis__:invalidate`` and one that turned tracking on with
+    ``REDIRECT`` to it for the configured prefixes. Every write to a tracked
+    key, by any client, pushes an invalidation. While that connection is
+    down the local copy is cleared and reads go to Redis.
+
+    Values are stored encoded and decoded on every hit, so callers never
+    share a mutable object. Reads from replicas may lag the invalidations,
+    use it with the primary only.
+    """
+
+    def __init__(
+        self,
+        client,
+        key_prefixes: Iterable[str],
+        max_entries: int = 10000,
+        max_size: int = 16 * 1024 * 1024,
+        ttl: Optional[float] = 60,
+    ) -> None:
+        self._client = client
+        self.key_prefixes = tuple(key_prefixes)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._pending: Dict[str, object] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._tracked_prefixes: Optional[Tuple[str, ...]] = None
+        self._pid: Optional[int] = None
+        self._healthy = False
+        self._disabled = False
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_options(cls, client, options: Dict[str, Any]) -> "ClientSideCache":
+        return cls(
+            client,
+            key_prefixes=options.get("KEY_PREFIXES", ()),
+            max_entries=options.get("MAX_ENTRIES", 10000),
+            max_size=options.get("MAX_SIZE", 16 * 1024 * 1024),
+            ttl=options.get("TTL", 60),
+        )
+
+    @property
+    def tracked_prefixes(self) -> Tuple[str, ...]:
+        # Prefix dan versi kunci dari backend, sama dengan make_key()
+        if self._tracked_prefixes is None:
+            self._tracked_prefixes = tuple(
+                str(self._client.make_key(prefix)) for prefix in self.key_prefixes
+            )
+        return self._tracked_prefixes
+
+    def tracks(self, key: str) -> bool:
+        if self._disabled or not self.key_prefixes:
+            return False
+        if self._pid != os.getpid():
+            self._start()
+        return self._healthy and str(key).startswith(self.tracked_prefixes)
+
+    def get(self, key: str) -> Tuple[Optional[bytes], Optional[object]]:
+        """
+        ``(raw value, None)`` on a hit. On a miss ``(None, token)``, pass the
+        token to :meth:`store` with the value read from Redis.
+        """
+        key = str(key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0], None
+                self._remove(key)
+            self.misses += 1
+            token = object()
+            self._pending[key] = token
+            return None, token
+
+    def store(self, key: str, value: Optional[bytes], token: object) -> None:
+        """
+        Keep the value read from Redis, unless the key was invalidated since
+        :meth:`get` handed out the token.
+        """
+        key = str(key)
+        with self._lock:
+            if self._pending.get(key) is not token:
+                return
+            del self._pending[key]
+            if value is None or not self._healthy:
+                return
+            size = len(value)
+            if size > self.max_size:
+                return
+            self._remove(key)
+            expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+            self._entries[key] = (value, expires)
+            self._size += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_size
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, keys: Iterable[Any]) -> None:
+        with self._lock:
+            for key in keys:
+                if isinstance(key, bytes):
+                    key = key.decode()
+                key = str(key)
+                self._pending.pop(key, None)
+                if self._remove(key):
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self._size = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._size -= len(entry[0])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self._size,
+            "healthy": self._healthy,
+        }
+
+    def _start(self) -> None:
+        """
+        Start the invalidation listener, again after a fork.
+        """
+        with self._start_lock:
+            pid = os.getpid()
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._healthy = False
+            self.clear()
+            thread = threading.Thread(
+                target=self._listen, args=(pid,), name="djangoredis-tracking", daemon=True
+            )
+            thread.start()
+
+    def _listen(self, pid: int) -> None:
+        delay = 1
+        while self._pid == pid and not self._disabled:
+            listener = control = None
+            try:
+                pool = self._client.get_client(write=True).connection_pool
+                listener = pool.connection_class(**pool.connection_kwargs)
+                control = pool.connection_class(**pool.connection_kwargs)
+
+                listener.send_command("CLIENT", "ID")
+                listener_id = listener.read_response()
+                args = ["CLIENT", "TRACKING", "ON", "REDIRECT", listener_id, "BCAST"]
+                for prefix in self.tracked_prefixes:
+                    args.extend(("PREFIX", prefix))
+                control.send_command(*args)
+                control.read_response()
+                listener.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+                listener.read_response()
+
+                self.clear()
+                self._healthy = True
+                delay = 1
+                while self._pid == pid:
+                    if not listener.can_read(timeout=1):
+                        continue
+                    self._handle(listener.read_response())
+            except ResponseError as e:
+                # Redis < 6 atau CLIENT TRACKING tidak diizinkan
+                logger.warning("Client side cache disabled: %s", e)
+                self._disabled = True
+            except Exception as e:
+                logger.warning("Client side cache invalidation lost, retrying in %ss: %s", delay, e)
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+            finally:
+                self._healthy = False
+                self.clear()
+                for connection in (listener, control):
+                    if connection is not None:
+                        connection.disconnect()
+
+    def _handle(self, response: Any) -> None:
+        if not isinstance(response, list) or len(response) < 3 or response[0] not in (b"message", "message"):
+            return
+        keys = response[2]
+        if keys is None:
+            # FLUSHDB/FLUSHALL
+            self.clear()
+        else:
+            self.invalidate(keys if isinstance(keys, list) else [keys])
@@ -9,6 +9,7 @@ from django.utils.translation import gettext_lazy as _
 from huey.contrib.djhuey import HUEY
 
 from hueymonitor.models import SignalInfoModel, TaskModel
+from hueymonitor.progress import with_live_progress
 
 
 class TaskModelChangeList(ChangeList):
@@ -20,6 +21,11 @@ class TaskModelChangeList(ChangeList):
         qs = qs.filter(parent_task__isnull=True)
         return qs
 
+    def get_results(self, request):
+        super().get_results(request)
+        # Progress of running tasks lives in the cache, the database only has checkpoints
+        self.result_list = with_live_progress(list(self.result_list))
+
 
 @admin.register(TaskModel)
 class TaskModelAdmin(admin.ModelAdmin):
@@ -30,7 +36,7 @@ class TaskModelAdmin(admin.ModelAdmin):
         qs = TaskModel.objects.filter(parent_task_id=obj.pk).order_by('-create_dt')
         context = {
             'main_task': obj,
-            'sub_tasks': qs
+            'sub_tasks': with_live_progress(list(qs))
         }
         return render_to_string(
             template_name='admin/hueymonitor/taskmodel/column_name.html',
@@ -49,7 +55,7 @@ class TaskModelAdmin(admin.ModelAdmin):
             # This is a main Task
             qs = TaskModel.objects.filter(parent_task_id=obj.pk)
             context = {
-                'sub_tasks': qs
+                'sub_tasks': with_live_progress(list(qs))
             }
 
         return render_to_string(
@@ -59,6 +65,12 @@ class TaskModelAdmin(admin.ModelAdmin):
 
     task_hierarchy_info.short_description = _('Task hierarchy')
 
+    def get_object(self, request, object_id, from_field=None):
+        obj = super().get_object(request, object_id, from_field)
+        if obj is not None:
+            with_live_progress([obj])
+        return obj
+
     def has_change_permission(self, request, obj=None):
         return False
 
@@ -13,4 +13,7 @@ class HueyMonitorConfig(AppConfig):
         from . import tasks
         if tasks:
             pass
+        from hueymonitorutils.dbperf import huey as dbperf_huey
+        if dbperf_huey:
+            pass
         pass
@@ -0,0 +1,68 @@
+"""
+Live task progress kept in the cache (Redis), so ProcessInfo.update() does not
+have to write the TaskModel row on every call. The database only receives
+checkpoints, the admin reads the live value on top of it.
+"""
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'hueymonitor:progress:{task_id}'
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+def progress_key(task_id):
+    return PROGRESS_KEY.format(task_id=task_id)
+
+
+def set_live_progress(task_id, progress_count):
+    try:
+        cache.set(progress_key(task_id), (progress_count, timezone.now()), PROGRESS_TIMEOUT)
+    except Exception as e:
+        # The checkpoints in the database are still written
+        logger.warning('Can not store live progress of task %s: %s', task_id, e)
+
+
+def get_live_progress(task_ids):
+    """
+    {task_id: (progress_count, update_dt)} for the tasks that have live progress.
+    """
+    keys = {progress_key(task_id): task_id for task_id in task_ids}
+    if not keys:
+        return {}
+    try:
+        values = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning('Can not read live progress: %s', e)
+        return {}
+    return {keys[key]: value for key, value in values.items()}
+
+
+def delete_live_progress(task_id):
+    try:
+        cache.delete(progress_key(task_id))
+    except Exception as e:
+        logger.warning('Can not delete live progress of task %s: %s', task_id, e)
+
+
+def with_live_progress(tasks):
+    """
+    Replace progress_count/update_dt of unfinished TaskModel instances with
+    their live values. Returns the given tasks.
+    """
+    running = [task for task in tasks if not task.finished]
+    live = get_live_progress([str(task.task_id) for task in running])
+    for task in running:
+        value = live.get(str(task.task_id))
+        if value is None:
+            continue
+        progress_count, update_dt = value
+        if task.progress_count is None or progress_count >= task.progress_count:
+            task.progress_count = progress_count
+            task.update_dt = update_dt
+            task.__dict__.pop('elapsed_sec', None)
+    return tasks
@@ -3,16 +3,20 @@ import os
 import socket
 import sys
 import threading
+import time
 import traceback
 import uuid
 from functools import lru_cache
 
-from django.db import transaction
+from django.conf import settings
+from django.db import close_old_connections, transaction
 from django.db.models import Sum
-from huey.contrib.djhuey import on_startup, signal
+from django.utils import timezone
+from huey.contrib.djhuey import on_shutdown, on_startup, signal
 
 from hueymonitor.constants import ENDED_HUEY_SIGNALS
 from hueymonitor.models import SignalInfoModel, TaskModel
+from hueymonitor.tqdm import flush_process_info
 
 
 logger = logging.getLogger(__name__)
@@ -45,6 +49,105 @@ def update_task_instance(instance, last_signal, task_finished):
     instance.save(update_fields=update_fields)
 
 
+class SignalBuffer:
+    """
+    Collects the huey signals of this worker process and stores them with one
+    bulk insert per flush, instead of a transaction per signal.
+
+    A flush happens when `batch_size` signals are pending, when a task ends and
+    at least every `interval` seconds from a background thread. With an
+    interval of 0 every signal is stored right away. The create_dt of a signal
+    is the time of its flush, so at most `interval` seconds late.
+    """
+
+    def __init__(self, batch_size=None, interval=None):
+        if batch_size is None:
+            batch_size = getattr(settings, 'HUEY_MONITOR_SIGNAL_BATCH_SIZE', 100)
+        if interval is None:
+            interval = getattr(settings, 'HUEY_MONITOR_SIGNAL_INTERVAL', 1)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+
+    def add(self, task_id, task_name, signal_kwargs, task_finished):
+        with self.lock:
+            self.pending.append((task_id, task_name, signal_kwargs, task_finished))
+            full = len(self.pending) >= self.batch_size
+            self.start()
+        if full or task_finished or not self.interval:
+            self.flush()
+
+    def start(self):
+        if self.interval and (self.thread is None or not self.thread.is_alive()):
+            self.thread = threading.Thread(target=self.run, name='hueymonitor-signals', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Can not store huey signals')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, []
+            if pending:
+                store_signal_batch(pending)
+
+
+def store_signal_batch(pending):
+    """
+    Store `[(task_id, task_name, signal_kwargs, task_finished)]` in order:
+    missing tasks and all signals in bulk, then each task's state once.
+    """
+    names = {}
+    for task_id, task_name, _, _ in pending:
+        names.setdefault(task_id, task_name)
+
+    with transaction.atomic():
+        tasks = TaskModel.objects.in_bulk(list(names))
+        missing = [task_id for task_id in names if task_id not in tasks]
+        if missing:
+            now = timezone.now()
+            TaskModel.objects.bulk_create(
+                [TaskModel(task_id=task_id, name=names[task_id], create_dt=now, update_dt=now) for task_id in missing],
+                ignore_conflicts=True,
+            )
+            tasks.update(TaskModel.objects.in_bulk(missing))
+
+        signals = []
+        last_signals = {}
+        finished = set()
+        for task_id, _, signal_kwargs, task_finished in pending:
+            instance = tasks[task_id]
+            signal_info = SignalInfoModel(task=instance, **signal_kwargs)
+            if instance.progress_count is not None:
+                signal_info.progress_count = instance.progress_count
+            signals.append(signal_info)
+            last_signals[task_id] = signal_info
+            if task_finished:
+                finished.add(task_id)
+        SignalInfoModel.objects.bulk_create(signals)
+
+        for task_id, last_signal in last_signals.items():
+            update_task_instance(
+                instance=tasks[task_id],
+                last_signal=last_signal,
+                task_finished=task_id in finished,
+            )
+
+
+signal_buffer = SignalBuffer()
+
+
 @signal()
 def store_signals(signal, task, exc=None):
     """
@@ -57,6 +160,10 @@ def store_signals(signal, task, exc=None):
 
     logger.info('Store Task %s signal %r (finished: %s)', task_id, signal, task_finished)
 
+    if task_finished:
+        # Progress counted in memory must be stored before the parent sums it up
+        flush_process_info(task.id)
+
     signal_kwargs = {
         # TODO: move parts into hueymonitor.models.SignalInfoManager
         'hostname': get_hostname(),
@@ -71,23 +178,12 @@ def store_signals(signal, task, exc=None):
             traceback.format_exception(*sys.exc_info())
         )
 
-    with transaction.atomic():
-        task_model_instance, created = TaskModel.objects.get_or_create(
-            task_id=task_id,
-            defaults={'name': task.name}
-        )
+    signal_buffer.add(task_id, task.name, signal_kwargs, task_finished)
 
-        signal_kwargs['task'] = task_model_instance
-        if task_model_instance.progress_count is not None:
-            signal_kwargs['progress_count'] = task_model_instance.progress_count
 
-        last_signal = SignalInfoModel.objects.create(**signal_kwargs)
-
-        update_task_instance(
-            instance=task_model_instance,
-            last_signal=last_signal,
-            task_finished=task_finished,
-        )
+@on_shutdown()
+def shutdown_handler():
+    signal_buffer.flush()
 
 
 @on_startup()
@@ -1,19 +1,42 @@
 import logging
+import threading
+import time
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from huey.api import Task
 
 from hueymonitor.constants import TASK_MODEL_DESC_MAX_LENGTH
 from hueymonitor.models import TaskModel
+from hueymonitor.progress import delete_live_progress, set_live_progress
 
 
 logger = logging.getLogger(__name__)
 
+# ProcessInfo instances of the tasks running in this worker, flushed when the task ends
+_active = {}
+_active_lock = threading.Lock()
+
+
+def flush_process_info(task_id):
+    """
+    Persist the final progress of a task that ran in this worker.
+    """
+    with _active_lock:
+        process_infos = _active.pop(str(task_id), [])
+    for process_info in process_infos:
+        process_info.flush()
+
 
 class ProcessInfo:
     """
     Simple helper inspired by tqdm ;)
+
+    update() only counts in memory. The live progress is pushed to the cache
+    at most every `live_interval` seconds and the TaskModel row is written at
+    most every `checkpoint_interval` seconds (or `checkpoint_every` units),
+    plus once when the task ends.
     """
 
     def __init__(self,
@@ -24,6 +47,9 @@ class ProcessInfo:
                  unit_divisor=1000,
                  parent_task_id=None,
                  cumulate2parents=True,  # deprecated see #57
+                 live_interval=None,
+                 checkpoint_interval=None,
+                 checkpoint_every=None,
                  ):
         """
         Parameters
@@ -38,6 +64,11 @@ class ProcessInfo:
             Note: parent_task_id must be provided to cumulate progress to the parent task progress
                   this option will be removed in the future, see:
                   https://github.com/boxine/django-huey-monitor/discussions/57
+        live_interval: float, optional: Seconds between live progress updates in the cache
+            (default: settings.HUEY_MONITOR_LIVE_INTERVAL or 1)
+        checkpoint_interval: float, optional: Seconds between progress writes to the database
+            (default: settings.HUEY_MONITOR_CHECKPOINT_INTERVAL or 30)
+        checkpoint_every: int, optional: Also write to the database every n units
         """
         assert isinstance(task, Task), f'No task given: {task!r} (Hint: use "context=True")'
         self.task = task
@@ -46,6 +77,13 @@ class ProcessInfo:
         self.unit = unit
         self.unit_divisor = unit_divisor
         self.parent_task_id = parent_task_id
+        if live_interval is None:
+            live_interval = getattr(settings, 'HUEY_MONITOR_LIVE_INTERVAL', 1)
+        if checkpoint_interval is None:
+            checkpoint_interval = getattr(settings, 'HUEY_MONITOR_CHECKPOINT_INTERVAL', 30)
+        self.live_interval = live_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_every = checkpoint_every
 
         if len(self.desc) > TASK_MODEL_DESC_MAX_LENGTH:
             # We call .update() that will not validate the data, so a overlong
@@ -56,6 +94,9 @@ class ProcessInfo:
                 params={'desc': self.desc},
             )
 
+        # The signals of this worker are stored in batches, so the "executing"
+        # signal that creates the TaskModel row may not be written yet:
+        TaskModel.objects.get_or_create(task_id=task.id, defaults={'name': task.name})
         TaskModel.objects.filter(task_id=task.id).update(
             desc=self.desc,
             total=self.total,
@@ -66,6 +107,11 @@ class ProcessInfo:
         )
 
         self.total_progress = 0
+        self.stored_progress = 0
+        self.live_at = self.stored_at = time.monotonic()
+
+        with _active_lock:
+            _active.setdefault(str(task.id), []).append(self)
 
         logger.info('Init TaskModel %s', self)
 
@@ -77,10 +123,40 @@ class ProcessInfo:
         """
         self.total_progress += n
 
+        now = time.monotonic()
+        if now - self.stored_at >= self.checkpoint_interval or (
+            self.checkpoint_every and self.total_progress - self.stored_progress >= self.checkpoint_every
+        ):
+            self.checkpoint(now)
+        elif now - self.live_at >= self.live_interval:
+            self.live_at = now
+            set_live_progress(self.task.id, self.total_progress)
+
+    def checkpoint(self, now=None):
+        """
+        Write the current progress to the TaskModel row and the cache.
+        """
+        self.live_at = self.stored_at = now or time.monotonic()
+        self.stored_progress = self.total_progress
         # Update the last change date times:
         TaskModel.objects.filter(task_id=self.task.id).update(
             update_dt=timezone.now(), progress_count=self.total_progress
         )
+        set_live_progress(self.task.id, self.total_progress)
+
+    def flush(self):
+        """
+        Write the progress that is not stored yet, called when the task ends.
+        """
+        if self.total_progress != self.stored_progress:
+            self.checkpoint()
+        delete_live_progress(self.task.id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
 
     def __str__(self):
         return (
@@ -29,6 +29,7 @@ class RecordingCursorWrapper:
         logger,
         collect_stacktrace=None,
         query_explain: bool = False,  # Capture EXPLAIN SQL information?
+        collect_details: bool = True,  # Decode params and render the executed SQL?
     ):
         self.cursor = cursor
         self.db = db
@@ -40,6 +41,7 @@ class RecordingCursorWrapper:
             self.get_stacktrace = collect_stacktrace
 
         self.query_explain = query_explain
+        self.collect_details = collect_details
 
     def __getattr__(self, attr):
         return getattr(self.cursor, attr)
@@ -105,26 +107,42 @@ class RecordingCursorWrapper:
         finally:
             stop = time.monotonic()
             duration = (stop - start) * 1000
+            self._log(sql, params, duration, explain)
 
-            try:
-                _params_decoded = json.dumps(self._decode(params), cls=DjangoJSONEncoder)
-            except TypeError:
-                _params_decoded = ''  # object not JSON serializable, we have to live with that
-
-            sql = str(sql)  # is sometimes an object, e.g. psycopg Composed, so ensure string
-            stacktrace = self.get_stacktrace()
-
+    def _log(self, sql, params, duration, explain):
+        sql = str(sql)  # is sometimes an object, e.g. psycopg Composed, so ensure string
+        rows = getattr(self.cursor, 'rowcount', -1)
+        if not self.collect_details:
+            # Cheap enough to run on sampled production traffic
             self.logger.record(
                 alias=getattr(self.db, 'alias', 'default'),
                 vendor=getattr(self.db.connection, 'vendor', 'unknown'),
                 raw_sql=sql,
-                sql=self.db.ops.last_executed_query(self.cursor, sql, self._quote_params(params)),
-                raw_params=params,
-                params=_params_decoded,
                 duration=duration,
-                stacktrace=stacktrace,
-                explain=explain,
+                rows=rows,
+                stacktrace=self.get_stacktrace(),
             )
+            return
+
+        try:
+            _params_decoded = json.dumps(self._decode(params), cls=DjangoJSONEncoder)
+        except TypeError:
+            _params_decoded = ''  # object not JSON serializable, we have to live with that
+
+        stacktrace = self.get_stacktrace()
+
+        self.logger.record(
+            alias=getattr(self.db, 'alias', 'default'),
+            vendor=getattr(self.db.connection, 'vendor', 'unknown'),
+            raw_sql=sql,
+            sql=self.db.ops.last_executed_query(self.cursor, sql, self._quote_params(params)),
+            raw_params=params,
+            params=_params_decoded,
+            duration=duration,
+            rows=rows,
+            stacktrace=stacktrace,
+            explain=explain,
+        )
 
     def callproc(self, procname, params=None):
         return self._record(self.cursor.callproc, procname, params)
@@ -0,0 +1,28 @@
+"""
+Profile the queries of a sampled share of huey tasks (DBPERF_TASK_SAMPLE_RATE).
+Imported by the hueymonitor app to register the hooks.
+"""
+import threading
+
+from huey.contrib.djhuey import post_execute, pre_execute
+
+from hueymonitorutils.dbperf.profiler import QueryProfiler, task_sampler
+
+
+_running = threading.local()
+
+
+@pre_execute()
+def start_task_profile(task):
+    if task_sampler.allow():
+        profiler = QueryProfiler(f'task {task.name}')
+        profiler.__enter__()
+        _running.profiler = profiler
+
+
+@post_execute()
+def stop_task_profile(task, task_value, exc):
+    profiler = getattr(_running, 'profiler', None)
+    if profiler is not None:
+        _running.profiler = None
+        profiler.__exit__(None, None, None)
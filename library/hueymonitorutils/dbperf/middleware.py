@@ -0,0 +1,22 @@
+from hueymonitorutils.dbperf.profiler import QueryProfiler, request_sampler
+
+
+class QueryProfilerMiddleware:
+    """
+    Profile the queries of a sampled share of requests (DBPERF_REQUEST_SAMPLE_RATE),
+    labelled with the resolved view name.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request_sampler.allow():
+            return self.get_response(request)
+
+        with QueryProfiler(f'{request.method} {request.path}') as profiler:
+            response = self.get_response(request)
+            match = getattr(request, 'resolver_match', None)
+            if match is not None:
+                profiler.label = f'{request.method} {match.view_name or match._func_path}'
+        return response
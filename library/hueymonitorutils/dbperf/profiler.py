@@ -0,0 +1,395 @@
+"""
+Sampled query profiling for production traffic, built on SQLQueryRecorder.
+
+A profiled request or huey task records every query with a fingerprint of its
+normalised SQL and the first application frame that ran it. At the end the
+per-fingerprint counts, latency histogram and rows are added to rolling
+windows in Redis, and a fingerprint repeated more than
+DBPERF_NPLUSONE_THRESHOLD times from the same frame is counted as N+1.
+
+Settings:
+    DBPERF_REQUEST_SAMPLE_RATE: share of requests profiled (default 0, off)
+    DBPERF_TASK_SAMPLE_RATE: share of huey tasks profiled (default 0, off)
+    DBPERF_MAX_PROFILES_PER_MINUTE: upper bound per process whatever the rate (default 60)
+    DBPERF_NPLUSONE_THRESHOLD: repeats from one frame reported as N+1 (default 10)
+    DBPERF_WINDOW: seconds per stats window (default 3600)
+    DBPERF_WINDOWS: windows kept in Redis (default 24)
+"""
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+from hueymonitorutils.dbperf.query_recorder import SQLQueryRecorder
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'dbperf'
+
+# Upper edges of the latency histogram buckets in milliseconds, the last one is open
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+NORMALIZE_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),  # string literals
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),  # numbers
+    (re.compile(r'%s|%\(\w+\)s|\$\d+'), '?'),  # placeholders
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(...)'),  # IN (?, ?, ...)
+    (re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+'), '(...)'),  # VALUES (...), (...)
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """
+    Returns (normalised SQL, fingerprint) where queries that only differ in
+    literals, placeholders or the length of IN/VALUES lists share the fingerprint.
+    """
+    normalized = sql
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = normalized.strip()
+    return normalized, hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def _excluded_paths():
+    import django
+
+    # Django, the vendored libraries (including this one) and installed packages
+    paths = [os.path.dirname(django.__file__), os.path.dirname(os.path.dirname(os.path.dirname(__file__)))]
+    paths.extend(path for path in sys.path if path.endswith(('site-packages', 'dist-packages')))
+    paths.append(os.path.dirname(threading.__file__))
+    return tuple(os.path.realpath(path) for path in paths)
+
+
+EXCLUDED_PATHS = None
+
+
+def caller_frame():
+    """
+    `file:line function` of the innermost frame outside Django, the standard
+    library, installed and vendored packages: the code that ran the query.
+    """
+    global EXCLUDED_PATHS
+    if EXCLUDED_PATHS is None:
+        EXCLUDED_PATHS = _excluded_paths()
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(EXCLUDED_PATHS) and not filename.startswith('<'):
+            return f'{os.path.relpath(filename)}:{frame.f_lineno} {frame.f_code.co_name}'
+        frame = frame.f_back
+    return '-'
+
+
+class Sampler:
+    """
+    Picks the profiled share `rate` of requests or tasks, but never more than
+    `per_minute` profiles per process and minute, so overhead stays bounded
+    under load.
+    """
+
+    def __init__(self, rate_setting, per_minute_setting='DBPERF_MAX_PROFILES_PER_MINUTE'):
+        self.rate_setting = rate_setting
+        self.per_minute_setting = per_minute_setting
+        self.lock = threading.Lock()
+        self.minute = None
+        self.count = 0
+
+    def allow(self):
+        rate = get_setting(self.rate_setting, 0)
+        if not rate or random.random() >= rate:
+            return False
+        minute = int(time.monotonic() // 60)
+        with self.lock:
+            if minute != self.minute:
+                self.minute = minute
+                self.count = 0
+            if self.count >= get_setting(self.per_minute_setting, 60):
+                return False
+            self.count += 1
+        return True
+
+
+request_sampler = Sampler('DBPERF_REQUEST_SAMPLE_RATE')
+task_sampler = Sampler('DBPERF_TASK_SAMPLE_RATE')
+
+
+class ProfileLogger:
+    """
+    SQLQueryRecorder logger that only keeps per-fingerprint aggregates.
+    """
+
+    def __init__(self):
+        self.queries = {}
+        self.frames = defaultdict(int)
+        self.num_queries = 0
+        self.sql_time = 0
+
+    def record(self, alias, raw_sql, duration, rows=-1, stacktrace=None, **kwargs):
+        sql, key = fingerprint(raw_sql)
+        query = self.queries.get(key)
+        if query is None:
+            query = self.queries[key] = {
+                'sql': sql,
+                'frame': stacktrace,
+                'count': 0,
+                'time': 0,
+                'rows': 0,
+                'durations': [],
+            }
+        query['count'] += 1
+        query['time'] += duration
+        query['durations'].append(duration)
+        if rows and rows > 0:
+            query['rows'] += rows
+        self.frames[key, stacktrace] += 1
+        self.num_queries += 1
+        self.sql_time += duration
+
+    def nplusone(self, threshold=None):
+        """
+        [(fingerprint, frame, count)] of fingerprints repeated more than
+        `threshold` times from the same frame.
+        """
+        if threshold is None:
+            threshold = get_setting('DBPERF_NPLUSONE_THRESHOLD', 10)
+        return [
+            (key, frame, count)
+            for (key, frame), count in self.frames.items()
+            if count > threshold
+        ]
+
+
+def bucket_index(duration):
+    for index, edge in enumerate(LATENCY_BUCKETS):
+        if duration <= edge:
+            return index
+    return len(LATENCY_BUCKETS)
+
+
+def percentile(histogram, fraction):
+    """
+    Upper bucket edge that covers `fraction` of the observations.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    needed = total * fraction
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= needed:
+            return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float(LATENCY_BUCKETS[-1])
+    return float(LATENCY_BUCKETS[-1])
+
+
+class QueryStats:
+    """
+    Rolling per-fingerprint query stats in Redis, one set of keys per window:
+
+        dbperf:<window>:q:<fingerprint>  hash of count, time, rows, b<bucket>, sql, frame, label
+        dbperf:<window>:time             sorted set fingerprint -> total milliseconds
+        dbperf:<window>:count            sorted set fingerprint -> executions
+        dbperf:<window>:nplusone         sorted set "<fingerprint> <frame>" -> profiles with N+1
+    """
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def client(self):
+        from library.djangoredis import get_redis_connection
+
+        return get_redis_connection(self.alias)
+
+    @property
+    def window_size(self):
+        return get_setting('DBPERF_WINDOW', 60 * 60)
+
+    @property
+    def windows_kept(self):
+        return get_setting('DBPERF_WINDOWS', 24)
+
+    def window(self, now=None):
+        return int((now or time.time()) // self.window_size)
+
+    def key(self, window, *parts):
+        return ':'.join((KEY_PREFIX, str(window)) + parts)
+
+    def add(self, label, profile, nplusone=()):
+        """
+        Add a finished ProfileLogger to the current window with one pipeline.
+        """
+        window = self.window()
+        timeout = self.window_size * self.windows_kept
+        pipe = self.client.pipeline(transaction=False)
+        for key, query in profile.queries.items():
+            name = self.key(window, 'q', key)
+            pipe.hincrby(name, 'count', query['count'])
+            pipe.hincrbyfloat(name, 'time', query['time'])
+            pipe.hincrby(name, 'rows', query['rows'])
+            buckets = defaultdict(int)
+            for duration in query['durations']:
+                buckets[bucket_index(duration)] += 1
+            for index, count in buckets.items():
+                pipe.hincrby(name, f'b{index}', count)
+            pipe.hsetnx(name, 'sql', query['sql'])
+            pipe.hsetnx(name, 'frame', query['frame'] or '-')
+            pipe.hsetnx(name, 'label', label)
+            pipe.expire(name, timeout)
+            pipe.zincrby(self.key(window, 'time'), query['time'], key)
+            pipe.zincrby(self.key(window, 'count'), query['count'], key)
+        for key, frame, count in nplusone:
+            pipe.zincrby(self.key(window, 'nplusone'), 1, f'{key} {frame}')
+        for name in ('time', 'count', 'nplusone'):
+            pipe.expire(self.key(window, name), timeout)
+        pipe.execute()
+
+    def _windows(self, windows):
+        current = self.window()
+        return [current - offset for offset in range(min(windows or self.windows_kept, self.windows_kept))]
+
+    def _ranking(self, name, windows):
+        pipe = self.client.pipeline(transaction=False)
+        for window in windows:
+            pipe.zrange(self.key(window, name), 0, -1, withscores=True)
+        totals = defaultdict(float)
+        for members in pipe.execute():
+            for member, score in members:
+                totals[member.decode() if isinstance(member, bytes) else member] += score
+        return totals
+
+    def top(self, limit=20, windows=None, order='time'):
+        """
+        Top fingerprints over the last `windows` windows ordered by 'time',
+        'count', 'mean' or 'p95', with count, time, rows and p50/p95/p99 latency.
+        """
+        windows = self._windows(windows)
+        ranking = self._ranking('count' if order == 'count' else 'time', windows)
+        candidates = sorted(ranking, key=ranking.get, reverse=True)
+        if order in ('time', 'count'):
+            candidates = candidates[:limit]
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in candidates:
+            for window in windows:
+                pipe.hgetall(self.key(window, 'q', key))
+        results = iter(pipe.execute())
+
+        rows = []
+        for key in candidates:
+            merged = {'count': 0, 'time': 0.0, 'rows': 0}
+            histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+            for _ in windows:
+                values = {
+                    (name.decode() if isinstance(name, bytes) else name): (value.decode() if isinstance(value, bytes) else value)
+                    for name, value in next(results).items()
+                }
+                merged['count'] += int(values.get('count', 0))
+                merged['time'] += float(values.get('time', 0))
+                merged['rows'] += int(values.get('rows', 0))
+                for index in range(len(histogram)):
+                    histogram[index] += int(values.get(f'b{index}', 0))
+                for name in ('sql', 'frame', 'label'):
+                    if name in values:
+                        merged.setdefault(name, values[name])
+            if not merged['count']:
+                continue
+            rows.append(dict(
+                fingerprint=key,
+                sql=merged.get('sql'),
+                label=merged.get('label'),
+                frame=merged.get('frame'),
+                count=merged['count'],
+                time=round(merged['time'], 3),
+                mean=round(merged['time'] / merged['count'], 3),
+                rows=merged['rows'],
+                p50=percentile(histogram, 0.50),
+                p95=percentile(histogram, 0.95),
+                p99=percentile(histogram, 0.99),
+            ))
+        if order in ('mean', 'p95'):
+            rows.sort(key=lambda row: row[order] or 0, reverse=True)
+        return rows[:limit]
+
+    def nplusone(self, limit=20, windows=None):
+        """
+        [{'fingerprint', 'frame', 'profiles'}] ordered by the number of profiles
+        in which the fingerprint repeated from that frame.
+        """
+        ranking = self._ranking('nplusone', self._windows(windows))
+        result = []
+        for member in sorted(ranking, key=ranking.get, reverse=True)[:limit]:
+            key, _, frame = member.partition(' ')
+            result.append(dict(fingerprint=key, frame=frame, profiles=int(ranking[member])))
+        return result
+
+    def clear(self):
+        client = self.client
+        keys = list(client.scan_iter(match=f'{KEY_PREFIX}:*', count=1000))
+        for start in range(0, len(keys), 1000):
+            client.delete(*keys[start:start + 1000])
+        return len(keys)
+
+
+query_stats = QueryStats()
+
+
+class QueryProfiler:
+    """
+    Profile the queries of one request or task:
+
+        with QueryProfiler('reports.views.summary') as profiler:
+            ...
+
+    `label` can still be changed before the block ends (e.g. once the URL is
+    resolved). Storing the stats never raises. A profiler started while the
+    connections are already recorded (e.g. a task run eagerly inside a profiled
+    request) does nothing.
+    """
+
+    def __init__(self, label, databases=None, stats=None):
+        self.label = label
+        self.profile = ProfileLogger()
+        self.recorder = SQLQueryRecorder(
+            databases=databases,
+            collect_stacktrace=caller_frame,
+            logger=self.profile,
+            collect_details=False,
+        )
+        self.stats = stats or query_stats
+
+    def __enter__(self):
+        self.active = not any(hasattr(connection, '_recording_cursor') for connection in self.recorder.databases)
+        if self.active:
+            self.recorder.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.active:
+            return
+        self.recorder.__exit__(exc_type, exc_val, exc_tb)
+        nplusone = self.profile.nplusone()
+        for key, frame, count in nplusone:
+            logger.warning(
+                'N+1 queries in %s: %s repeated %d times from %s',
+                self.label, self.profile.queries[key]['sql'][:200], count, frame,
+            )
+        try:
+            self.stats.add(self.label, self.profile, nplusone)
+        except Exception as e:
+            logger.warning('Can not store query stats of %s: %s', self.label, e)
@@ -115,9 +115,12 @@ class SQLQueryRecorder:
         databases: Optional[List[str]] = None,
         collect_stacktrace: Optional[Callable] = None,
         query_explain: bool = False,  # Capture EXPLAIN SQL information?
+        logger=None,  # Receives every query, must implement 'record' (default: Logger)
+        collect_details: bool = True,  # Decode params and render the executed SQL?
     ):
-        self.logger = Logger()
+        self.logger = Logger() if logger is None else logger
         self.query_explain = query_explain
+        self.collect_details = collect_details
 
         if databases:
             self.databases = [db for db in connections.all() if db.alias in databases]
@@ -135,22 +138,25 @@ class SQLQueryRecorder:
             connection._recording_cursor = connection.cursor
             connection._recording_chunked_cursor = connection.chunked_cursor
 
-            def cursor():
+            # bind the connection now, the loop variable changes before the cursors are used
+            def cursor(connection=connection):
                 return RecordingCursorWrapper(
                     connection._recording_cursor(),
                     connection,
                     self.logger,
                     collect_stacktrace=self.collect_stacktrace,
                     query_explain=self.query_explain,
+                    collect_details=self.collect_details,
                 )
 
-            def chunked_cursor():
+            def chunked_cursor(connection=connection):
                 return RecordingCursorWrapper(
                     connection._recording_chunked_cursor(),
                     connection,
                     self.logger,
                     collect_stacktrace=self.collect_stacktrace,
                     query_explain=self.query_explain,
+                    collect_details=self.collect_details,
                 )
 
             connection.cursor = cursor
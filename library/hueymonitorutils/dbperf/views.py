@@ -0,0 +1,31 @@
+from django.http import JsonResponse
+
+from hueymonitorutils.dbperf.profiler import query_stats
+
+
+ORDERS = ('time', 'count', 'mean', 'p95')
+
+
+def query_stats_view(request):
+    """
+    Staff only: top query fingerprints and N+1 patterns as JSON.
+    Query string: limit (default 20), windows (default all kept), order (time, count, mean, p95).
+    """
+    user = request.user
+    if not (user.is_authenticated and user.is_active and user.is_staff):
+        return JsonResponse({'detail': 'Staff only.'}, status=403)
+
+    try:
+        limit = int(request.GET.get('limit', 20))
+        windows = int(request.GET['windows']) if 'windows' in request.GET else None
+    except ValueError:
+        return JsonResponse({'detail': 'limit and windows must be integers.'}, status=400)
+    order = request.GET.get('order', 'time')
+    if order not in ORDERS:
+        return JsonResponse({'detail': f'order must be one of {", ".join(ORDERS)}.'}, status=400)
+
+    return JsonResponse({
+        'window': query_stats.window_size,
+        'queries': query_stats.top(limit=limit, windows=windows, order=order),
+        'nplusone': query_stats.nplusone(limit=limit, windows=windows),
+    })
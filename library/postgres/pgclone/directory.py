@@ -0,0 +1,390 @@
+"""
+Directory format dumps.
+
+The schema is dumped by pg_dump in a pre-data and a post-data archive, and
+the data of every table is streamed with COPY through a compressor straight
+to the storage location. Tables are transferred in parallel from one
+exported snapshot, timed, and skipped when a dump or a restore is resumed.
+
+A "<timestamp>.dir" dump key contains::
+
+    pre-data.dump          pg_dump -Fc --section=pre-data
+    sequences.sql          setval() of every sequence
+    data/<table>.copy.zst  COPY output of one table
+    post-data.dump         pg_dump -Fc --section=post-data
+    progress.json          state of an unfinished dump
+    manifest.json          written last, only finished dumps are listed
+"""
+import concurrent.futures
+import contextlib
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import time
+
+from django.db import connections
+
+from pgclone import db, exceptions, logging, run, storage
+
+MANIFEST = "manifest.json"
+PROGRESS = "progress.json"
+
+# Name: (file suffix, compress command, decompress command)
+COMPRESSION = {
+    "zstd": (".zst", "zstd -q -c -T0", "zstd -q -d -c"),
+    "gzip": (".gz", "gzip -c", "gzip -d -c"),
+    "none": ("", None, None),
+}
+
+# Restore progress, kept in the temp db so a load and its progress
+# row commit together
+PROGRESS_TABLE = "_pgclone_progress"
+
+# Tables with data, largest first so the slow ones start early. Same
+# filter as pg_dump: no system schemas and no tables of extensions
+TABLES_SQL = r"""
+    SELECT format('%I.%I', n.nspname, c.relname), c.oid, pg_total_relation_size(c.oid)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind = 'r'
+        AND c.relpersistence <> 't'
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        AND n.nspname NOT LIKE 'pg\_toast%'
+        AND n.nspname NOT LIKE 'pg\_temp\_%'
+        AND NOT EXISTS (
+            SELECT 1 FROM pg_depend d
+            WHERE d.classid = 'pg_class'::regclass AND d.objid = c.oid AND d.deptype = 'e'
+        )
+    ORDER BY 3 DESC, 1
+"""
+
+SEQUENCES_SQL = """
+    SELECT format(
+        'SELECT pg_catalog.setval(%L, %s, %s);',
+        format('%I.%I', schemaname, sequencename),
+        COALESCE(last_value, start_value),
+        last_value IS NOT NULL
+    )
+    FROM pg_sequences
+    ORDER BY schemaname, sequencename
+"""
+
+# The excluded tables are model db_tables, schema qualified and quoted or
+# not. Resolved to oids so they compare regardless of the spelling
+EXCLUDED_SQL = """
+    SELECT to_regclass(name)::oid FROM unnest(%s::text[]) AS name
+"""
+
+
+def _compression(name):
+    if name not in COMPRESSION:
+        raise exceptions.ValueError(
+            f'"{name}" is not a valid compression. Use one of: {", ".join(COMPRESSION)}.'
+        )
+    return COMPRESSION[name]
+
+
+def _table_file(name, compression):
+    """The data file of a table, stable across resumed runs"""
+    safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", name.replace('"', ""))[:80]
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
+    return f"data/{safe_name}-{digest}.copy{_compression(compression)[0]}"
+
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _psql(db_url, *sql):
+    """psql running each statement with -c in one session"""
+    commands = " ".join(f"-c {shlex.quote(statement)}" for statement in sql)
+    return f"psql {db_url} -X -q -v ON_ERROR_STOP=1 {commands}"
+
+
+def _read_json(storage_client, file_path):
+    data = storage_client.read(file_path)
+    return json.loads(data) if data is not None else None
+
+
+def _write_json(storage_client, file_path, value):
+    storage_client.write(file_path, json.dumps(value, indent=2).encode("utf-8"))
+
+
+@contextlib.contextmanager
+def _snapshot(*, using, exclude_tables):
+    """
+    Hold a repeatable read transaction on its own connection and export
+    its snapshot, so every pg_dump and COPY sees the same data. Yields
+    the ``(name, excluded, size)`` of every table
+    """
+    connection = connections.create_connection(using)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            cursor.execute("SELECT pg_export_snapshot()")
+            snapshot_id = cursor.fetchone()[0]
+            cursor.execute(EXCLUDED_SQL, [list(exclude_tables)])
+            excluded = {row[0] for row in cursor.fetchall()}
+            cursor.execute(TABLES_SQL)
+            tables = [(name, oid in excluded, size) for name, oid, size in cursor.fetchall()]
+            cursor.execute(SEQUENCES_SQL)
+            sequences = [row[0] for row in cursor.fetchall()]
+            yield snapshot_id, tables, sequences
+    finally:
+        connection.close()
+
+
+def _run_parallel(tasks, *, jobs, on_done):
+    """
+    Run the ``(name, fn)`` tasks in ``jobs`` threads. ``on_done`` is called
+    in this thread with the name and the seconds of every finished task.
+    After a failure the pending tasks are cancelled and the error re-raised
+    once the running ones finish
+    """
+    logger = logging.get_logger()
+
+    def timed(fn):
+        with logging.set_logger(logger):
+            started = time.monotonic()
+            fn()
+            return time.monotonic() - started
+
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        futures = {executor.submit(timed, fn): name for name, fn in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                on_done(futures[future], future.result())
+            except Exception as exc:
+                if error is None:
+                    error = exc
+                    for pending in futures:
+                        pending.cancel()
+
+    if error is not None:
+        raise error
+
+
+def _report(title, tables, timings):
+    """Log the transfer time of every table, slowest first"""
+    logger = logging.get_logger()
+    logging.success_msg(title)
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        megabytes = tables[name]["size"] / 1024 / 1024
+        rate = f"{megabytes / seconds:.1f} MB/s" if seconds else "-"
+        logger.info(f"{seconds:>10.2f}s {megabytes:>10.1f} MB {rate:>12}  {name}")
+    logger.info(f"{sum(timings.values()):>10.2f}s total for {len(timings)} table(s)")
+
+
+def dump(
+    dump_key, *, using, exclude_tables, storage_client, storage_location, jobs, compression, resume
+):
+    """
+    Dump to the "<timestamp>.dir" ``dump_key``. With ``resume`` the steps and
+    tables finished by an earlier run of the same dump key are skipped
+    """
+    root = os.path.join(storage_location, dump_key)
+    compress = _compression(compression)[1]
+    db_url = db.url(db.conf(using=using))
+
+    progress = _read_json(storage_client, os.path.join(root, PROGRESS)) if resume else None
+    if resume:
+        if progress is None:
+            raise exceptions.RuntimeError(f'Could not find an unfinished dump "{dump_key}"')
+        if storage_client.read(os.path.join(root, MANIFEST)) is not None:
+            raise exceptions.RuntimeError(f'Dump "{dump_key}" is already finished')
+        if progress["compression"] != compression:
+            raise exceptions.ValueError(
+                f'Dump "{dump_key}" uses "{progress["compression"]}" compression'
+            )
+        logging.success_msg(
+            f'Resuming dump "{dump_key}". Tables dumped by different runs'
+            " are not from the same snapshot"
+        )
+
+    progress = progress or {
+        "dump_key": dump_key,
+        "compression": compression,
+        "started": dt.datetime.utcnow().isoformat(),
+        "steps": {},
+        "tables": {},
+    }
+
+    def save():
+        _write_json(storage_client, os.path.join(root, PROGRESS), progress)
+
+    def step(name, fn):
+        if name in progress["steps"]:
+            return
+        logging.success_msg(f"Dumping {name}")
+        started = time.monotonic()
+        fn()
+        progress["steps"][name] = time.monotonic() - started
+        save()
+
+    def pg_dump(section):
+        file_path = os.path.join(root, f"{section}.dump")
+        run.shell(
+            f"pg_dump -Fc --no-acl --no-owner --section={section} --snapshot={snapshot_id}"
+            f" {db_url} {storage_client.pg_dump(file_path)}",
+            env=storage_client.env,
+        )
+
+    def copy(name):
+        file_path = os.path.join(root, progress["tables"][name]["file"])
+        cmd = _psql(
+            db_url,
+            "BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY",
+            f"SET TRANSACTION SNAPSHOT {_literal(snapshot_id)}",
+            f"COPY {name} TO STDOUT",
+            "COMMIT",
+        )
+        if compress:
+            cmd += f" | {compress}"
+        cmd += " " + storage_client.pg_dump(file_path)
+        run.shell(cmd, env=storage_client.env, pipefail=True)
+
+    def copied(name, seconds):
+        progress["tables"][name].update(status="done", seconds=seconds)
+        timings[name] = seconds
+        save()
+
+    with _snapshot(using=using, exclude_tables=exclude_tables) as (
+        snapshot_id,
+        tables,
+        sequences,
+    ):
+        for name, excluded, size in tables:
+            entry = progress["tables"].setdefault(
+                name, {"file": _table_file(name, compression), "status": "pending"}
+            )
+            entry["size"] = size
+            if entry["status"] != "done":
+                entry["status"] = "excluded" if excluded else "pending"
+
+        # Tables dropped since an earlier run
+        names = {name for name, _, _ in tables}
+        for name, entry in list(progress["tables"].items()):
+            if name not in names and entry["status"] != "done":
+                del progress["tables"][name]
+        save()
+
+        step("pre-data", lambda: pg_dump("pre-data"))
+        step(
+            "sequences",
+            lambda: storage_client.write(
+                os.path.join(root, "sequences.sql"), "\n".join(sequences).encode("utf-8")
+            ),
+        )
+
+        pending = [
+            name for name, entry in progress["tables"].items() if entry["status"] == "pending"
+        ]
+        logging.success_msg(f"Dumping {len(pending)} table(s) with {jobs} job(s)")
+        timings = {}
+        _run_parallel(
+            [(name, lambda name=name: copy(name)) for name in pending],
+            jobs=jobs,
+            on_done=copied,
+        )
+
+        step("post-data", lambda: pg_dump("post-data"))
+
+    _report("Dump time per table", progress["tables"], timings)
+
+    progress["finished"] = dt.datetime.utcnow().isoformat()
+    _write_json(storage_client, os.path.join(root, MANIFEST), progress)
+
+
+def _loaded_tables(db_url):
+    """Tables loaded by an earlier restore, or None if it did not get that far"""
+    process = subprocess.run(
+        f"psql {db_url} -X -q -A -t -c {shlex.quote(f'SELECT name FROM {PROGRESS_TABLE}')}",
+        shell=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if process.returncode:
+        return None
+    return {name for name in process.stdout.decode("utf-8").split("\n") if name}
+
+
+def restore(dump_key, *, temp_db, storage_client, storage_location, jobs, resume):
+    """
+    Restore the "<timestamp>.dir" ``dump_key`` into ``temp_db``. With
+    ``resume`` the tables loaded by an earlier run into the same temp db
+    are skipped
+    """
+    root = os.path.join(storage_location, dump_key)
+    manifest = _read_json(storage_client, os.path.join(root, MANIFEST))
+    if manifest is None:
+        raise exceptions.RuntimeError(f'Dump "{dump_key}" is not finished')
+
+    decompress = _compression(manifest["compression"])[2]
+    db_url = db.url(temp_db)
+
+    def pg_restore(section, **kwargs):
+        file_path = os.path.join(root, f"{section}.dump")
+        if jobs > 1 and isinstance(storage_client, storage.Local):
+            # pg_restore only runs jobs on a seekable archive
+            cmd = f"pg_restore --no-acl --no-owner -j {jobs} -d {db_url} {file_path}"
+        else:
+            cmd = storage_client.pg_restore(file_path)
+            cmd += f" pg_restore --no-acl --no-owner -d {db_url}"
+        run.shell(cmd, env=storage_client.env, **kwargs)
+
+    def load(name):
+        file_path = os.path.join(root, manifest["tables"][name]["file"])
+        cmd = storage_client.pg_restore(file_path)
+        if decompress:
+            cmd += f" {decompress} |"
+        cmd += " " + _psql(
+            db_url,
+            "BEGIN",
+            f"TRUNCATE {name}",
+            f"COPY {name} FROM STDIN",
+            f"INSERT INTO {PROGRESS_TABLE} (name) VALUES ({_literal(name)})",
+            "COMMIT",
+        )
+        run.shell(cmd, env=storage_client.env, pipefail=True)
+
+    loaded = _loaded_tables(db_url) if resume else None
+    if loaded is None:
+        logging.success_msg("Restoring pre-data")
+        # Same as the custom format, some errors cannot be avoided (like on Aurora)
+        pg_restore("pre-data", ignore_errors=True)
+        run.shell(_psql(db_url, f"CREATE TABLE {PROGRESS_TABLE} (name text PRIMARY KEY)"))
+        loaded = set()
+    else:
+        logging.success_msg(f"Resuming restore, {len(loaded)} table(s) already loaded")
+
+    pending = [
+        name
+        for name, entry in manifest["tables"].items()
+        if entry["status"] == "done" and name not in loaded
+    ]
+    logging.success_msg(f"Loading {len(pending)} table(s) with {jobs} job(s)")
+    timings = {}
+    _run_parallel(
+        [(name, lambda name=name: load(name)) for name in pending],
+        jobs=jobs,
+        on_done=timings.__setitem__,
+    )
+
+    logging.success_msg("Restoring sequences and post-data")
+    run.shell(
+        f"{storage_client.pg_restore(os.path.join(root, 'sequences.sql'))}"
+        f" psql {db_url} -X -q -v ON_ERROR_STOP=1",
+        env=storage_client.env,
+        pipefail=True,
+    )
+    pg_restore("post-data", ignore_errors=True)
+    run.shell(_psql(db_url, f"DROP TABLE {PROGRESS_TABLE}"))
+
+    _report("Restore time per table", manifest["tables"], timings)
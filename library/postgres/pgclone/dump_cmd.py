@@ -5,39 +5,102 @@ from typing import List, Union
 
 from django.apps import apps
 
-from pgclone import db, exceptions, logging, options, run, settings, storage
+from pgclone import db, directory, exceptions, logging, options, run, settings, storage
 
 DT_FORMAT = "%Y-%m-%d-%H-%M-%S-%f"
 
+# Format: dump key suffix
+FORMATS = {"custom": ".dump", "directory": ".dir"}
 
-def _dump_key(*, instance, database, config):
+
+def _dump_key(*, instance, database, config, dump_format="custom"):
     """Obtain the key for the db dump"""
     now = dt.datetime.utcnow().strftime(DT_FORMAT)
     instance = re.sub(r"[^a-zA-Z0-9_-]", "_", instance)
     database = re.sub(r"[^a-zA-Z0-9_-]", "_", database)
     config_name = re.sub(r"[^a-zA-Z0-9_-]", "_", config)
-    return os.path.join(instance, database, config_name, f"{now}.dump")
+    return os.path.join(instance, database, config_name, f"{now}{FORMATS[dump_format]}")
+
+
+def _exclude_tables(exclude):
+    """
+    The tables of the excluded models. An app label excludes
+    every model of the app, including many-to-many tables
+    """
+    exclude_tables = []
+    for label in exclude:
+        try:
+            if "." in label:
+                models = [apps.get_model(label)]
+            else:
+                models = apps.get_app_config(label).get_models(include_auto_created=True)
+        except LookupError as exc:
+            raise exceptions.ValueError(str(exc)) from exc
+
+        for model in models:
+            if model._meta.db_table not in exclude_tables:
+                exclude_tables.append(model._meta.db_table)
 
+    return exclude_tables
 
-def _dump(*, exclude, config, pre_dump_hooks, instance, database, storage_location):
+
+def _dump(
+    *,
+    exclude,
+    config,
+    pre_dump_hooks,
+    instance,
+    database,
+    storage_location,
+    dump_format="custom",
+    jobs=1,
+    compression="zstd",
+    resume=None,
+):
     """Dump implementation"""
     if not settings.allow_dump():  # pragma: no cover
         raise exceptions.RuntimeError("Dump not allowed.")
 
+    if dump_format not in FORMATS:
+        raise exceptions.ValueError(
+            f'"{dump_format}" is not a valid format. Use one of: {", ".join(FORMATS)}.'
+        )
+
+    if resume and not resume.endswith(FORMATS["directory"]):
+        raise exceptions.ValueError("Only directory format dumps can be resumed.")
+
     storage_client = storage.client(storage_location)
     dump_db = db.conf(using=database)
 
-    # pre-dump hooks
+    # pre-dump hooks. A resumed dump already ran them
     with db.route(dump_db):
-        for management_command_name in pre_dump_hooks:  # pragma: no cover
+        for management_command_name in [] if resume else pre_dump_hooks:  # pragma: no cover
             logging.success_msg(f'Running "manage.py {management_command_name}" pre_dump hook')
             run.management(management_command_name)
 
+    exclude_tables = _exclude_tables(exclude)
+
+    if resume or dump_format == "directory":
+        dump_key = resume or _dump_key(
+            config=config, instance=instance, database=database, dump_format=dump_format
+        )
+        directory.dump(
+            dump_key,
+            using=database,
+            exclude_tables=exclude_tables,
+            storage_client=storage_client,
+            storage_location=storage_location,
+            jobs=jobs,
+            compression=compression,
+            resume=bool(resume),
+        )
+        logging.success_msg(f'Database "{database}" successfully dumped to "{dump_key}"')
+        return dump_key
+
     # Run the pg dump command that streams to the storage location
     dump_key = _dump_key(config=config, instance=instance, database=database)
     file_path = os.path.join(storage_location, dump_key)
 
-    exclude_tables = [apps.get_model(model)._meta.db_table for model in exclude]
     exclude_args = " ".join(
         [f"--exclude-table-data={table_name}" for table_name in exclude_tables]
     )
@@ -65,16 +128,26 @@ def dump(
     database: Union[str, None] = None,
     storage_location: Union[str, None] = None,
     config: Union[str, None] = None,
+    dump_format: Union[str, None] = None,
+    jobs: Union[int, None] = None,
+    compression: Union[str, None] = None,
+    resume: Union[str, None] = None,
 ) -> str:
     """Dumps a database.
 
     Args:
-        exclude: The models to exclude when dumping the utils.
+        exclude: The models ("app_label.Model") or app labels whose data is excluded
+            when dumping the utils.
         pre_dump_hooks: A list of management command names to run before dumping the utils.
         instance: The instance name to use in the dump key.
         database: The database to dump.
         storage_location: The storage location to store dumps.
         config: The configuration name from `settings.PGCLONE_CONFIGS`.
+        dump_format: "custom" for one pg_dump archive, or "directory" to dump
+            every table in parallel to its own compressed file.
+        jobs: The number of tables dumped at the same time in the directory format.
+        compression: "zstd", "gzip" or "none", for the tables in the directory format.
+        resume: The dump key of an unfinished directory format dump to continue.
 
     Returns:
         The dump key associated with the database dump.
@@ -86,6 +159,9 @@ def dump(
         instance=instance,
         database=database,
         storage_location=storage_location,
+        dump_format=dump_format,
+        jobs=jobs,
+        compression=compression,
     )
 
     return _dump(
@@ -95,4 +171,8 @@ def dump(
         instance=opts.instance,
         database=opts.database,
         storage_location=opts.storage_location,
+        dump_format=opts.dump_format,
+        jobs=opts.jobs,
+        compression=opts.compression,
+        resume=resume,
     )
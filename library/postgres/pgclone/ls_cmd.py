@@ -2,16 +2,16 @@ import re
 import subprocess
 from typing import List, Union
 
-from pgclone import db, exceptions, options, settings, storage
+from pgclone import db, directory, exceptions, options, settings, storage
 
 
 def _is_valid_dump_key(dump_key):
     """
     True if the `dump_key` is in the valid format of
-    "database_name/timestamp.dump"
+    "database_name/timestamp.dump" or "database_name/timestamp.dir"
     """
     regexmatch = re.match(
-        r"^[\w-]+/[\w-]+/[\w-]+/\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}-\d+\.dump$",
+        r"^[\w-]+/[\w-]+/[\w-]+/\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}-\d+\.(dump|dir)$",
         dump_key,
     )
     return regexmatch if settings.validate_dump_keys() else True
@@ -20,12 +20,23 @@ def _is_valid_dump_key(dump_key):
 def _parse_dump_key(dump_key):
     regexmatch = re.match(
         r"^(?P<instance>[\w-]+)/(?P<database>[\w-]+)/(?P<config>[\w-]+)/"
-        r"\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}-\d+\.dump$",
+        r"\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}-\d+\.(dump|dir)$",
         dump_key,
     )
     return regexmatch.groupdict() if regexmatch else None
 
 
+def _dump_key(path):
+    """
+    The dump key of a stored file. Directory format dumps are listed by
+    their manifest, which is only written once the dump finished
+    """
+    if ".dir/" not in path:
+        return path
+    prefix, _, file_name = path.rpartition("/")
+    return prefix if prefix.endswith(".dir") and file_name == directory.MANIFEST else None
+
+
 def _ls(*, dump_key, instances, databases, configs, local, database, storage_location, config):
     """
     Ls implementation
@@ -45,7 +56,9 @@ def _ls(*, dump_key, instances, databases, configs, local, database, storage_loc
         return [f":{db_name.strip()}" for db_name in stdout.split("\n") if db_name.strip()]
 
     dump_keys = [
-        dump_key for dump_key in storage_client.ls(prefix=dump_key) if _is_valid_dump_key(dump_key)
+        dump_key
+        for dump_key in map(_dump_key, storage_client.ls(prefix=dump_key))
+        if dump_key and _is_valid_dump_key(dump_key)
     ]
 
     if instances or databases or configs:
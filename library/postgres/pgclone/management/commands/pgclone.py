@@ -97,7 +97,10 @@ class LsCommand(BaseSubcommand):
 class DumpCommand(BaseSubcommand):
     def add_arguments(self, parser):
         parser.add_argument(
-            "-e", "--exclude", nargs="*", help="Model(s) you wish to exclude when dumping."
+            "-e",
+            "--exclude",
+            nargs="*",
+            help="Model(s) or app label(s) whose data you wish to exclude when dumping.",
         )
         parser.add_argument(
             "--pre-dump-hook",
@@ -124,6 +127,29 @@ class DumpCommand(BaseSubcommand):
             "--config",
             help="Use this configuration to supply default option values.",
         )
+        parser.add_argument(
+            "-F",
+            "--format",
+            dest="dump_format",
+            choices=["custom", "directory"],
+            help="Dump one pg_dump archive or every table to its own file.",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Dump this many tables at the same time in the directory format.",
+        )
+        parser.add_argument(
+            "--compression",
+            choices=["zstd", "gzip", "none"],
+            help="Compress the tables of the directory format.",
+        )
+        parser.add_argument(
+            "--resume",
+            metavar="DUMP_KEY",
+            help="Continue an unfinished directory format dump.",
+        )
 
     def subhandle(self, *args, **options):
         dump_cmd.dump(
@@ -133,6 +159,10 @@ class DumpCommand(BaseSubcommand):
             database=options["database"],
             storage_location=options["storage_location"],
             config=options["config"],
+            dump_format=options["dump_format"],
+            jobs=options["jobs"],
+            compression=options["compression"],
+            resume=options["resume"],
         )
 
 
@@ -171,6 +201,17 @@ class RestoreCommand(BaseSubcommand):
             "--config",
             help="Use this configuration to supply default option values.",
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of pg_restore jobs, or of tables loaded at the same time.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted restore of a directory format dump.",
+        )
 
     def subhandle(self, *args, **options):
         restore_cmd.restore(
@@ -180,6 +221,8 @@ class RestoreCommand(BaseSubcommand):
             database=options["database"],
             storage_location=options["storage_location"],
             config=options["config"],
+            jobs=options["jobs"],
+            resume=options["resume"],
         )
 
 
@@ -20,6 +20,9 @@ class _Options:
         instance=None,
         database=None,
         storage_location=None,
+        dump_format=None,
+        jobs=None,
+        compression=None,
     ):
         """Parse options for pgclone commands
 
@@ -72,6 +75,13 @@ class _Options:
         self.exclude = (
             _first_non_none(exclude, config_opts.get("exclude"), settings.exclude()) or []
         )
+        self.dump_format = (
+            dump_format or config_opts.get("dump_format") or settings.dump_format()
+        )
+        self.jobs = jobs or config_opts.get("jobs") or settings.jobs()
+        self.compression = (
+            compression or config_opts.get("compression") or settings.compression()
+        )
         self.config = config
 
 
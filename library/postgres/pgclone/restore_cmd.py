@@ -3,7 +3,7 @@ from typing import List, Union
 
 from django.db import connections
 
-from pgclone import db, exceptions, logging, ls_cmd, options, run, settings, storage
+from pgclone import db, directory, exceptions, logging, ls_cmd, options, run, settings, storage
 
 
 def _db_exists(database, *, using):
@@ -65,13 +65,13 @@ def _local_restore(dump_key, *, temp_db, post_db, pre_db, using):
     return dump_key
 
 
-def _remote_restore(dump_key, *, temp_db, using, storage_location):
+def _remote_restore(dump_key, *, temp_db, using, storage_location, jobs=1, resume=False):
     storage_client = storage.client(storage_location)
 
     # We are restoring from a remote dump. If the dump key is not valid,
     # assume it is the latest dump of a database name and get the latest
     # dump key
-    if not dump_key.endswith(".dump"):
+    if not dump_key.endswith((".dump", ".dir")):
         dump_keys = ls_cmd.ls(dump_key=dump_key, storage_location=storage_location)
         found_dump_key = dump_keys[0] if dump_keys else None
 
@@ -83,16 +83,37 @@ def _remote_restore(dump_key, *, temp_db, using, storage_location):
         dump_key = found_dump_key
 
     file_path = os.path.join(storage_location, dump_key)
+    is_directory = dump_key.endswith(".dir")
 
-    logging.success_msg("Creating the temporary restore db")
-    db.drop(temp_db, using=using)
-    create_temp_sql = f'CREATE DATABASE "{temp_db["NAME"]}"'
-    db.psql(create_temp_sql, using=using)
-    _set_search_path(temp_db, using=using)
+    if is_directory and resume and _db_exists(temp_db, using=using):
+        logging.success_msg("Resuming the restore in the temporary restore db")
+    else:
+        logging.success_msg("Creating the temporary restore db")
+        db.drop(temp_db, using=using)
+        create_temp_sql = f'CREATE DATABASE "{temp_db["NAME"]}"'
+        db.psql(create_temp_sql, using=using)
+        _set_search_path(temp_db, using=using)
+
+    if is_directory:
+        directory.restore(
+            dump_key,
+            temp_db=temp_db,
+            storage_client=storage_client,
+            storage_location=storage_location,
+            jobs=jobs,
+            resume=resume,
+        )
+        return dump_key
 
     logging.success_msg(f'Running pg_restore on "{dump_key}"')
-    pg_restore_cmd = f"pg_restore --verbose --no-acl --no-owner -d {db.url(temp_db)}"
-    pg_restore_cmd = storage_client.pg_restore(file_path) + " " + pg_restore_cmd
+    if jobs > 1 and isinstance(storage_client, storage.Local):
+        # pg_restore can only run jobs on a seekable archive, not on a pipe
+        pg_restore_cmd = (
+            f"pg_restore --verbose --no-acl --no-owner -j {jobs} -d {db.url(temp_db)} {file_path}"
+        )
+    else:
+        pg_restore_cmd = f"pg_restore --verbose --no-acl --no-owner -d {db.url(temp_db)}"
+        pg_restore_cmd = storage_client.pg_restore(file_path) + " " + pg_restore_cmd
 
     # When restoring, we need to ignore errors because there are certain
     # errors we cannot get around when pg restoring some DBs (like Aurora).
@@ -103,7 +124,17 @@ def _remote_restore(dump_key, *, temp_db, using, storage_location):
     return dump_key
 
 
-def _restore(*, dump_key, pre_swap_hooks, config, reversible, database, storage_location):
+def _restore(
+    *,
+    dump_key,
+    pre_swap_hooks,
+    config,
+    reversible,
+    database,
+    storage_location,
+    jobs=1,
+    resume=False,
+):
     """
     Restore implementation
     """
@@ -150,7 +181,12 @@ def _restore(*, dump_key, pre_swap_hooks, config, reversible, database, storage_
         )
     else:
         dump_key = _remote_restore(
-            dump_key, temp_db=temp_db, using=database, storage_location=storage_location
+            dump_key,
+            temp_db=temp_db,
+            using=database,
+            storage_location=storage_location,
+            jobs=jobs,
+            resume=resume,
         )
 
     # When in reversible mode, make a special __post db snapshot.
@@ -208,6 +244,8 @@ def restore(
     database: Union[str, None] = None,
     storage_location: Union[str, None] = None,
     config: Union[str, None] = None,
+    jobs: Union[int, None] = None,
+    resume: bool = False,
 ) -> str:
     """
     Restores a database dump.
@@ -220,6 +258,10 @@ def restore(
         database: The database to restore.
         storage_location: The storage location to use for the restore.
         config: The configuration name from `settings.PGCLONE_CONFIGS`.
+        jobs: The number of pg_restore jobs, or of tables loaded at the same
+            time from a directory format dump.
+        resume: Continue an interrupted restore of a directory format dump,
+            skipping the tables already loaded in the temporary restore database.
 
     Returns:
         The dump key that was restored.
@@ -231,6 +273,7 @@ def restore(
         reversible=reversible,
         database=database,
         storage_location=storage_location,
+        jobs=jobs,
     )
 
     return _restore(
@@ -240,4 +283,6 @@ def restore(
         reversible=opts.reversible,
         database=opts.database,
         storage_location=opts.storage_location,
+        jobs=opts.jobs,
+        resume=resume,
     )
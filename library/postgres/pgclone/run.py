@@ -8,16 +8,20 @@ from django.core.management import call_command
 from pgclone import exceptions, logging
 
 
-def shell(cmd, ignore_errors=False, env=None):
+def shell(cmd, ignore_errors=False, env=None, pipefail=False):
     """
     Utility for running a command. Ensures that an error
-    is raised if it fails.
+    is raised if it fails. With ``pipefail``, the command fails when
+    any part of a pipeline fails, not only the last one.
     """
     env = env or {}
     logger = logging.get_logger()
+    if pipefail:
+        cmd = f"set -o pipefail; {cmd}"
     process = subprocess.Popen(
         cmd,
         shell=True,
+        executable="/bin/bash" if pipefail else None,
         stderr=subprocess.STDOUT,
         stdout=subprocess.PIPE,
         env=dict(os.environ, **{k: v for k, v in env.items() if v is not None}),
@@ -74,6 +74,18 @@ def exclude():
     return getattr(settings, "PGCLONE_EXCLUDE", [])
 
 
+def dump_format():
+    return getattr(settings, "PGCLONE_FORMAT", "custom")
+
+
+def jobs():
+    return getattr(settings, "PGCLONE_JOBS", 1)
+
+
+def compression():
+    return getattr(settings, "PGCLONE_COMPRESSION", "zstd")
+
+
 @functools.lru_cache()
 def conn_db():
     conn_db = getattr(settings, "PGCLONE_CONN_DB", None)
@@ -42,6 +42,14 @@ class Storage:
         """Given a file path, generates the CLI fragment to prepend to pg_restore"""
         pass
 
+    def read(self, file_path):
+        """Returns the contents of a small file, or None if it does not exist"""
+        pass
+
+    def write(self, file_path, data):
+        """Writes the bytes of a small file"""
+        pass
+
 
 class S3(Storage):
     def __init__(self, *args, **kwargs):
@@ -77,6 +85,26 @@ class S3(Storage):
     def pg_restore(self, file_path):
         return f"aws s3 cp {file_path} -{self.s3_endpoint_url} |"
 
+    def read(self, file_path):  # pragma: no cover
+        process = subprocess.run(
+            f"aws s3 cp {file_path} -{self.s3_endpoint_url}",
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(os.environ, **self.env),
+        )
+        return process.stdout if process.returncode == 0 else None
+
+    def write(self, file_path, data):  # pragma: no cover
+        subprocess.run(
+            f"aws s3 cp - {file_path}{self.s3_endpoint_url}",
+            shell=True,
+            input=data,
+            stdout=subprocess.PIPE,
+            check=True,
+            env=dict(os.environ, **self.env),
+        )
+
 
 class Local(Storage):
     def ls(self, prefix=None):
@@ -99,6 +127,18 @@ class Local(Storage):
     def pg_restore(self, file_path):
         return f"cat {file_path} |"
 
+    def read(self, file_path):
+        path = pathlib.Path(file_path)
+        return path.read_bytes() if path.exists() else None
+
+    def write(self, file_path, data):
+        path = pathlib.Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Rename so a reader never sees a partially written file
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
 
 def client(storage_location):
     if storage_location.startswith("s3://"):  # pragma: no cover
@@ -5,6 +5,8 @@ from django.contrib.auth.models import User
 from django.core.management import call_command
 from django.db import connection
 
+from pgclone import directory
+
 
 @pytest.fixture(autouse=True)
 def patch_gethostname(mocker):
@@ -187,3 +189,81 @@ def test_reversible_dump_ls_restore(tmpdir, capsys, settings):
     call_command("pgclone", "restore", ":post")
     connection.connect()
     assert User.objects.count() == 1
+
+
+@freezegun.freeze_time("2020-07-01")
+@pytest.mark.parametrize("compression", ["zstd", "gzip", "none"])
+@pytest.mark.django_db(transaction=True)
+def test_directory_dump_ls_restore(tmpdir, capsys, settings, compression):
+    """
+    Tests a parallel directory format dump and restore, resuming
+    both, and excluding the data of an app
+    """
+    settings.PGCLONE_STORAGE_LOCATION = tmpdir.strpath
+    dump_key = "dev/default/none/2020-07-01-00-00-00-000000.dir"
+
+    ddf.G("auth.User")
+    call_command(
+        "pgclone", "dump", "--format", "directory", "--jobs", "2", "--compression", compression
+    )
+
+    # Only finished directory dumps are listed
+    call_command("pgclone", "ls")
+    assert capsys.readouterr().out == f"{dump_key}\n"
+
+    capsys.readouterr()
+    with pytest.raises(SystemExit):
+        call_command("pgclone", "dump", "--resume", dump_key)
+    assert capsys.readouterr().err.startswith(f'Dump "{dump_key}" is already finished')
+
+    # An interrupted dump lists nothing until it is resumed
+    tmpdir.join(dump_key, "manifest.json").remove()
+    call_command("pgclone", "ls")
+    assert capsys.readouterr().out == ""
+    call_command("pgclone", "dump", "--resume", dump_key, "--compression", compression)
+    call_command("pgclone", "ls")
+    assert capsys.readouterr().out == f"{dump_key}\n"
+
+    ddf.G("auth.User")
+    assert User.objects.count() == 2
+
+    call_command("pgclone", "restore", "dev/default/none/", "--jobs", "2")
+    connection.connect()
+    assert User.objects.count() == 1
+
+    # A user created after the restore gets the next id
+    ddf.G("auth.User")
+    assert User.objects.count() == 2
+
+    # Resuming without an interrupted restore starts a new one
+    call_command("pgclone", "restore", dump_key, "--resume")
+    connection.connect()
+    assert User.objects.count() == 1
+
+    # Dump and restore while ignoring the data of the auth app
+    with freezegun.freeze_time("2020-07-02"):
+        call_command(
+            "pgclone", "dump", "-F", "directory", "--exclude", "auth", "--compression", compression
+        )
+        assert User.objects.count() == 1
+
+        call_command("pgclone", "restore", "dev/default/none/")
+        connection.connect()
+        assert not User.objects.exists()
+
+    capsys.readouterr()
+    with pytest.raises(SystemExit):
+        call_command("pgclone", "dump", "--exclude", "not_an_app")
+    assert "not_an_app" in capsys.readouterr().err
+
+
+@pytest.mark.django_db(transaction=True)
+def test_directory_snapshot_excluded_tables():
+    """
+    Excluded tables match schema qualified and quoted names, as used by the
+    db_table of models in a schema, and unqualified ones
+    """
+    exclude_tables = ['"public"."auth_user"', "auth_group", '"public"."not_a_table"']
+    with directory._snapshot(using="default", exclude_tables=exclude_tables) as (_, tables, _):
+        excluded = {name for name, is_excluded, _ in tables if is_excluded}
+    assert excluded == {"public.auth_user", "public.auth_group"}
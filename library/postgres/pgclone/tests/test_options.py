@@ -14,6 +14,9 @@ def test_defaults():
     assert opts.pre_dump_hooks == []
     assert opts.pre_swap_hooks == ["migrate"]
     assert opts.exclude == []
+    assert opts.dump_format == "custom"
+    assert opts.jobs == 1
+    assert opts.compression == "zstd"
     assert opts.config == "none"
 
 
@@ -29,6 +32,9 @@ def test_config_overrides(settings):
             "pre_dump_hooks": ["pre_dump_hooks"],
             "pre_swap_hooks": ["pre_swap_hooks"],
             "exclude": ["exclude"],
+            "dump_format": "directory",
+            "jobs": 4,
+            "compression": "gzip",
         }
     }
 
@@ -41,6 +47,9 @@ def test_config_overrides(settings):
     assert opts.pre_dump_hooks == ["pre_dump_hooks"]
     assert opts.pre_swap_hooks == ["pre_swap_hooks"]
     assert opts.exclude == ["exclude"]
+    assert opts.dump_format == "directory"
+    assert opts.jobs == 4
+    assert opts.compression == "gzip"
     assert opts.config == "config"
 
 
@@ -56,6 +65,9 @@ def test_direct_options(settings):
             "pre_dump_hooks": ["pre_dump_hooks"],
             "pre_swap_hooks": ["pre_swap_hooks"],
             "exclude": ["exclude"],
+            "dump_format": "directory",
+            "jobs": 4,
+            "compression": "gzip",
         }
     }
 
@@ -69,6 +81,9 @@ def test_direct_options(settings):
         pre_dump_hooks=["pre_dump_hooks2"],
         pre_swap_hooks=["pre_swap_hooks2"],
         exclude=["exclude2"],
+        dump_format="custom",
+        jobs=8,
+        compression="none",
     )
     assert opts.dump_key == "dump_key2"
     assert opts.instance == "instance2"
@@ -78,4 +93,7 @@ def test_direct_options(settings):
     assert opts.pre_dump_hooks == ["pre_dump_hooks2"]
     assert opts.pre_swap_hooks == ["pre_swap_hooks2"]
     assert opts.exclude == ["exclude2"]
+    assert opts.dump_format == "custom"
+    assert opts.jobs == 8
+    assert opts.compression == "none"
     assert opts.config == "none"
@@ -49,3 +49,14 @@ def test_s3_pg_restore_with_endpoint_url(settings):
         storage.S3("bucket").pg_restore("file_path")
         == "aws s3 cp file_path - --endpoint-url https://endpoint.example.com |"
     )
+
+
+def test_local_read_write(tmpdir):
+    file_path = tmpdir.join("dump.dir", "manifest.json").strpath
+    local = storage.Local(tmpdir.strpath)
+
+    assert local.read(file_path) is None
+
+    local.write(file_path, b"{}")
+    assert local.read(file_path) == b"{}"
+    assert local.ls() == ["dump.dir/manifest.json"]
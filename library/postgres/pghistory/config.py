@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
 
 from django.apps import apps
 from django.conf import settings
-from django.db import models
+from django.db import connection, models
 from django.utils.module_loading import import_string
 
 from pghistory import constants
@@ -51,6 +51,29 @@ def middleware_methods() -> Tuple[str]:
     )
 
 
+def context_injection() -> str:
+    """How [pghistory.context][] adds the context to SQL statements.
+
+    `"statement"` prepends it to every statement. `"transaction"` prepends it
+    to the first statement of a transaction and again only after the
+    metadata changed or a savepoint holding it was left. Statements outside
+    of a transaction get it every time in both modes.
+
+    Defaults to `"transaction"` when the database uses `ATOMIC_REQUESTS`,
+    where a whole request then shares one injection, and to `"statement"`
+    otherwise.
+
+    Returns:
+        The injection mode
+    """
+    mode = getattr(settings, "PGHISTORY_CONTEXT_INJECTION", None)
+    if mode is None:
+        mode = "transaction" if connection.settings_dict.get("ATOMIC_REQUESTS") else "statement"
+
+    assert mode in ("statement", "transaction")
+    return mode
+
+
 def json_encoder() -> "DjangoJSONEncoder":
     """The JSON encoder when tracking context
 
@@ -67,6 +67,52 @@ def _can_inject_variable(cursor, sql):
     )
 
 
+def _is_transaction_idle(cursor):
+    """
+    True if no transaction is open, the next statement starts a new one
+    """
+    if utils.psycopg_maj_version == 2:
+        return (
+            cursor.connection.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+    elif utils.psycopg_maj_version == 3:
+        return cursor.connection.info.transaction_status == psycopg.pq.TransactionStatus.IDLE
+    else:
+        raise AssertionError
+
+
+def _is_context_injected(cursor, connection):
+    """
+    True if the context variables are still set in the current transaction.
+
+    They are set locally to the transaction, so they are gone once it ends,
+    and rolling back a savepoint that was open when they were set resets
+    them too. Leaving such a savepoint is treated the same way.
+    """
+    injected = _tracker.injected
+    if injected is None or _is_transaction_idle(cursor):
+        return False
+
+    return tuple(connection.savepoint_ids[: len(injected)]) == injected
+
+
+def _serialized_metadata():
+    """
+    Metadata is stored as a serialized JSON string with escaped
+    single quotes, serialized again only after it changed
+    """
+    if _tracker.serialized is None:
+        _tracker.serialized = json.dumps(_tracker.value.metadata, cls=config.json_encoder())
+
+    return _tracker.serialized
+
+
+def _mark_dirty():
+    _tracker.serialized = None
+    _tracker.injected = None
+
+
 def _execute_wrapper(execute_result):
     if utils.psycopg_maj_version == 3:
         while execute_result.nextset():
@@ -75,18 +121,23 @@ def _execute_wrapper(execute_result):
 
 
 def _inject_history_context(execute, sql, params, many, context):
-    if _can_inject_variable(context["cursor"], sql):
-        # Metadata is stored as a serialized JSON string with escaped
-        # single quotes
-        serialized_metadata = json.dumps(_tracker.value.metadata, cls=config.json_encoder())
+    per_transaction = _tracker.mode == "transaction"
+    if per_transaction and _is_context_injected(context["cursor"], context["connection"]):
+        return _execute_wrapper(execute(sql, params, many, context))
+
+    if not _can_inject_variable(context["cursor"], sql):
+        return _execute_wrapper(execute(sql, params, many, context))
 
-        sql = (
-            "SELECT set_config('pghistory.context_id', %s, true), "
-            "set_config('pghistory.context_metadata', %s, true); "
-        ) + sql
-        params = [str(_tracker.value.id), serialized_metadata, *(params or ())]
+    sql = (
+        "SELECT set_config('pghistory.context_id', %s, true), "
+        "set_config('pghistory.context_metadata', %s, true); "
+    ) + sql
+    params = [str(_tracker.value.id), _serialized_metadata(), *(params or ())]
+    result = _execute_wrapper(execute(sql, params, many, context))
+    if per_transaction:
+        _tracker.injected = tuple(context["connection"].savepoint_ids)
 
-    return _execute_wrapper(execute(sql, params, many, context))
+    return result
 
 
 class context(contextlib.ContextDecorator):
@@ -97,7 +148,9 @@ class context(contextlib.ContextDecorator):
     Context is added as variables at the beginning of every SQL statement.
     By default, all variables are localized to the transaction (i.e
     SET LOCAL), meaning they will only persist for the statement/transaction
-    and not across the session.
+    and not across the session. With `PGHISTORY_CONTEXT_INJECTION` set to
+    `"transaction"` they are added once per transaction instead, see
+    [pghistory.config.context_injection][].
 
     Once any code has entered [pghistory.context][], all subsequent
     entrances of [pghistory.context][] will be grouped under the same
@@ -142,16 +195,20 @@ class context(contextlib.ContextDecorator):
 
         if hasattr(_tracker, "value"):
             _tracker.value.metadata.update(**self.metadata)
+            _mark_dirty()
 
     def __enter__(self):
         if not hasattr(_tracker, "value"):
             self._pre_execute_hook = connection.execute_wrapper(_inject_history_context)
             self._pre_execute_hook.__enter__()
             _tracker.value = Context(id=uuid.uuid4(), metadata=self.metadata)
+            _tracker.mode = config.context_injection()
+            _mark_dirty()
 
         return _tracker.value
 
     def __exit__(self, *exc):
         if self._pre_execute_hook:
             delattr(_tracker, "value")
+            _mark_dirty()
             self._pre_execute_hook.__exit__(*exc)
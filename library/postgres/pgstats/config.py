@@ -0,0 +1,21 @@
+"""Core way to access configuration"""
+
+from django.conf import settings
+
+
+def schemas():
+    """
+    Schemas included in snapshots. `None` (the default) means every schema
+    except the system ones.
+    """
+    return getattr(settings, "PGSTATS_SCHEMAS", None)
+
+
+def statements_limit():
+    """The number of pg_stat_statements entries, by total time, kept per snapshot"""
+    return getattr(settings, "PGSTATS_STATEMENTS_LIMIT", 1000)
+
+
+def query_length():
+    """Characters of statement text kept per pg_stat_statements entry"""
+    return getattr(settings, "PGSTATS_QUERY_LENGTH", 2000)
@@ -0,0 +1,195 @@
+"""Comparing two pgstats snapshots"""
+
+import collections
+import functools
+
+from pgstats import models
+
+
+def _delta(before, after):
+    """
+    Change of a cumulative counter. A counter that went down was reset
+    (pg_stat_reset or a restart) in between, its current value is the change.
+    """
+    if before is None or after < before:
+        return after
+
+    return after - before
+
+
+def _changes(model, before, after, key):
+    """
+    Rows of the later snapshot with the counters of `model` replaced by the
+    change since the earlier one.
+    """
+    earlier = {key(row): row for row in model.objects.filter(snapshot=before).values()}
+    rows = []
+    for row in model.objects.filter(snapshot=after).values():
+        previous = earlier.get(key(row), {})
+        for counter in model.COUNTERS:
+            row[counter] = _delta(previous.get(counter), row[counter])
+        row["is_new"] = not previous
+        rows.append(row)
+
+    return rows
+
+
+class SnapshotDiff:
+    """
+    Changes between two [pgstats.models.Snapshot][] objects.
+
+    Counters (scans, tuples, blocks, calls, time) are the change between the
+    snapshots, sizes and live/dead tuples are the values of the later one.
+    """
+
+    def __init__(self, before, after):
+        if before.created_at > after.created_at:
+            before, after = after, before
+
+        self.before = before
+        self.after = after
+
+    @functools.cached_property
+    def tables(self):
+        return _changes(
+            models.SnapshotTable,
+            self.before,
+            self.after,
+            lambda row: (row["schemaname"], row["relname"]),
+        )
+
+    @functools.cached_property
+    def indexes(self):
+        return _changes(
+            models.SnapshotIndex,
+            self.before,
+            self.after,
+            lambda row: (row["schemaname"], row["relname"], row["indexrelname"]),
+        )
+
+    @functools.cached_property
+    def statements(self):
+        return _changes(
+            models.SnapshotStatement, self.before, self.after, lambda row: row["queryid"]
+        )
+
+    def seq_scan_heavy_tables(self, min_rows=1000, min_ratio=0.5, limit=20):
+        """
+        Tables of at least `min_rows` rows where sequential scans were at
+        least `min_ratio` of the scans, by rows read sequentially.
+        """
+        result = []
+        for row in self.tables:
+            scans = row["seq_scan"] + row["idx_scan"]
+            if not row["seq_scan"] or row["n_live_tup"] < min_rows:
+                continue
+            ratio = row["seq_scan"] / scans
+            if ratio >= min_ratio:
+                result.append({**row, "seq_scan_ratio": ratio})
+
+        result.sort(key=lambda row: row["seq_tup_read"], reverse=True)
+        return result[:limit]
+
+    def unused_indexes(self, limit=None):
+        """
+        Indexes not scanned between the snapshots, by size. Primary keys and
+        unique indexes are left out, they enforce a constraint.
+        """
+        result = [
+            row
+            for row in self.indexes
+            if not row["idx_scan"] and not row["is_unique"] and not row["is_primary"]
+        ]
+        result.sort(key=lambda row: row["size"], reverse=True)
+        return result[:limit]
+
+    def duplicate_indexes(self):
+        """
+        Pairs of `(redundant, covering)` indexes of the later snapshot.
+
+        An index is redundant when another index of the same table and
+        method has the same predicate and expressions, and its keys (column
+        and operator class) start with the same keys. A unique index only
+        counts as redundant when the other one is unique with the same keys.
+        """
+        by_table = collections.defaultdict(list)
+        for row in self.indexes:
+            keys = tuple(zip(row["key_columns"].split(), row["key_opclasses"].split()))
+            by_table[(row["schemaname"], row["relname"])].append((keys, row))
+
+        result = []
+        for indexes in by_table.values():
+            for keys, index in indexes:
+                for other_keys, other in indexes:
+                    if other is index or not self._covers(keys, index, other_keys, other):
+                        continue
+                    if keys == other_keys and self._rank(other) > self._rank(index):
+                        # Exact duplicates are reported once, keeping the primary
+                        # key, a unique index or else the first name
+                        continue
+                    result.append((index, other))
+                    break
+
+        return result
+
+    @staticmethod
+    def _rank(index):
+        return (not index["is_primary"], not index["is_unique"], index["indexrelname"])
+
+    @staticmethod
+    def _covers(keys, index, other_keys, other):
+        if (
+            index["access_method"] != other["access_method"]
+            or index["expressions"] != other["expressions"]
+            or index["predicate"] != other["predicate"]
+            or other_keys[: len(keys)] != keys
+        ):
+            return False
+        if keys != other_keys and index["access_method"] != "btree":
+            # Only btree indexes can use a prefix of their keys
+            return False
+        if index["is_unique"] or index["is_primary"]:
+            return keys == other_keys and (other["is_unique"] or other["is_primary"])
+
+        return True
+
+    def bloat(self, min_dead=1000, limit=20):
+        """
+        Estimated bloat of the tables in the later snapshot, from the share
+        of dead tuples: `dead / (live + dead)` of the table size.
+        """
+        result = []
+        for row in self.tables:
+            dead, live = row["n_dead_tup"], row["n_live_tup"]
+            if dead < min_dead:
+                continue
+            ratio = dead / (live + dead)
+            result.append({**row, "dead_ratio": ratio, "bloat_size": int(row["table_size"] * ratio)})
+
+        result.sort(key=lambda row: row["bloat_size"], reverse=True)
+        return result[:limit]
+
+    def top_statements(self, order_by="total_time", limit=20):
+        """
+        Statements by the change of `order_by` (`total_time`, `calls`,
+        `rows`, `shared_blks_read`...), with the mean time per call.
+        """
+        result = [
+            {**row, "mean_time": row["total_time"] / row["calls"] if row["calls"] else 0}
+            for row in self.statements
+            if row["calls"]
+        ]
+        result.sort(key=lambda row: row[order_by], reverse=True)
+        return result[:limit]
+
+    def report(self, limit=20):
+        """All of the checks, as a dict"""
+        return {
+            "before": self.before.pk,
+            "after": self.after.pk,
+            "seq_scan_heavy_tables": self.seq_scan_heavy_tables(limit=limit),
+            "unused_indexes": self.unused_indexes(limit=limit),
+            "duplicate_indexes": self.duplicate_indexes(),
+            "bloat": self.bloat(limit=limit),
+            "top_statements": self.top_statements(limit=limit),
+        }
@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.template.defaultfilters import filesizeformat
+
+import pgstats.models
+
+
+def _table(row):
+    return f'{row["schemaname"]}.{row["relname"]}'
+
+
+class Command(BaseCommand):
+    help = "Compare two pgstats snapshots, by default the two latest ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("before", nargs="?", type=int, help="Id of the earlier snapshot")
+        parser.add_argument("after", nargs="?", type=int, help="Id of the later snapshot")
+        parser.add_argument("-l", "--limit", type=int, default=20, help="Rows per section")
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Smallest table reported for sequential scans",
+        )
+        parser.add_argument(
+            "--order-by",
+            default="total_time",
+            choices=["total_time", "calls", "rows", "shared_blks_read", "temp_blks_written"],
+            help="Order of the top statements",
+        )
+
+    def section(self, title, rows):
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        if not rows:
+            self.stdout.write("  -")
+        for row in rows:
+            self.stdout.write(f"  {row}")
+
+    def handle(self, *args, **options):
+        snapshots = pgstats.models.Snapshot.objects
+        try:
+            diff = snapshots.diff(
+                before=snapshots.get(pk=options["before"]) if options["before"] else None,
+                after=snapshots.get(pk=options["after"]) if options["after"] else None,
+            )
+        except pgstats.models.Snapshot.DoesNotExist:
+            raise CommandError("Two snapshots are needed, run snapshot_pgstats first")
+
+        limit = options["limit"]
+        elapsed = diff.after.created_at - diff.before.created_at
+        self.stdout.write(f"{diff.before} -> {diff.after} ({elapsed})")
+
+        self.section(
+            "Sequential scan heavy tables",
+            [
+                f'{_table(row)}: {row["seq_scan"]} seq scans ({row["seq_scan_ratio"]:.0%}), '
+                f'{row["seq_tup_read"]} rows read, {row["n_live_tup"]} rows'
+                for row in diff.seq_scan_heavy_tables(min_rows=options["min_rows"], limit=limit)
+            ],
+        )
+        self.section(
+            "Unused indexes",
+            [
+                f'{row["schemaname"]}.{row["indexrelname"]} on {row["relname"]}: '
+                f'{filesizeformat(row["size"])}'
+                for row in diff.unused_indexes(limit=limit)
+            ],
+        )
+        self.section(
+            "Duplicate indexes",
+            [
+                f'{index["schemaname"]}.{index["indexrelname"]} is covered by '
+                f'{other["indexrelname"]} on {index["relname"]}: {filesizeformat(index["size"])}'
+                for index, other in diff.duplicate_indexes()
+            ],
+        )
+        self.section(
+            "Estimated bloat",
+            [
+                f'{_table(row)}: {filesizeformat(row["bloat_size"])} of '
+                f'{filesizeformat(row["table_size"])}, {row["n_dead_tup"]} dead rows ({row["dead_ratio"]:.0%})'
+                for row in diff.bloat(limit=limit)
+            ],
+        )
+        if not diff.after.has_statements:
+            self.section("Top statements (pg_stat_statements is not available)", [])
+            return
+
+        self.section(
+            f'Top statements by {options["order_by"]}',
+            [
+                f'{row["total_time"]:.0f} ms, {row["calls"]} calls, {row["mean_time"]:.2f} ms/call, '
+                f'{row["rows"]} rows: {" ".join(row["query"].split())[:120]}'
+                for row in diff.top_statements(order_by=options["order_by"], limit=limit)
+            ],
+        )
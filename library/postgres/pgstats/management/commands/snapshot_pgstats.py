@@ -4,8 +4,22 @@ import pgstats.models
 
 
 class Command(BaseCommand):
-    help = "Snapshot postgres table and index stats"
+    help = "Snapshot postgres table, index and statement stats"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Also store the JSON IndexStats and TableStats snapshots",
+        )
 
     def handle(self, *args, **options):
-        pgstats.models.IndexStats.objects.create_snapshot()
-        pgstats.models.TableStats.objects.create_snapshot()
+        snapshot = pgstats.models.Snapshot.objects.create_snapshot()
+        if options["json"]:
+            pgstats.models.IndexStats.objects.create_snapshot()
+            pgstats.models.TableStats.objects.create_snapshot()
+
+        self.stdout.write(
+            f"{snapshot}: {snapshot.tables.count()} tables, {snapshot.indexes.count()} indexes, "
+            f"{snapshot.statements.count()} statements in {', '.join(snapshot.schemas) or 'no schemas'}"
+        )
@@ -0,0 +1,145 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import pgstats.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pgstats", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Snapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("schemas", pgstats.models.JSONField(default=list)),
+                ("has_statements", models.BooleanField(default=False)),
+            ],
+            options={
+                "get_latest_by": "created_at",
+            },
+        ),
+        migrations.CreateModel(
+            name="SnapshotTable",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("schemaname", models.CharField(max_length=64)),
+                ("relname", models.CharField(max_length=64)),
+                ("seq_scan", models.BigIntegerField()),
+                ("seq_tup_read", models.BigIntegerField()),
+                ("idx_scan", models.BigIntegerField()),
+                ("idx_tup_fetch", models.BigIntegerField()),
+                ("n_tup_ins", models.BigIntegerField()),
+                ("n_tup_upd", models.BigIntegerField()),
+                ("n_tup_del", models.BigIntegerField()),
+                ("n_tup_hot_upd", models.BigIntegerField()),
+                ("n_live_tup", models.BigIntegerField()),
+                ("n_dead_tup", models.BigIntegerField()),
+                ("vacuum_count", models.BigIntegerField()),
+                ("autovacuum_count", models.BigIntegerField()),
+                ("analyze_count", models.BigIntegerField()),
+                ("autoanalyze_count", models.BigIntegerField()),
+                ("heap_blks_read", models.BigIntegerField()),
+                ("heap_blks_hit", models.BigIntegerField()),
+                ("idx_blks_read", models.BigIntegerField()),
+                ("idx_blks_hit", models.BigIntegerField()),
+                ("table_size", models.BigIntegerField()),
+                ("indexes_size", models.BigIntegerField()),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tables",
+                        to="pgstats.snapshot",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SnapshotIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("schemaname", models.CharField(max_length=64)),
+                ("relname", models.CharField(max_length=64)),
+                ("indexrelname", models.CharField(max_length=64)),
+                ("idx_scan", models.BigIntegerField()),
+                ("idx_tup_read", models.BigIntegerField()),
+                ("idx_tup_fetch", models.BigIntegerField()),
+                ("idx_blks_read", models.BigIntegerField()),
+                ("idx_blks_hit", models.BigIntegerField()),
+                ("size", models.BigIntegerField()),
+                ("is_unique", models.BooleanField()),
+                ("is_primary", models.BooleanField()),
+                ("access_method", models.CharField(max_length=64)),
+                ("key_columns", models.TextField()),
+                ("key_opclasses", models.TextField()),
+                ("expressions", models.TextField(blank=True)),
+                ("predicate", models.TextField(blank=True)),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="indexes",
+                        to="pgstats.snapshot",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SnapshotStatement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("queryid", models.BigIntegerField()),
+                ("query", models.TextField()),
+                ("calls", models.BigIntegerField()),
+                ("total_time", models.FloatField(help_text="Milliseconds")),
+                ("rows", models.BigIntegerField()),
+                ("shared_blks_hit", models.BigIntegerField()),
+                ("shared_blks_read", models.BigIntegerField()),
+                ("temp_blks_written", models.BigIntegerField()),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statements",
+                        to="pgstats.snapshot",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,6 +1,8 @@
 import django
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import connection, models
+from django.db import DatabaseError, connection, models, transaction
+
+from pgstats import config
 
 # Django>=3.1 changes the location of JSONField
 if django.VERSION >= (3, 1):
@@ -22,13 +24,30 @@ def dict_fetchall(cursor):
     return [dict(zip((col[0] for col in desc), row)) for row in cursor.fetchall()]
 
 
+def schema_filter(column="schemaname"):
+    """
+    SQL condition and params selecting the schemas of settings.PGSTATS_SCHEMAS,
+    or every schema except the system ones.
+    """
+    schemas = config.schemas()
+    if schemas:
+        return f"{column} = ANY(%s)", [list(schemas)]
+
+    return (
+        f"{column} NOT IN ('pg_catalog', 'information_schema')"
+        f" AND {column} NOT LIKE 'pg\\_toast%%' AND {column} NOT LIKE 'pg\\_temp\\_%%'",
+        [],
+    )
+
+
 class IndexStatsManager(models.Manager):
     def create_snapshot(self):
         return self.create(stats=self.get_stats())
 
     def get_stats(self):
+        condition, params = schema_filter()
         cursor = connection.cursor()
-        cursor.execute("select * from pg_stat_all_indexes where schemaname='public'")
+        cursor.execute(f"select * from pg_stat_all_indexes where {condition}", params)
         rows = dict_fetchall(cursor)
         return {f'{row["schemaname"]}.{row["relname"]}.{row["indexrelname"]}': row for row in rows}
 
@@ -47,8 +66,9 @@ class TableStatsManager(models.Manager):
         return self.create(stats=self.get_stats())
 
     def get_stats(self):
+        condition, params = schema_filter()
         cursor = connection.cursor()
-        cursor.execute("select * from pg_stat_all_tables where schemaname='public'")
+        cursor.execute(f"select * from pg_stat_all_tables where {condition}", params)
         rows = dict_fetchall(cursor)
         return {f'{row["schemaname"]}.{row["relname"]}': row for row in rows}
 
@@ -60,3 +80,234 @@ class TableStats(models.Model):
     stats = JSONField(encoder=DjangoJSONEncoder)
 
     objects = TableStatsManager()
+
+
+TABLES_SQL = """
+    SELECT s.schemaname, s.relname,
+        s.seq_scan, s.seq_tup_read,
+        coalesce(s.idx_scan, 0) AS idx_scan, coalesce(s.idx_tup_fetch, 0) AS idx_tup_fetch,
+        s.n_tup_ins, s.n_tup_upd, s.n_tup_del, s.n_tup_hot_upd,
+        s.n_live_tup, s.n_dead_tup,
+        s.vacuum_count, s.autovacuum_count, s.analyze_count, s.autoanalyze_count,
+        coalesce(io.heap_blks_read, 0) AS heap_blks_read,
+        coalesce(io.heap_blks_hit, 0) AS heap_blks_hit,
+        coalesce(io.idx_blks_read, 0) AS idx_blks_read,
+        coalesce(io.idx_blks_hit, 0) AS idx_blks_hit,
+        pg_table_size(s.relid) AS table_size,
+        pg_indexes_size(s.relid) AS indexes_size
+    FROM pg_stat_all_tables s
+    JOIN pg_statio_all_tables io ON io.relid = s.relid
+    WHERE {condition}
+"""
+
+INDEXES_SQL = """
+    SELECT s.schemaname, s.relname, s.indexrelname,
+        s.idx_scan, s.idx_tup_read, s.idx_tup_fetch,
+        coalesce(io.idx_blks_read, 0) AS idx_blks_read,
+        coalesce(io.idx_blks_hit, 0) AS idx_blks_hit,
+        pg_relation_size(s.indexrelid) AS size,
+        i.indisunique AS is_unique, i.indisprimary AS is_primary,
+        am.amname AS access_method,
+        i.indkey::text AS key_columns, i.indclass::text AS key_opclasses,
+        coalesce(pg_get_expr(i.indexprs, i.indrelid), '') AS expressions,
+        coalesce(pg_get_expr(i.indpred, i.indrelid), '') AS predicate
+    FROM pg_stat_all_indexes s
+    JOIN pg_statio_all_indexes io ON io.indexrelid = s.indexrelid
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    JOIN pg_class c ON c.oid = s.indexrelid
+    JOIN pg_am am ON am.oid = c.relam
+    WHERE {condition}
+"""
+
+STATEMENTS_SQL = """
+    SELECT queryid, min(left(query, %s)) AS query,
+        sum(calls) AS calls, sum({total_time}) AS total_time, sum(rows) AS rows,
+        sum(shared_blks_hit) AS shared_blks_hit, sum(shared_blks_read) AS shared_blks_read,
+        sum(temp_blks_written) AS temp_blks_written
+    FROM pg_stat_statements
+    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+        AND queryid IS NOT NULL
+    GROUP BY queryid
+    ORDER BY sum({total_time}) DESC
+    LIMIT %s
+"""
+
+
+class SnapshotManager(models.Manager):
+    def create_snapshot(self):
+        """
+        Snapshot table, index and, when the extension is available,
+        pg_stat_statements stats of the configured schemas.
+        """
+        condition, params = schema_filter("s.schemaname")
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(TABLES_SQL.format(condition=condition), params)
+            tables = dict_fetchall(cursor)
+            cursor.execute(INDEXES_SQL.format(condition=condition), params)
+            indexes = dict_fetchall(cursor)
+            statements = self.get_statements(cursor)
+
+            snapshot = self.create(
+                schemas=sorted({row["schemaname"] for row in tables}),
+                has_statements=statements is not None,
+            )
+            SnapshotTable.objects.bulk_create(
+                [SnapshotTable(snapshot=snapshot, **row) for row in tables], batch_size=1000
+            )
+            SnapshotIndex.objects.bulk_create(
+                [SnapshotIndex(snapshot=snapshot, **row) for row in indexes], batch_size=1000
+            )
+            SnapshotStatement.objects.bulk_create(
+                [SnapshotStatement(snapshot=snapshot, **row) for row in statements or []],
+                batch_size=1000,
+            )
+
+        return snapshot
+
+    def get_statements(self, cursor):
+        """
+        The top pg_stat_statements entries of the database, or `None` when
+        the extension isn't installed or loaded.
+        """
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        if cursor.fetchone() is None:
+            return None
+
+        total_time = "total_exec_time" if connection.pg_version >= 130000 else "total_time"
+        try:
+            # Not loaded through shared_preload_libraries raises an error
+            with transaction.atomic():
+                cursor.execute(
+                    STATEMENTS_SQL.format(total_time=total_time),
+                    [config.query_length(), config.statements_limit()],
+                )
+                return dict_fetchall(cursor)
+        except DatabaseError:
+            return None
+
+    def diff(self, before=None, after=None):
+        """
+        Changes between two snapshots, by default the two latest ones.
+        """
+        from pgstats.diff import SnapshotDiff
+
+        if after is None:
+            after = self.latest()
+        if before is None:
+            before = self.filter(created_at__lt=after.created_at).latest()
+
+        return SnapshotDiff(before, after)
+
+
+class Snapshot(models.Model):
+    """
+    A snapshot of postgres table, index and statement stats, stored one row
+    per object so that two snapshots can be compared
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    schemas = JSONField(default=list)
+    has_statements = models.BooleanField(default=False)
+
+    objects = SnapshotManager()
+
+    class Meta:
+        get_latest_by = "created_at"
+
+    def __str__(self):
+        return f"Snapshot {self.pk} at {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+
+class SnapshotTable(models.Model):
+    """Stats of one table in a snapshot"""
+
+    # Cumulative counters, compared between snapshots
+    COUNTERS = (
+        "seq_scan",
+        "seq_tup_read",
+        "idx_scan",
+        "idx_tup_fetch",
+        "n_tup_ins",
+        "n_tup_upd",
+        "n_tup_del",
+        "n_tup_hot_upd",
+        "vacuum_count",
+        "autovacuum_count",
+        "analyze_count",
+        "autoanalyze_count",
+        "heap_blks_read",
+        "heap_blks_hit",
+        "idx_blks_read",
+        "idx_blks_hit",
+    )
+
+    snapshot = models.ForeignKey(Snapshot, on_delete=models.CASCADE, related_name="tables")
+    schemaname = models.CharField(max_length=64)
+    relname = models.CharField(max_length=64)
+    seq_scan = models.BigIntegerField()
+    seq_tup_read = models.BigIntegerField()
+    idx_scan = models.BigIntegerField()
+    idx_tup_fetch = models.BigIntegerField()
+    n_tup_ins = models.BigIntegerField()
+    n_tup_upd = models.BigIntegerField()
+    n_tup_del = models.BigIntegerField()
+    n_tup_hot_upd = models.BigIntegerField()
+    n_live_tup = models.BigIntegerField()
+    n_dead_tup = models.BigIntegerField()
+    vacuum_count = models.BigIntegerField()
+    autovacuum_count = models.BigIntegerField()
+    analyze_count = models.BigIntegerField()
+    autoanalyze_count = models.BigIntegerField()
+    heap_blks_read = models.BigIntegerField()
+    heap_blks_hit = models.BigIntegerField()
+    idx_blks_read = models.BigIntegerField()
+    idx_blks_hit = models.BigIntegerField()
+    table_size = models.BigIntegerField()
+    indexes_size = models.BigIntegerField()
+
+
+class SnapshotIndex(models.Model):
+    """Stats and definition keys of one index in a snapshot"""
+
+    COUNTERS = ("idx_scan", "idx_tup_read", "idx_tup_fetch", "idx_blks_read", "idx_blks_hit")
+
+    snapshot = models.ForeignKey(Snapshot, on_delete=models.CASCADE, related_name="indexes")
+    schemaname = models.CharField(max_length=64)
+    relname = models.CharField(max_length=64)
+    indexrelname = models.CharField(max_length=64)
+    idx_scan = models.BigIntegerField()
+    idx_tup_read = models.BigIntegerField()
+    idx_tup_fetch = models.BigIntegerField()
+    idx_blks_read = models.BigIntegerField()
+    idx_blks_hit = models.BigIntegerField()
+    size = models.BigIntegerField()
+    is_unique = models.BooleanField()
+    is_primary = models.BooleanField()
+    access_method = models.CharField(max_length=64)
+    key_columns = models.TextField()
+    key_opclasses = models.TextField()
+    expressions = models.TextField(blank=True)
+    predicate = models.TextField(blank=True)
+
+
+class SnapshotStatement(models.Model):
+    """A pg_stat_statements entry in a snapshot, summed over users"""
+
+    COUNTERS = (
+        "calls",
+        "total_time",
+        "rows",
+        "shared_blks_hit",
+        "shared_blks_read",
+        "temp_blks_written",
+    )
+
+    snapshot = models.ForeignKey(Snapshot, on_delete=models.CASCADE, related_name="statements")
+    queryid = models.BigIntegerField()
+    query = models.TextField()
+    calls = models.BigIntegerField()
+    total_time = models.FloatField(help_text="Milliseconds")
+    rows = models.BigIntegerField()
+    shared_blks_hit = models.BigIntegerField()
+    shared_blks_read = models.BigIntegerField()
+    temp_blks_written = models.BigIntegerField()
@@ -5,6 +5,11 @@ PRIVATE_STORAGE_ROOT = getattr(settings, 'PRIVATE_STORAGE_ROOT', None)
 PRIVATE_STORAGE_SERVER = getattr(settings, 'PRIVATE_STORAGE_SERVER', 'django')
 PRIVATE_STORAGE_AUTH_FUNCTION = getattr(settings, 'PRIVATE_STORAGE_AUTH_FUNCTION', 'privatestorage.permissions.allow_superuser')
 
+# For the 'range' server
+PRIVATE_STORAGE_BLOCK_SIZE = getattr(settings, 'PRIVATE_STORAGE_BLOCK_SIZE', 64 * 1024)
+PRIVATE_STORAGE_MAX_RANGES = getattr(settings, 'PRIVATE_STORAGE_MAX_RANGES', 16)
+PRIVATE_STORAGE_SENDFILE = getattr(settings, 'PRIVATE_STORAGE_SENDFILE', True)
+
 # For Nginx X-Accel-Redirect
 PRIVATE_STORAGE_INTERNAL_URL = getattr(settings, 'PRIVATE_STORAGE_INTERNAL_URL', '/private-x-accel-redirect/')
 PRIVATE_STORAGE_NGINX_VERSION = getattr(settings, 'PRIVATE_STORAGE_NGINX_VERSION', None)
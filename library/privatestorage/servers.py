@@ -1,7 +1,10 @@
 """
 Sending files efficiently for different kind of webservers.
 """
+import io
 import os
+import re
+import secrets
 import sys
 import time
 from functools import lru_cache, wraps
@@ -9,12 +12,16 @@ from urllib.parse import quote
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.utils import version
-from django.utils.http import http_date
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
 from django.utils.module_loading import import_string
 from django.views.static import serve, was_modified_since
 
+from . import appconfig
+
+RANGE_SPEC_RE = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$', re.ASCII)
+
 
 @lru_cache(maxsize=128)  # for backward compatibility
 def get_server_class(path):
@@ -28,9 +35,11 @@ def get_server_class(path):
         return ApacheXSendfileServer
     elif path == 'nginx':
         return NginxXAccelRedirectServer
+    elif path == 'range':
+        return RangeServer
     else:
         raise ImproperlyConfigured(
-            "PRIVATE_STORAGE_SERVER setting should be 'nginx', 'apache', 'django' or a python class path."
+            "PRIVATE_STORAGE_SERVER setting should be 'nginx', 'apache', 'django', 'range' or a python class path."
         )
 
 
@@ -179,3 +188,248 @@ class NginxXAccelRedirectServer:
         response['X-Accel-Redirect'] = internal_url
         response['Content-Type'] = private_file.content_type
         return response
+
+
+def file_etag(size, mtime):
+    """
+    Strong ETag from the file size and modification time (microseconds).
+    """
+    return f'"{size:x}-{int(mtime * 1000000):x}"'
+
+
+def etag_matches(header, etag, weak=False):
+    """
+    Compare an ``If-None-Match``/``If-Range`` header value with our ETag.
+    ``If-None-Match`` uses the weak comparison, ``If-Range`` the strong one.
+    """
+    for candidate in parse_etags(header):
+        if candidate == '*' or candidate == etag:
+            return True
+        if weak and candidate.startswith('W/') and candidate[2:] == etag:
+            return True
+    return False
+
+
+def parse_range_header(header, size, max_ranges=None):
+    """
+    Parse ``Range: bytes=...`` into sorted, merged ``(start, end)`` byte
+    positions (inclusive). Returns ``None`` when the header must be ignored
+    (other unit, bad syntax, too many ranges) and ``[]`` when no range can
+    be satisfied.
+    """
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    specs = [spec for spec in specs.split(',') if spec.strip()]
+    if not specs or (max_ranges and len(specs) > max_ranges):
+        return None
+
+    ranges = []
+    for spec in specs:
+        match = RANGE_SPEC_RE.match(spec)
+        if match is None:
+            return None
+        first, last = match.groups()
+        if not first:
+            if not last:
+                return None
+            # Suffix range, the last n bytes
+            suffix = int(last)
+            if suffix and size:
+                ranges.append((max(size - suffix, 0), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class RangeFile:
+    """
+    Read-only view on ``length`` bytes of a file, starting at ``start``.
+
+    The file is positioned at ``start`` so a ``wsgi.file_wrapper`` that uses
+    ``sendfile()`` (gunicorn) sends from the right offset, limited by the
+    ``Content-Length`` header. Without a file wrapper Django reads it in
+    ``block_size`` chunks.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        if not appconfig.PRIVATE_STORAGE_SENDFILE:
+            raise io.UnsupportedOperation('fileno')
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+class RangeServer:
+    """
+    Serve files with ``Range``/``If-Range`` support (``206`` and
+    ``multipart/byteranges``), strong ETags and ``If-None-Match``.
+
+    Files on the local filesystem are passed to ``wsgi.file_wrapper`` as
+    :class:`RangeFile`, so the WSGI server can send them zero-copy with
+    ``sendfile()``. Set ``PRIVATE_STORAGE_SENDFILE = False`` for WSGI servers
+    that do not honour the file position and ``Content-Length``.
+
+    Other storages are streamed in ``PRIVATE_STORAGE_BLOCK_SIZE`` chunks,
+    with ranged reads when the storage has an ``iter_range()`` method
+    (see :mod:`privatestorage.storage.s3boto3` and :mod:`privatestorage.storage.minio`).
+    """
+
+    @classmethod
+    @add_no_cache_headers
+    def serve(cls, private_file):
+        request = private_file.request
+        mtime = private_file.modified_time.timestamp()
+        size = private_file.size
+        etag = file_etag(size, mtime)
+
+        # If-None-Match takes precedence over If-Modified-Since
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            was_modified = not etag_matches(if_none_match, etag, weak=True)
+        elif version.get_main_version() >= '4.1':
+            was_modified = was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime)
+        else:
+            was_modified = was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), mtime, size)
+
+        if not was_modified:
+            response = HttpResponseNotModified()
+        elif request.method == 'HEAD':
+            # Avoid reading the file at all
+            response = HttpResponse(content_type=private_file.content_type)
+            response['Content-Length'] = size
+        else:
+            ranges = None
+            if 'HTTP_RANGE' in request.META and cls.if_range_passes(request, etag, mtime):
+                ranges = parse_range_header(
+                    request.META['HTTP_RANGE'], size, appconfig.PRIVATE_STORAGE_MAX_RANGES
+                )
+
+            if ranges is None:
+                response = cls.file_response(private_file, 0, size)
+            elif not ranges:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+            elif len(ranges) == 1:
+                start, end = ranges[0]
+                response = cls.file_response(private_file, start, end - start + 1, status=206)
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            else:
+                response = cls.multipart_response(private_file, ranges, size)
+
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(mtime)
+        return response
+
+    @staticmethod
+    def if_range_passes(request, etag, mtime):
+        """
+        ``If-Range`` holds an ETag or a date; when it no longer matches the
+        whole file is sent instead of the requested ranges.
+        """
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            return etag_matches(if_range, etag) and not if_range.startswith('W/')
+        return parse_http_date_safe(if_range) == int(mtime)
+
+    @staticmethod
+    def is_local(private_file):
+        try:
+            private_file.full_path
+        except NotImplementedError:
+            return False
+        return True
+
+    @staticmethod
+    def stream_range(private_file, start, length):
+        """
+        Yield ``length`` bytes from ``start`` in ``PRIVATE_STORAGE_BLOCK_SIZE`` chunks.
+        """
+        block_size = appconfig.PRIVATE_STORAGE_BLOCK_SIZE
+        iter_range = getattr(private_file.storage, 'iter_range', None)
+        if iter_range is not None:
+            yield from iter_range(private_file.relative_name, start, length, block_size)
+            return
+
+        with private_file.open() as file:
+            file.seek(start)
+            while length > 0:
+                data = file.read(min(block_size, length))
+                if not data:
+                    break
+                length -= len(data)
+                yield data
+
+    @classmethod
+    def file_response(cls, private_file, start, length, status=200):
+        if cls.is_local(private_file):
+            response = FileResponse(
+                RangeFile(private_file.open(), start, length),
+                status=status,
+                content_type=private_file.content_type,
+            )
+            response.block_size = appconfig.PRIVATE_STORAGE_BLOCK_SIZE
+        else:
+            response = StreamingHttpResponse(
+                cls.stream_range(private_file, start, length),
+                status=status,
+                content_type=private_file.content_type,
+            )
+        response['Content-Length'] = length
+        return response
+
+    @classmethod
+    def multipart_response(cls, private_file, ranges, size):
+        boundary = secrets.token_hex(16)
+        parts = [
+            (
+                f'\r\n--{boundary}\r\n'
+                f'Content-Type: {private_file.content_type}\r\n'
+                f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n'.encode(),
+                start,
+                end - start + 1,
+            )
+            for start, end in ranges
+        ]
+        closing = f'\r\n--{boundary}--\r\n'.encode()
+
+        def content():
+            for header, start, length in parts:
+                yield header
+                yield from cls.stream_range(private_file, start, length)
+            yield closing
+
+        response = StreamingHttpResponse(
+            content(), status=206, content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+        response['Content-Length'] = sum(len(header) + length for header, _, length in parts) + len(closing)
+        return response
@@ -95,3 +95,16 @@ class PrivateMinioStorage(MinioStorage):
         if appconfig.PRIVATE_STORAGE_MINO_REVERSE_PROXY:
             return reverse('serve_private_file', kwargs={'path': name})
         return super().url(name, *args, **kwargs)
+
+    def iter_range(self, name, start, length, block_size):
+        """
+        Stream ``length`` bytes from ``start`` with a ranged GET, in ``block_size`` chunks.
+        """
+        if length <= 0:
+            return
+        response = self.client.get_object(self.bucket_name, name, offset=start, length=length)
+        try:
+            yield from response.stream(block_size)
+        finally:
+            response.close()
+            response.release_conn()
@@ -5,7 +5,7 @@ except ImportError:
 
 from django.utils.deconstruct import deconstructible
 from storages.backends.s3boto3 import S3Boto3Storage
-from storages.utils import setting
+from storages.utils import clean_name, setting
 
 from .. import appconfig
 
@@ -63,6 +63,20 @@ class PrivateS3BotoStorage(S3Boto3Storage):
             # The S3Boto3Storage can generate a presigned URL that is temporary available.
             return super().url(name, *args, **kwargs)
 
+    def iter_range(self, name, start, length, block_size):
+        """
+        Stream ``length`` bytes from ``start`` with a ranged GET, in ``block_size`` chunks,
+        instead of downloading the whole object first.
+        """
+        if length <= 0:
+            return
+        name = self._normalize_name(clean_name(name))
+        body = self.bucket.Object(name).get(Range=f'bytes={start}-{start + length - 1}')['Body']
+        try:
+            yield from body.iter_chunks(block_size)
+        finally:
+            body.close()
+
 
 @deconstructible
 class PrivateEncryptedS3BotoStorage(PrivateS3BotoStorage):
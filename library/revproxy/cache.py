@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+"""HTTP cache for :class:`revproxy.views.ProxyView`.
+
+Cacheable upstream responses (``Cache-Control``, ``Expires``, heuristic
+freshness from ``Last-Modified``) are stored in Redis or on local disk, both
+bounded by size with LRU eviction. Stale entries are revalidated upstream with
+``If-None-Match``/``If-Modified-Since``, concurrent misses for the same URL
+wait for the one request that is already fetching it.
+
+Cached responses are replayed as ``urllib3`` responses, so the view handles
+them exactly like a live upstream response.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache as stats_cache
+from django.utils.http import parse_etags, parse_http_date_safe
+from urllib3.response import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+
+from .utils import should_stream
+
+logger = logging.getLogger('revproxy.cache')
+
+#: Status codes that may be stored (RFC 9110, section 15.1)
+CACHEABLE_STATUS = (200, 203, 204, 300, 301, 308, 404, 410)
+
+#: Headers of a 304 that must not replace the stored ones
+NOT_UPDATED_HEADERS = ('content-length', 'content-encoding', 'transfer-encoding', 'content-range')
+
+#: Request headers answered by the cache itself, never forwarded on cached paths
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since', 'If-Match', 'If-Unmodified-Since', 'If-Range')
+
+#: Heuristic freshness (10% of the Last-Modified age) is capped at one day
+HEURISTIC_MAX_AGE = 24 * 60 * 60
+
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 10  # detik menunggu request lain yang sedang mengambil dari upstream
+LOCK_POLL = 0.05
+
+EVENTS = ('hit', 'miss', 'revalidated', 'coalesced', 'bypass', 'stored', 'evicted')
+
+
+def get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def parse_cache_control(value):
+    """Parse a ``Cache-Control`` header into ``{directive: argument or True}``"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') if argument else True
+    return directives
+
+
+def parse_seconds(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers, now):
+    """Seconds a response stays fresh in a shared cache after it was received"""
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+    for directive in ('s-maxage', 'max-age'):
+        seconds = parse_seconds(directives.get(directive))
+        if seconds is not None:
+            return seconds
+
+    date = parse_http_date_safe(headers.get('Date') or '') or now
+    if headers.get('Expires') is not None:
+        expires = parse_http_date_safe(headers['Expires'])
+        return max(expires - date, 0) if expires is not None else 0
+
+    last_modified = parse_http_date_safe(headers.get('Last-Modified') or '')
+    if last_modified is not None and date > last_modified:
+        return min(int((date - last_modified) * 0.1), HEURISTIC_MAX_AGE)
+    return 0
+
+
+def request_is_cacheable(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if 'HTTP_RANGE' in request.META:
+        return False
+    return 'no-store' not in parse_cache_control(request.META.get('HTTP_CACHE_CONTROL'))
+
+
+def response_is_cacheable(request, proxy_response):
+    if request.method != 'GET' or proxy_response.status not in CACHEABLE_STATUS:
+        return False
+    headers = proxy_response.headers
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-store' in directives or 'private' in directives:
+        return False
+    if headers.get('Set-Cookie') is not None or headers.get('Vary', '').strip() == '*':
+        return False
+    if 'HTTP_AUTHORIZATION' in request.META and not (
+        'public' in directives or 's-maxage' in directives or 'must-revalidate' in directives
+    ):
+        return False
+    return bool(
+        freshness_lifetime(headers, time.time())
+        or headers.get('ETag') or headers.get('Last-Modified')
+    )
+
+
+def vary_values(request, vary_header):
+    """Request header values the stored response varies on.
+
+    Accept-Encoding is never sent upstream (see ``utils.IGNORE_HEADERS``),
+    so it does not split the cache.
+    """
+    values = {}
+    for name in (vary_header or '').split(','):
+        name = name.strip().lower()
+        if name and name != 'accept-encoding':
+            values[name] = request.headers.get(name, '')
+    return values
+
+
+class CacheEntry(object):
+    """A stored upstream response: status, headers and freshness metadata"""
+
+    def __init__(self, status, headers, stored, expires, age=0, vary=None):
+        self.status = status
+        self.headers = HTTPHeaderDict(headers)
+        self.stored = stored
+        self.expires = expires
+        self.age = age
+        self.vary = vary or {}
+
+    @classmethod
+    def from_response(cls, request, proxy_response):
+        now = time.time()
+        headers = proxy_response.headers
+        age = parse_seconds(headers.get('Age')) or 0
+        return cls(
+            status=proxy_response.status,
+            headers=list(headers.items()),
+            stored=now,
+            expires=now + freshness_lifetime(headers, now) - age,
+            age=age,
+            vary=vary_values(request, headers.get('Vary')),
+        )
+
+    @classmethod
+    def loads(cls, data):
+        return cls(**json.loads(data))
+
+    def dumps(self):
+        return json.dumps({
+            'status': self.status,
+            'headers': list(self.headers.items()),
+            'stored': self.stored,
+            'expires': self.expires,
+            'age': self.age,
+            'vary': self.vary,
+        })
+
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self):
+        return self.headers.get('Last-Modified')
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires
+
+    def matches(self, request):
+        return all(request.headers.get(name, '') == value for name, value in self.vary.items())
+
+    def revalidated(self, proxy_response):
+        """Merge the headers of a 304 and restart the freshness lifetime"""
+        for header, value in proxy_response.headers.items():
+            if header.lower() not in NOT_UPDATED_HEADERS:
+                self.headers[header] = value
+        now = time.time()
+        self.age = parse_seconds(proxy_response.headers.get('Age')) or 0
+        self.stored = now
+        self.expires = now + freshness_lifetime(self.headers, now) - self.age
+
+    def not_modified_for(self, request):
+        """Whether the client's own validators still match this entry"""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            if not self.etag:
+                return False
+            etag = self.etag[2:] if self.etag.startswith('W/') else self.etag
+            return any(
+                candidate == '*' or (candidate[2:] if candidate.startswith('W/') else candidate) == etag
+                for candidate in parse_etags(if_none_match)
+            )
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE') or '')
+        last_modified = parse_http_date_safe(self.last_modified or '')
+        return if_modified_since is not None and last_modified is not None and last_modified <= if_modified_since
+
+    def replay(self, request, body):
+        """Build an ``urllib3`` response from this entry and its body stream"""
+        headers = HTTPHeaderDict(self.headers)
+        headers['Age'] = str(int(max(time.time() - self.stored, 0) + self.age))
+        status = self.status
+        if self.status == 200 and self.not_modified_for(request):
+            status = 304
+            headers.discard('Content-Length')
+            body.close()
+            body = io.BytesIO()
+        elif request.method == 'HEAD':
+            body.close()
+            body = io.BytesIO()
+        return HTTPResponse(
+            body=body,
+            headers=headers,
+            status=status,
+            preload_content=False,
+            decode_content=False,
+        )
+
+
+class RedisCacheBackend(object):
+    """Entries in Redis hashes, evicted by a sorted set of access times.
+
+    ``<prefix>:<key>`` holds ``meta`` and ``body``, ``<prefix>:lru`` the last
+    access time per key, ``<prefix>:sizes`` the stored size per key and
+    ``<prefix>:bytes`` the total. Storing and evicting happen in one script.
+    """
+
+    SET_SCRIPT = '''
+        local old = tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or '0')
+        local size = string.len(ARGV[2]) + string.len(ARGV[3])
+        redis.call('HSET', KEYS[1], 'meta', ARGV[2], 'body', ARGV[3])
+        redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+        redis.call('HSET', KEYS[3], ARGV[1], size)
+        local total = redis.call('INCRBY', KEYS[4], size - old)
+        local evicted = 0
+        while total > tonumber(ARGV[5]) do
+            local oldest = redis.call('ZPOPMIN', KEYS[2])
+            if #oldest == 0 then break end
+            local freed = tonumber(redis.call('HGET', KEYS[3], oldest[1]) or '0')
+            redis.call('HDEL', KEYS[3], oldest[1])
+            redis.call('DEL', ARGV[6] .. oldest[1])
+            total = redis.call('INCRBY', KEYS[4], -freed)
+            evicted = evicted + 1
+        end
+        return evicted
+    '''
+
+    def __init__(self, max_size, prefix='revproxy:cache', alias=None):
+        self.max_size = max_size
+        self.prefix = prefix
+        self.alias = alias or get_setting('REVPROXY_CACHE_REDIS_ALIAS', 'default')
+        self._set_script = None
+
+    @property
+    def client(self):
+        from library.djangoredis import get_redis_connection
+
+        return get_redis_connection(self.alias)
+
+    def entry_key(self, key):
+        return '%s:%s' % (self.prefix, key)
+
+    def get(self, key):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hmget(self.entry_key(key), 'meta', 'body')
+        pipe.zadd('%s:lru' % self.prefix, {key: time.time()}, xx=True)
+        (meta, body), _ = pipe.execute()
+        if meta is None or body is None:
+            return None
+        return CacheEntry.loads(meta), io.BytesIO(body)
+
+    def set(self, key, entry, body):
+        if self._set_script is None:
+            self._set_script = self.client.register_script(self.SET_SCRIPT)
+        prefix = self.prefix
+        return self._set_script(
+            keys=[self.entry_key(key), prefix + ':lru', prefix + ':sizes', prefix + ':bytes'],
+            args=[key, entry.dumps(), body, time.time(), self.max_size, prefix + ':'],
+            client=self.client,
+        )
+
+    def update(self, key, entry):
+        entry_key = self.entry_key(key)
+        if self.client.exists(entry_key):
+            self.client.hset(entry_key, 'meta', entry.dumps())
+
+    def lock(self, key):
+        return bool(self.client.set(self.entry_key(key) + ':lock', 1, nx=True, ex=LOCK_TIMEOUT))
+
+    def unlock(self, key):
+        self.client.delete(self.entry_key(key) + ':lock')
+
+    def locked(self, key):
+        return bool(self.client.exists(self.entry_key(key) + ':lock'))
+
+
+class FileCacheBackend(object):
+    """Entries on local disk, ``<key>.json`` plus a versioned ``.body`` file.
+
+    The body file name changes on every store, so readers holding the old one
+    keep a consistent body. The LRU order comes from the body files' mtime,
+    refreshed on every hit, and the in-process index is rebuilt from the
+    directory every ``REVPROXY_CACHE_SCAN_INTERVAL`` seconds to see the
+    entries written by other processes.
+    """
+
+    def __init__(self, max_size, directory=None):
+        self.max_size = max_size
+        self.directory = directory or get_setting(
+            'REVPROXY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'revproxy-cache')
+        )
+        self.scan_interval = get_setting('REVPROXY_CACHE_SCAN_INTERVAL', 60)
+        self._index = OrderedDict()
+        self._total = 0
+        self._scanned = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _write(self, name, data):
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp, self.path(name))
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def _scan(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.body'):
+                continue
+            try:
+                stat = os.stat(self.path(name))
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, name.split('.', 1)[0], stat.st_size))
+        self._index = OrderedDict()
+        self._total = 0
+        for _, key, size in sorted(files):
+            self._index[key] = self._index.pop(key, 0) + size
+            self._total += size
+        self._scanned = time.monotonic()
+
+    def get(self, key):
+        try:
+            with open(self.path(key + '.json'), 'rb') as file:
+                meta = json.loads(file.read())
+            body = open(self.path(meta['body']), 'rb')
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(body.fileno())
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        meta.pop('body')
+        meta.pop('size', None)
+        return CacheEntry(**meta), body
+
+    def set(self, key, entry, body):
+        body_name = '%s.%s.body' % (key, os.urandom(4).hex())
+        self._write(body_name, body)
+        meta = json.loads(entry.dumps())
+        meta.update(body=body_name, size=len(body))
+        old = self._read_body_name(key)
+        self._write(key + '.json', json.dumps(meta).encode())
+        if old and old != body_name:
+            self._remove(old)
+
+        evicted = 0
+        with self._lock:
+            if time.monotonic() - self._scanned > self.scan_interval:
+                self._scan()
+            else:
+                self._total += len(body) - self._index.pop(key, 0)
+                self._index[key] = len(body)
+            while self._total > self.max_size and len(self._index) > 1:
+                oldest, size = self._index.popitem(last=False)
+                self._total -= size
+                self._evict(oldest)
+                evicted += 1
+        return evicted
+
+    def update(self, key, entry):
+        body_name = self._read_body_name(key)
+        if body_name is None:
+            return
+        meta = json.loads(entry.dumps())
+        meta['body'] = body_name
+        self._write(key + '.json', json.dumps(meta).encode())
+
+    def _read_body_name(self, key):
+        try:
+            with open(self.path(key + '.json'), 'rb') as file:
+                return json.loads(file.read()).get('body')
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _remove(self, name):
+        try:
+            os.unlink(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, key):
+        body_name = self._read_body_name(key)
+        self._remove(key + '.json')
+        if body_name:
+            self._remove(body_name)
+
+    def lock(self, key):
+        path = self.path(key + '.lock')
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                if self.locked(key):
+                    return False
+                # Lock lama dari proses yang mati
+                self._remove(key + '.lock')
+        return False
+
+    def unlock(self, key):
+        self._remove(key + '.lock')
+
+    def locked(self, key):
+        try:
+            return time.time() - os.stat(self.path(key + '.lock')).st_mtime < LOCK_TIMEOUT
+        except FileNotFoundError:
+            return False
+
+
+BACKENDS = {
+    'redis': RedisCacheBackend,
+    'file': FileCacheBackend,
+}
+
+
+class ProxyCache(object):
+    """HTTP cache in front of the upstream of a :class:`ProxyView`::
+
+        class AssetProxyView(ProxyView):
+            upstream = 'https://cdn.example.com/'
+            proxy_cache = ProxyCache()
+
+    ``backend`` is ``'redis'`` or ``'file'`` (default
+    ``REVPROXY_CACHE_BACKEND``). ``max_size`` bounds the stored bytes
+    (``REVPROXY_CACHE_MAX_SIZE``), responses bigger than ``max_entry_size``
+    (``REVPROXY_CACHE_MAX_ENTRY_SIZE``) are streamed without being stored.
+    """
+
+    def __init__(self, backend=None, max_size=None, max_entry_size=None, prefix='revproxy:cache'):
+        self._backend = backend
+        self.max_size = max_size or get_setting('REVPROXY_CACHE_MAX_SIZE', 256 * 1024 * 1024)
+        self.max_entry_size = max_entry_size or get_setting('REVPROXY_CACHE_MAX_ENTRY_SIZE', 8 * 1024 * 1024)
+        self.prefix = prefix
+
+    @property
+    def backend(self):
+        if self._backend is None or isinstance(self._backend, str):
+            name = self._backend or get_setting('REVPROXY_CACHE_BACKEND', 'redis')
+            if name == 'redis':
+                self._backend = RedisCacheBackend(self.max_size, prefix=self.prefix)
+            else:
+                self._backend = BACKENDS[name](self.max_size)
+        return self._backend
+
+    def key(self, view, url):
+        # REMOTE_USER membuat response upstream berbeda per user
+        remote_user = view.request_headers.get('REMOTE_USER', '')
+        return hashlib.sha256(('%s\n%s' % (url, remote_user)).encode('utf-8')).hexdigest()
+
+    def lookup(self, key, request):
+        try:
+            found = self.backend.get(key)
+        except Exception as error:
+            logger.warning('Proxy cache lookup failed: %s', error)
+            return None, None
+        if found is None:
+            return None, None
+        entry, body = found
+        if not entry.matches(request):
+            body.close()
+            return None, None
+        return entry, body
+
+    def wait(self, key, request):
+        """Wait for the request that is already fetching this key"""
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            entry, body = self.lookup(key, request)
+            if entry is not None and entry.is_fresh():
+                return entry, body
+            if body is not None:
+                body.close()
+            if not self.backend.locked(key):
+                break
+        return None, None
+
+    def fetch(self, view, request, path):
+        """Return the upstream response for the request, from the cache when possible"""
+        label = type(view).__name__
+        if not request_is_cacheable(request):
+            self.record(label, 'bypass')
+            return view._created_proxy_response(request, path)
+
+        key = self.key(view, view.get_request_url(request, path))
+        no_cache = 'no-cache' in parse_cache_control(request.META.get('HTTP_CACHE_CONTROL'))
+        entry, body = self.lookup(key, request)
+        if entry is not None and entry.is_fresh() and not no_cache:
+            self.record(label, 'hit')
+            return entry.replay(request, body)
+
+        try:
+            locked = self.backend.lock(key)
+        except Exception as error:
+            logger.warning('Proxy cache lock failed: %s', error)
+            locked = True
+        if not locked:
+            if body is not None:
+                body.close()
+            waited, waited_body = self.wait(key, request)
+            if waited is not None:
+                self.record(label, 'coalesced')
+                return waited.replay(request, waited_body)
+            entry, body = self.lookup(key, request)
+
+        try:
+            return self.refresh(view, request, path, key, entry, body, label)
+        finally:
+            if locked:
+                try:
+                    self.backend.unlock(key)
+                except Exception as error:
+                    logger.warning('Proxy cache unlock failed: %s', error)
+
+    def refresh(self, view, request, path, key, entry, body, label):
+        headers = dict(view.request_headers)
+        for header in CONDITIONAL_HEADERS:
+            headers.pop(header, None)
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        proxy_response = view._created_proxy_response(request, path, headers=headers)
+
+        if entry is not None and proxy_response.status == 304:
+            proxy_response.drain_conn()
+            proxy_response.release_conn()
+            entry.revalidated(proxy_response)
+            try:
+                self.backend.update(key, entry)
+            except Exception as error:
+                logger.warning('Proxy cache update failed: %s', error)
+            self.record(label, 'revalidated')
+            return entry.replay(request, body)
+
+        if body is not None:
+            body.close()
+        self.record(label, 'miss')
+        if not response_is_cacheable(request, proxy_response):
+            return proxy_response
+
+        content = self.read_body(proxy_response)
+        if content is None:
+            return proxy_response
+        proxy_response.release_conn()
+
+        entry = CacheEntry.from_response(request, proxy_response)
+        if len(content) <= self.max_entry_size:
+            try:
+                evicted = self.backend.set(key, entry, content)
+            except Exception as error:
+                logger.warning('Proxy cache store failed: %s', error)
+            else:
+                self.record(label, 'stored')
+                if evicted:
+                    self.record(label, 'evicted', evicted)
+        return entry.replay(request, io.BytesIO(content))
+
+    def read_body(self, proxy_response):
+        """The whole body when it is small enough to store, else ``None``.
+
+        Bodies of unknown length that would be streamed (e.g. event streams)
+        are never read ahead.
+        """
+        length = parse_seconds(proxy_response.headers.get('Content-Length'))
+        if length is None and should_stream(proxy_response):
+            return None
+        if length is not None and length > self.max_entry_size:
+            return None
+        return proxy_response.data or b''
+
+    def record(self, label, event, count=1):
+        key = '%s:stats:%s:%s' % (self.prefix, label, event)
+        try:
+            if not stats_cache.add(key, count, None):
+                stats_cache.incr(key, count)
+        except Exception as error:
+            logger.debug('Proxy cache stats failed: %s', error)
+
+    def stats(self, label):
+        keys = {'%s:stats:%s:%s' % (self.prefix, label, event): event for event in EVENTS}
+        values = stats_cache.get_many(list(keys))
+        stats = {event: values.get(key, 0) for key, event in keys.items()}
+        served = stats['hit'] + stats['revalidated'] + stats['coalesced']
+        total = served + stats['miss']
+        stats['hit_rate'] = round(served / total, 4) if total else None
+        return stats
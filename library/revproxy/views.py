@@ -62,6 +62,10 @@ class ProxyView(View):
     # default value, override this variable to change.
     streaming_amount = None
 
+    #: HTTP cache for upstream responses, e.g. ``ProxyCache()``.
+    #: ``None`` sends every request upstream. See :mod:`revproxy.cache`.
+    proxy_cache = None
+
     def __init__(self, *args, **kwargs):
         super(ProxyView, self).__init__(*args, **kwargs)
 
@@ -172,13 +176,8 @@ class ProxyView(View):
         get_data = encode_items(self.request.GET.lists())
         return urlencode(get_data)
 
-    def _created_proxy_response(self, request, path):
-        request_payload = request.body
-        if self.suppress_empty_body and not request_payload:
-            request_payload = None
-
-        self.log.debug("Request headers: %s", self.request_headers)
-
+    def get_request_url(self, request, path):
+        """Return the upstream URL, with query params, for the request"""
         path = self.get_quoted_path(path)
 
         request_url = self.get_upstream(path) + path
@@ -188,12 +187,25 @@ class ProxyView(View):
             request_url += '?' + self.get_encoded_query_params()
             self.log.debug("Request URL: %s", request_url)
 
+        return request_url
+
+    def _created_proxy_response(self, request, path, headers=None):
+        request_payload = request.body
+        if self.suppress_empty_body and not request_payload:
+            request_payload = None
+
+        if headers is None:
+            headers = self.request_headers
+        self.log.debug("Request headers: %s", headers)
+
+        request_url = self.get_request_url(request, path)
+
         try:
             proxy_response = self.http.urlopen(request.method,
                                                request_url,
                                                redirect=False,
                                                retries=self.retries,
-                                               headers=self.request_headers,
+                                               headers=headers,
                                                body=request_payload,
                                                decode_content=False,
                                                preload_content=False,
@@ -239,7 +251,10 @@ class ProxyView(View):
         if redirect_to:
             return redirect(redirect_to)
 
-        proxy_response = self._created_proxy_response(request, path)
+        if self.proxy_cache is not None:
+            proxy_response = self.proxy_cache.fetch(self, request, path)
+        else:
+            proxy_response = self._created_proxy_response(request, path)
 
         self._replace_host_on_redirect_location(request, proxy_response)
         self._set_content_type(request, proxy_response)
@@ -0,0 +1,201 @@
+"""
+Buffered historical record writes.
+
+With buffering enabled (``SIMPLE_HISTORY_BUFFERED = True`` or
+``HistoricalRecords(buffered=True)``) history rows created inside a
+transaction are collected and written with one ``bulk_create`` per history
+table from ``transaction.on_commit``, instead of one INSERT per change inside
+the transaction. ``'huey'`` hands the rows to a huey task instead.
+
+``history_date`` and the history user are taken when the change happens, and
+rows are written in the order they were recorded. Rows recorded in a rolled
+back transaction or savepoint are dropped together with their ``on_commit``
+callback.
+"""
+import logging
+import threading
+from collections import Counter
+
+from django.apps import apps
+from django.db import connections, transaction
+
+from .signals import post_create_historical_record
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def count(name, value=1):
+    with _counters_lock:
+        _counters[name] += value
+
+
+def stats():
+    """
+    Rows buffered, flushed, deferred to huey and written without buffering in this process.
+    """
+    with _counters_lock:
+        return {
+            name: _counters[name]
+            for name in ('buffered', 'flushed', 'deferred', 'unbuffered')
+        }
+
+
+def reset_stats():
+    with _counters_lock:
+        _counters.clear()
+
+
+class BufferedRecord:
+    __slots__ = ('records', 'history_instance', 'instance', 'using', 'signal_kwargs')
+
+    def __init__(self, records, history_instance, instance, using, signal_kwargs):
+        self.records = records
+        self.history_instance = history_instance
+        self.instance = instance
+        self.using = using
+        self.signal_kwargs = signal_kwargs
+
+
+class HistoryBatch:
+    """
+    History rows of one stretch of a transaction, flushed by one ``on_commit`` callback.
+    """
+
+    def __init__(self, alias, mode):
+        self.alias = alias
+        self.mode = mode
+        self.entries = []
+
+    def __call__(self):
+        self.flush()
+
+    def flush(self):
+        entries, self.entries = self.entries, []
+        if not entries:
+            return
+        if self.mode == 'huey':
+            entries = defer(entries)
+        if entries:
+            write(entries, self.alias)
+
+
+def current_batch(alias, mode):
+    """
+    The batch to append to: reused while it is still the last ``on_commit``
+    callback of the connection and was registered under the same savepoints,
+    so ordering is kept and rows of a rolled back savepoint go with it.
+    """
+    connection = connections[alias]
+    if connection.run_on_commit:
+        savepoint_ids, callback = connection.run_on_commit[-1][:2]
+        if (
+            isinstance(callback, HistoryBatch)
+            and callback.mode == mode
+            and savepoint_ids == set(connection.savepoint_ids)
+        ):
+            return callback
+    batch = HistoryBatch(alias, mode)
+    transaction.on_commit(batch, using=alias)
+    return batch
+
+
+def buffer(records, history_instance, instance, using, mode, signal_kwargs):
+    """
+    Buffer a history row until the transaction commits.
+    Returns False when there is no transaction to wait for, the caller then saves it.
+    """
+    alias = using or history_instance._state.db or 'default'
+    if not connections[alias].in_atomic_block:
+        count('unbuffered')
+        return False
+    current_batch(alias, mode).entries.append(
+        BufferedRecord(records, history_instance, instance, using, signal_kwargs)
+    )
+    count('buffered')
+    return True
+
+
+def write(entries, alias):
+    """
+    One ``bulk_create`` per history table, in recording order, then the m2m
+    history rows and ``post_create_historical_record``.
+    """
+    groups = {}
+    for entry in entries:
+        groups.setdefault((entry.history_instance.__class__, entry.using), []).append(entry)
+    with transaction.atomic(using=alias):
+        for (model, using), group in groups.items():
+            model._default_manager.using(using or alias).bulk_create(
+                [entry.history_instance for entry in group], batch_size=BATCH_SIZE
+            )
+        for entry in entries:
+            entry.records.create_historical_record_m2ms(entry.history_instance, entry.instance)
+    count('flushed', len(entries))
+    for entry in entries:
+        post_create_historical_record.send(
+            sender=entry.history_instance.__class__,
+            instance=entry.instance,
+            history_instance=entry.history_instance,
+            using=entry.using,
+            **entry.signal_kwargs,
+        )
+
+
+def defer(entries):
+    """
+    Hand plain field values to the huey task. Rows with m2m history need the
+    saved history instance and are returned to be written here.
+    """
+    rows = []
+    local = []
+    for entry in entries:
+        history_instance = entry.history_instance
+        if getattr(history_instance, '_history_m2m_fields', None):
+            local.append(entry)
+            continue
+        model = history_instance.__class__
+        rows.append((
+            model._meta.label,
+            entry.using,
+            {
+                field.attname: getattr(history_instance, field.attname)
+                for field in model._meta.concrete_fields
+                if not field.primary_key or getattr(history_instance, field.attname) is not None
+            },
+        ))
+    if rows:
+        write_historical_records(rows)
+        count('deferred', len(rows))
+    return local
+
+
+def write_rows(rows):
+    """
+    Body of the huey task: ``bulk_create`` the deferred rows per history table.
+    """
+    groups = {}
+    for label, using, values in rows:
+        groups.setdefault((label, using), []).append(values)
+    for (label, using), values in groups.items():
+        model = apps.get_model(label)
+        model._default_manager.using(using).bulk_create(
+            [model(**value) for value in values], batch_size=BATCH_SIZE
+        )
+        count('flushed', len(values))
+
+
+_task = None
+
+
+def write_historical_records(rows):
+    global _task
+    if _task is None:
+        import library.djangohuey as huey
+
+        _task = huey.db_task(name='Write Historical Records Task', queue='core')(write_rows)
+    _task(rows)
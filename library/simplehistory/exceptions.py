@@ -25,3 +25,9 @@ class AlternativeManagerError(Exception):
     """Manager does not belong to model"""
 
     pass
+
+
+class NotCheckpointedModelError(TypeError):
+    """The history model has no checkpoint model."""
+
+    pass
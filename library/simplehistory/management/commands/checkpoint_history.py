@@ -0,0 +1,78 @@
+from django.utils import timezone
+
+from ... import utils
+from . import populate_history
+
+
+class Command(populate_history.Command):
+    args = "<app.model app.model ...>"
+    help = (
+        "Stores a snapshot checkpoint for HistoricalRecords(checkpoints=True) "
+        "models so as_of() only replays the changes made after it"
+    )
+
+    DONE_CHECKPOINT_FOR_MODEL = (
+        "Stored checkpoint of {count} historical records for {model}\n"
+    )
+    NOT_CHECKPOINTED = "No checkpoint model found, skipping model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", type=str)
+        parser.add_argument(
+            "--auto",
+            action="store_true",
+            dest="auto",
+            default=False,
+            help="Automatically search for models with the HistoricalRecords field "
+            "type",
+        )
+        parser.add_argument(
+            "--keep",
+            help="Only keep the last X checkpoints, default is 3",
+            dest="keep",
+            type=int,
+            default=3,
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+
+        to_process = set()
+        model_strings = options.get("models", []) or args
+
+        if model_strings:
+            for model_pair in self._handle_model_list(*model_strings):
+                to_process.add(model_pair)
+
+        elif options["auto"]:
+            to_process = self._auto_models()
+
+        else:
+            self.log(self.COMMAND_HINT)
+
+        self._process(to_process, keep=options["keep"])
+
+    def _process(self, to_process, keep=3):
+        date = timezone.now()
+        for model, history_model in to_process:
+            checkpoint_model = getattr(history_model, "_history_checkpoint_model", None)
+            if checkpoint_model is None:
+                self.log(f"{self.NOT_CHECKPOINTED} {model}", 2)
+                continue
+            count = utils.get_history_manager_for_model(model).create_checkpoint(date)
+            self.log(self.DONE_CHECKPOINT_FOR_MODEL.format(model=model, count=count))
+
+            dates = (
+                checkpoint_model.objects.values_list("checkpoint_date", flat=True)
+                .distinct()
+                .order_by("-checkpoint_date")
+            )
+            oldest = dates[max(keep, 1) - 1 : max(keep, 1)]
+            if oldest:
+                checkpoint_model.objects.filter(
+                    checkpoint_date__lt=oldest[0]
+                ).delete()
+
+    def log(self, message, verbosity_level=1):
+        if self.verbosity >= verbosity_level:
+            self.stdout.write(message)
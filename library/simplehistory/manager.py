@@ -1,8 +1,9 @@
 from django.conf import settings
-from django.db import connection, models
-from django.db.models import OuterRef, QuerySet, Subquery
+from django.db import connection, connections, models, transaction
+from django.db.models import Max, OuterRef, Q, QuerySet, Subquery
 from django.utils import timezone
 
+from simplehistory.exceptions import NotCheckpointedModelError
 from simplehistory.utils import (
     get_app_model_primary_key_name,
     get_change_reason_from_object,
@@ -199,13 +200,14 @@ class HistoryManager(models.Manager):
         you could then use:
             `qs = qs.latest_of_each()`
         """
-        queryset = self.get_queryset().filter(history_date__lte=date)
         if not self.instance:
+            queryset = self.snapshot_queryset(date)
             if isinstance(queryset, HistoricalQuerySet):
                 queryset._as_of = date
             queryset = queryset.latest_of_each().as_instances()
             return queryset
 
+        queryset = self.get_queryset().filter(history_date__lte=date)
         try:
             # historical records are sorted in reverse chronological order
             history_obj = queryset[0]
@@ -222,6 +224,123 @@ class HistoryManager(models.Manager):
         setattr(historic, "_as_of", date)
         return result
 
+    def snapshot_queryset(self, date):
+        """
+        Historical records that can be the latest one at `date`.
+
+        Without checkpoints that is every record up to `date`. With a checkpoint
+        at or before `date` it is the records of that checkpoint plus the ones
+        made after it, so only the changes since the checkpoint are replayed.
+        Records created later with a backdated `history_date` are not seen by
+        checkpoints taken before they were written.
+        """
+        checkpoint_date = self.nearest_checkpoint(date)
+        if checkpoint_date is None:
+            return self.get_queryset().filter(history_date__lte=date)
+        checkpoint_model = self.model._history_checkpoint_model
+        history_ids = checkpoint_model.objects.using(self.db).filter(
+            checkpoint_date=checkpoint_date
+        )
+        return self.get_queryset().filter(
+            Q(pk__in=history_ids.values("history_id"))
+            | Q(history_date__gt=checkpoint_date, history_date__lte=date)
+        )
+
+    def nearest_checkpoint(self, date):
+        """
+        Date of the latest checkpoint at or before `date`, or None.
+        """
+        checkpoint_model = getattr(self.model, "_history_checkpoint_model", None)
+        if checkpoint_model is None or self.instance is not None:
+            return None
+        return (
+            checkpoint_model.objects.using(self.db)
+            .filter(checkpoint_date__lte=date)
+            .aggregate(date=Max("checkpoint_date"))["date"]
+        )
+
+    def create_checkpoint(self, date=None):
+        """
+        Store the latest historical record of every instance alive at `date`
+        (default now) as a checkpoint for `as_of()`, built from the previous
+        checkpoint. Returns the number of records in the checkpoint.
+        """
+        checkpoint_model = getattr(self.model, "_history_checkpoint_model", None)
+        if checkpoint_model is None:
+            raise NotCheckpointedModelError(
+                "{} has no checkpoints, use HistoricalRecords(checkpoints=True).".format(
+                    self.model._meta.object_name
+                )
+            )
+        if self.instance is not None:
+            raise TypeError("Can't create a checkpoint of a single instance.")
+        date = date or timezone.now()
+        latest = (
+            self.snapshot_queryset(date)
+            .latest_of_each()
+            .exclude(history_type="-")
+            .order_by()
+            .values("pk")
+        )
+        sql, params = latest.query.sql_with_params()
+        db_connection = connections[self.db]
+        table = db_connection.ops.quote_name(checkpoint_model._meta.db_table)
+        with transaction.atomic(using=self.db):
+            checkpoint_model.objects.using(self.db).filter(
+                checkpoint_date=date
+            ).delete()
+            with db_connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (checkpoint_date, history_id) "
+                    f"SELECT %s, latest.* FROM ({sql}) AS latest",
+                    (date, *params),
+                )
+                return cursor.rowcount
+
+    def iter_as_of(self, date, chunk_size=2000):
+        """
+        Stream the snapshot of `as_of(date)` as instances, reading `chunk_size`
+        instances per query in primary key order instead of the whole snapshot
+        at once.
+        """
+        if self.instance is not None:
+            raise TypeError("Can't stream the snapshot of a single instance.")
+        pk_attr = self.model.instance_type._meta.pk.attname
+        queryset = self.snapshot_queryset(date)
+        if connections[self.db].vendor != "postgresql":
+            records = (
+                queryset.latest_of_each()
+                .exclude(history_type="-")
+                .order_by(pk_attr)
+                .iterator(chunk_size=chunk_size)
+            )
+            for record in records:
+                yield self._snapshot_instance(record, date)
+            return
+
+        last = None
+        while True:
+            chunk = queryset
+            if last is not None:
+                chunk = chunk.filter(**{f"{pk_attr}__gt": last})
+            records = list(
+                chunk.order_by(pk_attr, "-history_date", "-pk").distinct(pk_attr)[
+                    :chunk_size
+                ]
+            )
+            if not records:
+                return
+            for record in records:
+                if record.history_type != "-":
+                    yield self._snapshot_instance(record, date)
+            last = getattr(records[-1], pk_attr)
+
+    def _snapshot_instance(self, record, date):
+        result = record.instance
+        historic = getattr(result, SIMPLE_HISTORY_REVERSE_ATTR_NAME)
+        setattr(historic, "_as_of", date)
+        return result
+
     def bulk_history_create(
         self,
         objs,
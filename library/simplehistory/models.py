@@ -30,7 +30,7 @@ from django.utils.translation import gettext_lazy as _
 
 from simplehistory import utils
 
-from . import exceptions
+from . import buffer, exceptions
 from .manager import SIMPLE_HISTORY_REVERSE_ATTR_NAME, HistoryDescriptor
 from .signals import (
     post_create_historical_m2m_records,
@@ -103,6 +103,9 @@ class HistoricalRecords:
         m2m_fields=(),
         m2m_fields_model_field_name="_history_m2m_fields",
         m2m_bases=(models.Model,),
+        buffered=None,
+        snapshot_index=None,
+        checkpoints=False,
     ):
         self.user_set_verbose_name = verbose_name
         self.user_set_verbose_name_plural = verbose_name_plural
@@ -124,6 +127,9 @@ class HistoricalRecords:
         self.use_base_model_db = use_base_model_db
         self.m2m_fields = m2m_fields
         self.m2m_fields_model_field_name = m2m_fields_model_field_name
+        self.buffered = buffered
+        self.snapshot_index = snapshot_index
+        self.checkpoints = checkpoints
 
         if isinstance(no_db_index, str):
             no_db_index = [no_db_index]
@@ -230,6 +236,11 @@ class HistoricalRecords:
             m2m_descriptor = HistoryDescriptor(m2m_model)
             setattr(history_model, field.name, m2m_descriptor)
 
+        if self.checkpoints:
+            checkpoint_model = self.create_history_checkpoint_model(history_model)
+            history_model._history_checkpoint_model = checkpoint_model
+            setattr(module, checkpoint_model.__name__, checkpoint_model)
+
     def get_history_model_name(self, model):
         if not self.custom_model_name:
             return f"{self.DEFAULT_MODEL_NAME_PREFIX}{model._meta.object_name}"
@@ -268,6 +279,42 @@ class HistoricalRecords:
 
         return m2m_history_model
 
+    def create_history_checkpoint_model(self, history_model):
+        """
+        Creates the checkpoint model of a historical model: for each checkpoint
+        date, the latest historical record of every instance alive at that date.
+        """
+        table = history_model._meta.db_table
+        if table.endswith('"'):
+            table = table[:-1] + '_checkpoint"'
+        else:
+            table = table + "_checkpoint"
+        meta_fields = {
+            "db_table": table,
+            "verbose_name": format_lazy(
+                "{} checkpoint", history_model._meta.verbose_name
+            ),
+            "verbose_name_plural": format_lazy(
+                "{} checkpoints", history_model._meta.verbose_name
+            ),
+        }
+        if self.app:
+            meta_fields["app_label"] = self.app
+        attrs = {
+            "__module__": history_model.__module__,
+            "checkpoint_date": models.DateTimeField(db_index=True),
+            # DO_NOTHING: clean_old_history must not walk the checkpoints row by row
+            "history": models.ForeignKey(
+                history_model,
+                on_delete=models.DO_NOTHING,
+                db_constraint=False,
+                related_name="+",
+            ),
+            "Meta": type("Meta", (), meta_fields),
+        }
+        name = f"{history_model.__name__}Checkpoint"
+        return type(str(name), (models.Model,), attrs)
+
     def create_history_model(self, model, inherited):
         """
         Creates a historical model to associate with the model provided.
@@ -587,6 +634,34 @@ class HistoricalRecords:
             )
         return result
 
+    @property
+    def _snapshot_indexing(self):
+        """
+        Whether to add the (pk, -history_date, -history_id) index used by
+        as_of() and latest_of_each(); default is SIMPLE_HISTORY_SNAPSHOT_INDEX or False
+        """
+        if self.snapshot_index is not None:
+            return self.snapshot_index
+        return getattr(settings, "SIMPLE_HISTORY_SNAPSHOT_INDEX", False)
+
+    @property
+    def _buffering(self):
+        """False, True, or 'huey'; default is SIMPLE_HISTORY_BUFFERED or False"""
+        result = self.buffered
+        if result is None:
+            result = getattr(settings, "SIMPLE_HISTORY_BUFFERED", False)
+        if isinstance(result, str):
+            result = result.lower()
+            if result != "huey":
+                raise ImproperlyConfigured(
+                    "SIMPLE_HISTORY_BUFFERED must be one of (False, True, 'huey')"
+                )
+        elif not isinstance(result, bool):
+            raise ImproperlyConfigured(
+                "SIMPLE_HISTORY_BUFFERED must be one of (False, True, 'huey')"
+            )
+        return result
+
     def get_meta_options_m2m(self, through_model):
         """
         Returns a dictionary of fields that will be added to
@@ -624,10 +699,21 @@ class HistoricalRecords:
         meta_fields["verbose_name_plural"] = plural_name
         if self.app:
             meta_fields["app_label"] = self.app
+        indexes = []
         if self._date_indexing == "composite":
-            meta_fields["indexes"] = (
-                models.Index(fields=("history_date", model._meta.pk.attname)),
+            indexes.append(
+                models.Index(fields=("history_date", model._meta.pk.attname))
+            )
+        if self._snapshot_indexing:
+            name = self.get_history_model_name(model).lower()
+            indexes.append(
+                models.Index(
+                    fields=(model._meta.pk.attname, "-history_date", "-history_id"),
+                    name=f"{name[:25]}_asof",
+                )
             )
+        if indexes:
+            meta_fields["indexes"] = tuple(indexes)
         return meta_fields
 
     def post_save(self, instance, created, using=None, **kwargs):
@@ -735,6 +821,21 @@ class HistoricalRecords:
             using=using,
         )
 
+        mode = self._buffering
+        if mode and buffer.buffer(
+            self,
+            history_instance,
+            instance,
+            using,
+            mode,
+            dict(
+                history_date=history_date,
+                history_user=history_user,
+                history_change_reason=history_change_reason,
+            ),
+        ):
+            return
+
         history_instance.save(using=using)
         self.create_historical_record_m2ms(history_instance, instance)
 
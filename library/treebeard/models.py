@@ -60,6 +60,66 @@ class Node(models.Model):
                 node_data[key] = foreign_keys[key].objects.get(
                     pk=node_data[key])
 
+    @classmethod
+    def _can_bulk_create(cls):
+        """
+        ``bulk_create`` can't write multi-table inherited models, those are
+        loaded node by node.
+        """
+        return not cls._meta.concrete_model._meta.parents
+
+    @classmethod
+    def _build_bulk_nodes(cls, bulk_data, keep_ids=False):
+        """
+        Instantiates (without saving) every node of a :meth:`load_bulk`
+        structure.
+
+        Foreign keys are assigned by primary key instead of loading the
+        related objects. Siblings are sorted in memory when ``node_order_by``
+        is set.
+
+        :returns: A list of ``(node, children)`` tuples, ``children`` having
+            the same shape.
+        """
+        foreign_keys = {
+            field.name: field.attname
+            for field in cls._meta.fields
+            if field.get_internal_type() == 'ForeignKey' and field.name != 'parent'
+        }
+        pk_field = cls._meta.pk.attname
+
+        def build(structs):
+            nodes = []
+            for node_struct in structs:
+                node_data = {
+                    foreign_keys.get(key, key): value
+                    for key, value in node_struct['data'].items()
+                }
+                if keep_ids:
+                    node_data[pk_field] = node_struct[pk_field]
+                nodes.append((cls(**node_data), build(node_struct.get('children', []))))
+            if cls.node_order_by:
+                nodes.sort(key=lambda item: [
+                    getattr(item[0], field) for field in cls.node_order_by
+                ])
+            return nodes
+
+        return build(bulk_data)
+
+    @classmethod
+    def bulk_load(cls, bulk_data, parent=None, keep_ids=False,
+                  batch_size=1000):
+        """
+        Loads a list/dictionary structure to the tree like
+        :meth:`load_bulk`. Tree implementations that can compute their tree
+        fields up front override this to write every node with
+        ``bulk_create`` in batches, in that case ``save()`` is not called and
+        ``pre_save``/``post_save`` are not sent for the new nodes.
+
+        :returns: A list of the added node ids.
+        """
+        return cls.load_bulk(bulk_data, parent=parent, keep_ids=keep_ids)
+
     @classmethod
     def load_bulk(cls, bulk_data, parent=None, keep_ids=False):
         """
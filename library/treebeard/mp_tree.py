@@ -4,7 +4,7 @@ import operator
 from functools import reduce
 
 from django.core import serializers
-from django.db import models, transaction, connection
+from django.db import models, router, transaction, connection
 from django.db.models import F, Q, Value
 from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext_noop as _
@@ -616,6 +616,176 @@ class MP_Node(Node):
         """
         return MP_AddRootHandler(cls, **kwargs).process()
 
+    @classmethod
+    def bulk_load(cls, bulk_data, parent=None, keep_ids=False,
+                  batch_size=1000):
+        """
+        Loads a list/dictionary structure to the tree like :meth:`load_bulk`.
+
+        ``path``, ``depth`` and ``numchild`` of every node are computed in
+        memory and written with ``bulk_create`` in batches, plus one UPDATE
+        of the parent's ``numchild``. ``save()`` is not called and
+        ``pre_save``/``post_save`` are not sent for the new nodes.
+
+        Falls back to :meth:`load_bulk` for multi-table inherited models and
+        when ``node_order_by`` has to interleave with existing siblings.
+
+        :returns: A list of the added node ids.
+
+        :raise PathOverflow: when the structure doesn't fit in the path
+        """
+        if not cls._can_bulk_create():
+            return cls.load_bulk(bulk_data, parent=parent, keep_ids=keep_ids)
+        cls = get_result_class(cls)
+
+        if parent is None:
+            last = cls.get_last_root_node()
+            basepath, depth = '', 1
+        else:
+            caller_parent = parent
+            parent = cls.objects.get(pk=parent.pk)
+            last = None if parent.is_leaf() else parent.get_last_child()
+            basepath, depth = parent.path, parent.depth + 1
+        if last is not None and cls.node_order_by:
+            return cls.load_bulk(bulk_data, parent=parent, keep_ids=keep_ids)
+
+        trees = cls._build_bulk_nodes(bulk_data, keep_ids)
+        start = last._get_lastpos_in_path() + 1 if last is not None else 1
+        max_length = cls._meta.get_field('path').max_length
+
+        # iterative preorder, so the nodes are written in path order
+        added = []
+        stack = [
+            (basepath, depth, start + offset, tree)
+            for offset, tree in reversed(list(enumerate(trees)))
+        ]
+        while stack:
+            parentpath, nodedepth, position, (node, children) = stack.pop()
+            key = cls._int2str(position)
+            if len(key) > cls.steplen:
+                raise PathOverflow(_("Path Overflow from: '%s'" % (parentpath, )))
+            node.path = '{0}{1}{2}'.format(
+                parentpath, cls.alphabet[0] * (cls.steplen - len(key)), key)
+            if len(node.path) > max_length:
+                raise PathOverflow(
+                    _('The new node is too deep in the tree, try'
+                      ' increasing the path.max_length property'
+                      ' and UPDATE your database'))
+            node.depth = nodedepth
+            node.numchild = len(children)
+            added.append(node)
+            stack.extend(
+                (node.path, nodedepth + 1, offset + 1, child)
+                for offset, child in reversed(list(enumerate(children)))
+            )
+
+        with transaction.atomic(using=router.db_for_write(cls)):
+            cls.objects.bulk_create(added, batch_size=batch_size)
+            if parent is not None and trees:
+                cls.objects.filter(path=parent.path).update(
+                    numchild=F('numchild') + len(trees))
+                caller_parent.numchild = parent.numchild + len(trees)
+        return [node.pk for node in added]
+
+    @classmethod
+    def bulk_move(cls, nodes, target=None):
+        """
+        Moves several branches to the end of ``target``'s children (or to
+        the end of the root nodes if ``target`` is ``None``).
+
+        The paths and depths of every moved node are rewritten by a single
+        set-based UPDATE, and the ``numchild`` of the old and new parents by
+        another one. Nodes inside another moved branch move along with it.
+        Falls back to one :meth:`move` per branch when ``node_order_by`` is
+        set or the database is not PostgreSQL.
+
+        :raise InvalidMoveToDescendant: when ``target`` is inside a moved
+           branch
+        :raise PathOverflow: when the new positions don't fit in the path
+        """
+        cls = get_result_class(cls)
+        fresh = {
+            node.pk: node
+            for node in cls.objects.filter(pk__in=[node.pk for node in nodes])
+        }
+        branches = []
+        for node in sorted(
+                (fresh[node.pk] for node in nodes if node.pk in fresh),
+                key=lambda node: node.path):
+            if not branches or not node.path.startswith(branches[-1].path):
+                branches.append(node)
+        # keep the order the caller asked for
+        order = {node.pk: index for index, node in enumerate(nodes)}
+        branches.sort(key=lambda node: order[node.pk])
+        if not branches:
+            return
+
+        if target is not None:
+            target = cls.objects.get(pk=target.pk)
+            for branch in branches:
+                if target.path.startswith(branch.path):
+                    raise InvalidMoveToDescendant(
+                        _("Can't move node to a descendant."))
+
+        if (
+                cls.node_order_by or
+                cls.get_database_vendor('write') != 'postgresql'
+        ):
+            for branch in branches:
+                branch = cls.objects.get(pk=branch.pk)
+                if target is None:
+                    branch.move(
+                        cls.get_last_root_node(),
+                        'sorted-sibling' if cls.node_order_by else 'last-sibling')
+                else:
+                    target = cls.objects.get(pk=target.pk)
+                    branch.move(
+                        target,
+                        'sorted-child' if cls.node_order_by else 'last-child')
+            return
+
+        if target is None:
+            last = cls.get_last_root_node()
+            basepath, depth = '', 1
+        else:
+            last = None if target.is_leaf() else target.get_last_child()
+            basepath, depth = target.path, target.depth + 1
+        start = last._get_lastpos_in_path() + 1 if last is not None else 1
+
+        moves = []
+        numchild = {}
+        for offset, branch in enumerate(branches):
+            key = cls._int2str(start + offset)
+            if len(key) > cls.steplen:
+                raise PathOverflow(_("Path Overflow from: '%s'" % (basepath, )))
+            newpath = cls._get_path(basepath, depth, start + offset)
+            moves.append((branch.path, newpath, len(branch.path) + 1, depth - branch.depth))
+            oldparentpath = cls._get_parent_path_from_path(branch.path)
+            if oldparentpath:
+                numchild[oldparentpath] = numchild.get(oldparentpath, 0) - 1
+        if basepath:
+            numchild[basepath] = numchild.get(basepath, 0) + len(branches)
+
+        table = connection.ops.quote_name(cls._meta.db_table)
+        cursor = cls._get_database_cursor('write')
+        with transaction.atomic(using=router.db_for_write(cls)):
+            changes = [(path, delta) for path, delta in numchild.items() if delta]
+            if changes:
+                cursor.execute(
+                    'UPDATE %s AS node SET numchild = node.numchild + change.delta'
+                    ' FROM (VALUES %s) AS change(path, delta)'
+                    ' WHERE node.path = change.path' % (
+                        table, ', '.join(['(%s, %s)'] * len(changes))),
+                    [value for change in changes for value in change])
+            cursor.execute(
+                'UPDATE %s AS node SET'
+                ' path = moved.newpath || SUBSTR(node.path, moved.start),'
+                ' depth = node.depth + moved.delta'
+                ' FROM (VALUES %s) AS moved(oldpath, newpath, start, delta)'
+                ' WHERE node.path LIKE moved.oldpath || \'%%%%\'' % (
+                    table, ', '.join(['(%s, %s, %s, %s)'] * len(moves))),
+                [value for move in moves for value in move])
+
     @classmethod
     def dump_bulk(cls, parent=None, keep_ids=True):
         """Dumps a tree branch to a python data structure."""
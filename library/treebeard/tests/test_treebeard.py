@@ -3046,6 +3046,166 @@ class TestTreeAdmin(TestNonEmptyTree):
         assert self.got(model) == expected
 
 
+@pytest.fixture(
+    scope="function",
+    params=[
+        models.MP_TestNode,
+        models.MP_TestNode_Proxy,
+        models.MP_TestNodeUuid,
+        models.MP_TestNodeCustomId,
+    ],
+)
+def mp_model(request):
+    request.param.load_bulk(BASE_DATA)
+    return request.param
+
+
+@pytest.mark.django_db
+class TestBulkLoad(TestTreeBase):
+    def test_bulk_load_empty(self, model_without_data):
+        ids = model_without_data.bulk_load(BASE_DATA)
+        got_descs = [obj.desc for obj in model_without_data.objects.filter(pk__in=ids)]
+        expected_descs = [x[0] for x in UNCHANGED]
+        assert sorted(got_descs) == sorted(expected_descs)
+        assert self.got(model_without_data) == UNCHANGED
+
+    def test_bulk_load_existing(self, model):
+        node = model.objects.get(desc="231")
+        ids = model.bulk_load(BASE_DATA, node)
+        expected = [
+            ("1", 1, 0),
+            ("2", 1, 4),
+            ("21", 2, 0),
+            ("22", 2, 0),
+            ("23", 2, 1),
+            ("231", 3, 4),
+            ("1", 4, 0),
+            ("2", 4, 4),
+            ("21", 5, 0),
+            ("22", 5, 0),
+            ("23", 5, 1),
+            ("231", 6, 0),
+            ("24", 5, 0),
+            ("3", 4, 0),
+            ("4", 4, 1),
+            ("41", 5, 0),
+            ("24", 2, 0),
+            ("3", 1, 0),
+            ("4", 1, 1),
+            ("41", 2, 0),
+        ]
+        assert len(ids) == 10
+        assert self.got(model) == expected
+
+    def test_bulk_load_after_roots(self, model):
+        model.bulk_load([{"data": {"desc": "5"}, "children": [{"data": {"desc": "51"}}]}])
+        assert self.got(model) == UNCHANGED + [("5", 1, 1), ("51", 2, 0)]
+
+    def test_bulk_load_same_as_load_bulk(self, model_without_data):
+        model_without_data.bulk_load(BASE_DATA)
+        assert model_without_data.dump_bulk(keep_ids=False) == BASE_DATA
+
+    def test_bulk_load_sorted(self, sorted_model):
+        data = [
+            {"data": {"val1": 3, "val2": 3, "desc": "zxy"}},
+            {
+                "data": {"val1": 1, "val2": 4, "desc": "bcd"},
+                "children": [
+                    {"data": {"val1": 2, "val2": 1, "desc": "b"}},
+                    {"data": {"val1": 1, "val2": 1, "desc": "a"}},
+                ],
+            },
+            {"data": {"val1": 2, "val2": 5, "desc": "zxy"}},
+        ]
+        sorted_model.bulk_load(data)
+        got = [
+            (o.val1, o.val2, o.desc, o.get_depth(), o.get_children_count())
+            for o in sorted_model.get_tree()
+        ]
+        assert got == [
+            (1, 4, "bcd", 1, 2),
+            (1, 1, "a", 2, 0),
+            (2, 1, "b", 2, 0),
+            (2, 5, "zxy", 1, 0),
+            (3, 3, "zxy", 1, 0),
+        ]
+
+    def test_bulk_load_inherited_falls_back(self, inherited_model):
+        ids = inherited_model.bulk_load([{"data": {"desc": "x", "extra_desc": "y"}}])
+        assert inherited_model.objects.get(pk=ids[0]).extra_desc == "y"
+
+
+@pytest.mark.django_db
+class TestBulkMove(TestTreeBase):
+    def test_bulk_move_to_node(self, mp_model):
+        target = mp_model.objects.get(desc="3")
+        mp_model.bulk_move(
+            [mp_model.objects.get(desc="23"), mp_model.objects.get(desc="4")], target
+        )
+        expected = [
+            ("1", 1, 0),
+            ("2", 1, 3),
+            ("21", 2, 0),
+            ("22", 2, 0),
+            ("24", 2, 0),
+            ("3", 1, 2),
+            ("23", 2, 1),
+            ("231", 3, 0),
+            ("4", 2, 1),
+            ("41", 3, 0),
+        ]
+        assert self.got(mp_model) == expected
+
+    def test_bulk_move_nested_to_root(self, mp_model):
+        mp_model.bulk_move(
+            [mp_model.objects.get(desc="21"), mp_model.objects.get(desc="2")]
+        )
+        expected = [
+            ("1", 1, 0),
+            ("3", 1, 0),
+            ("4", 1, 1),
+            ("41", 2, 0),
+            ("2", 1, 4),
+            ("21", 2, 0),
+            ("22", 2, 0),
+            ("23", 2, 1),
+            ("231", 3, 0),
+            ("24", 2, 0),
+        ]
+        assert self.got(mp_model) == expected
+
+    def test_bulk_move_to_descendant(self, mp_model):
+        with pytest.raises(InvalidMoveToDescendant):
+            mp_model.bulk_move(
+                [mp_model.objects.get(desc="2")], mp_model.objects.get(desc="231")
+            )
+
+
+@pytest.mark.django_db
+class TestBulkLoadPerformance(object):
+    data = [
+        {
+            "data": {"desc": str(i)},
+            "children": [{"data": {"desc": "%d-%d" % (i, j)}} for j in range(20)],
+        }
+        for i in range(10)
+    ]
+
+    @pytest.mark.parametrize("model", [models.MP_TestNode, models.NS_TestNode])
+    def test_bulk_load_no_of_queries(self, model, django_assert_max_num_queries):
+        # load_bulk needs several queries per node, bulk_load a constant number
+        with django_assert_max_num_queries(5):
+            model.bulk_load(self.data)
+        assert model.objects.count() == 210
+        assert model.dump_bulk(keep_ids=False) == self.data
+
+    @pytest.mark.parametrize("model", [models.MP_TestNode, models.NS_TestNode])
+    def test_load_bulk_no_of_queries(self, model, django_assert_max_num_queries):
+        with django_assert_max_num_queries(210 * 5):
+            model.load_bulk(self.data)
+        assert model.objects.count() == 210
+
+
 @pytest.mark.django_db
 class TestMPFormPerformance(object):
     def test_form_add_subtree_no_of_queries(self, django_assert_num_queries):
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historicalarea',
+            index=models.Index(fields=['area_id', '-history_date', '-history_id'], name='historicalarea_asof'),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master', '0002_history_snapshot_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='area',
+            options={'default_manager_name': 'objects', 'managed': True, 'verbose_name': 'Used store area'},
+        ),
+    ]
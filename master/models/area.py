@@ -3,10 +3,10 @@ from master import settings
 from django.utils.translation import gettext_lazy as _
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from core.models import Base, History, Tracker
+from core.models import Base, History, Tracker, HierarchyManager, HierarchyNode
 
 
-class Area(Base, ):
+class Area(HierarchyNode, Base, ):
     area_id = models.TextField(
         primary_key=True,
         verbose_name=_('area id'),
@@ -38,8 +38,10 @@ class Area(Base, ):
         verbose_name=_('Area store history area'),
         excluded_fields=['modified', 'last_activity_date', ],
     )
+    hierarchy = HierarchyManager()
 
     class Meta:
+        default_manager_name = 'objects'
         managed = True
         db_table = u'\"{}\".\"area\"'.format(settings.SCHEMA)
         verbose_name = _('Used store area')
\ No newline at end of file
@@ -28,6 +28,9 @@ DEBUG = env.bool('DEBUG', default=False)
 ALLOWED_HOSTS = [] if DEBUG else ['*', ]
 
 AUTH_USER_MODEL = 'authentication.User'
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.PermissionClosureBackend',
+]
 # Application definition
 
 INSTALLED_APPS = [
@@ -61,6 +64,7 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'library.hueymonitorutils.dbperf.middleware.QueryProfilerMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +79,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'setup.urls'
 
+# Query profiler (library.hueymonitorutils.dbperf), 0 = off
+DBPERF_REQUEST_SAMPLE_RATE = env.float('DBPERF_REQUEST_SAMPLE_RATE', default=0)
+DBPERF_TASK_SAMPLE_RATE = env.float('DBPERF_TASK_SAMPLE_RATE', default=0)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
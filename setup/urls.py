@@ -28,9 +28,11 @@ from django.contrib import admin
 from django.urls import path
 from django.urls import include
 from debug_toolbar.toolbar import debug_toolbar_urls
+from library.hueymonitorutils.dbperf.views import query_stats_view
 
 urlpatterns = [
     path('admin/clearcache/', include('clearcache.urls')),
+    path('admin/dbperf/queries/', query_stats_view, name='dbperf_query_stats'),
     path('admin/', admin.site.urls),
     # path("__reload__/", include("django_browser_reload.urls")),
     path('', include('authentication.urls')),